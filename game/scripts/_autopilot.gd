@@ -1,7 +1,15 @@
 extends Node
-## Autopilot — simulates gameplay during Movie Maker recording.
-## Only activates when Godot runs with --write-movie (OS.has_feature("movie")).
+## Autopilot — simulates gameplay during Movie Maker recording and benchmarks.
+## Only activates when Godot runs with --write-movie (OS.has_feature("movie"))
+## or with the user argument --autopilot (headless performance benchmarks).
 ## Registered as an autoload; does nothing during normal play or headless testing.
+##
+## User arguments (after `--`), set by the orchestrator:
+##   --autopilot-seed=N     seed the global RNG so the game and the wander choices repeat
+##   --autopilot-log=PATH   write the input track: a header line, then the pressed
+##                          actions on every physics frame where they change
+##   --autopilot-replay=PATH  play back a logged track instead of deciding
+## With a fixed timestep (--fixed-fps / Movie Maker) a seed plus a track replays a run exactly.
 
 var _player: Node2D
 var _move_dir := Vector2.ZERO
@@ -10,22 +18,50 @@ var _attack_timer := 0.0
 var _stuck_timer := 0.0
 var _last_pos := Vector2.ZERO
 var _change_interval := 1.5
+var _frame := 0
+var _pressed: Array[String] = []
+var _log: FileAccess
+var _replay: Array = []  # [{"f": frame, "a": [actions]}, ...]
+var _replay_index := 0
+
+const ACTIONS: Array[String] = ["move_left", "move_right", "move_up", "move_down", "attack"]
 
 
 func _ready() -> void:
-	if not OS.has_feature("movie"):
+	if not (OS.has_feature("movie") or "--autopilot" in OS.get_cmdline_user_args()):
 		set_physics_process(false)
 		return
+	var seed_arg := _user_arg("--autopilot-seed")
+	if seed_arg != "":
+		seed(int(seed_arg))
+	var replay_path := _user_arg("--autopilot-replay")
+	if replay_path != "":
+		_load_replay(replay_path)
+	var log_path := _user_arg("--autopilot-log")
+	if log_path != "":
+		_log = FileAccess.open(log_path, FileAccess.WRITE)
+		if _log:
+			_log.store_line(JSON.stringify({
+				"seed": int(seed_arg) if seed_arg != "" else null,
+				"physics_fps": Engine.physics_ticks_per_second,
+			}))
+		else:
+			push_warning("Autopilot: cannot write input log " + log_path)
 	# Wait for scene tree to initialize
 	await get_tree().process_frame
 	await get_tree().process_frame
 	_player = get_tree().get_first_node_in_group("player")
-	if not _player:
+	if not _player and _replay.is_empty():
 		push_warning("Autopilot: no player found")
 		set_physics_process(false)
 
 
 func _physics_process(delta: float) -> void:
+	_frame += 1
+	if not _replay.is_empty():
+		_play_back()
+		return
+
 	if not is_instance_valid(_player):
 		_player = get_tree().get_first_node_in_group("player")
 		if not _player:
@@ -50,8 +86,8 @@ func _physics_process(delta: float) -> void:
 		_move_dir = _player.global_position.direction_to(nearest_enemy.global_position)
 		if _attack_timer >= 0.6:
 			_attack_timer = 0.0
-			Input.action_press(&"attack")
-			get_tree().create_timer(0.15).timeout.connect(_release_attack)
+			_press("attack")
+			get_tree().create_timer(0.15, true, true).timeout.connect(_release_attack)
 	elif nearest_pickup and _player.global_position.distance_to(nearest_pickup.global_position) < 200.0:
 		# Move toward pickup
 		_move_dir = _player.global_position.direction_to(nearest_pickup.global_position)
@@ -69,23 +105,75 @@ func _physics_process(delta: float) -> void:
 
 
 func _apply_movement() -> void:
-	Input.action_release(&"move_left")
-	Input.action_release(&"move_right")
-	Input.action_release(&"move_up")
-	Input.action_release(&"move_down")
-
+	var wanted: Array[String] = []
 	if _move_dir.x < -0.3:
-		Input.action_press(&"move_left")
+		wanted.append("move_left")
 	elif _move_dir.x > 0.3:
-		Input.action_press(&"move_right")
+		wanted.append("move_right")
 	if _move_dir.y < -0.3:
-		Input.action_press(&"move_up")
+		wanted.append("move_up")
 	elif _move_dir.y > 0.3:
-		Input.action_press(&"move_down")
+		wanted.append("move_down")
+	if "attack" in _pressed:
+		wanted.append("attack")
+	_set_pressed(wanted)
+
+
+func _press(action: String) -> void:
+	if action not in _pressed:
+		var wanted: Array[String] = _pressed.duplicate()
+		wanted.append(action)
+		_set_pressed(wanted)
 
 
 func _release_attack() -> void:
-	Input.action_release(&"attack")
+	if _replay.is_empty():
+		var wanted: Array[String] = _pressed.duplicate()
+		wanted.erase("attack")
+		_set_pressed(wanted)
+
+
+## Single point where inputs change, so the log sees exactly what the game saw.
+func _set_pressed(wanted: Array[String]) -> void:
+	wanted.sort()
+	if wanted == _pressed:
+		return
+	for action in ACTIONS:
+		if action in wanted:
+			Input.action_press(action)
+		else:
+			Input.action_release(action)
+	_pressed = wanted
+	if _log:
+		_log.store_line(JSON.stringify({"f": _frame, "a": _pressed}))
+		_log.flush()  # A crash must not lose the inputs that led to it
+
+
+func _play_back() -> void:
+	while _replay_index < _replay.size() and int(_replay[_replay_index]["f"]) <= _frame:
+		var wanted: Array[String] = []
+		for action in _replay[_replay_index]["a"]:
+			wanted.append(String(action))
+		_set_pressed(wanted)
+		_replay_index += 1
+
+
+func _load_replay(path: String) -> void:
+	var file := FileAccess.open(path, FileAccess.READ)
+	if not file:
+		push_warning("Autopilot: cannot read input track " + path)
+		return
+	while not file.eof_reached():
+		var entry = JSON.parse_string(file.get_line())
+		if entry is Dictionary and entry.has("f"):
+			_replay.append(entry)
+
+
+func _user_arg(name: String) -> String:
+	for arg in OS.get_cmdline_user_args():
+		if arg.begins_with(name + "="):
+			return arg.trim_prefix(name + "=")
+	return ""
 
 
 func _find_nearest(group: String) -> Node2D:
@@ -0,0 +1,598 @@
+"""Process-wide Anthropic client — one pooled connection, per-purpose timeouts, retries, metrics.
+
+Every messages.create call waits its turn in a request scheduler that paces
+calls against the quotas in the rate-limit headers; retryable failures go back
+into that queue after their retry-after (or a jittered backoff).
+"""
+
+import hashlib
+import itertools
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+
+import anthropic
+
+import cassette
+import ledger
+import telemetry
+
+# Purpose -> default timeout (seconds). Overridable via config `api.timeouts`.
+DEFAULT_TIMEOUTS: dict[str, float] = {
+    "main": 120,
+    "repair": 120,
+    "check": 30,
+    "count_tokens": 15,
+    "oracle": 120,
+    "batch": 60,
+}
+
+# Purpose -> default attempt count. The checks are advisory, so they fail fast.
+DEFAULT_ATTEMPTS: dict[str, int] = {
+    "main": 3,
+    "repair": 2,
+    "check": 1,
+    "count_tokens": 1,
+    "oracle": 1,
+}
+
+
+# Purpose -> seconds a retryable failure keeps being re-queued (on top of the
+# attempt count) before the call gives up. Overridable via `api.retry_window`.
+DEFAULT_RETRY_WINDOWS: dict[str, float] = {
+    "main": 600,
+    "repair": 120,
+    "oracle": 300,
+    "check": 60,
+}
+
+# Purpose -> longest wait for quota before a call is sent anyway. `api.pacing.max_wait`.
+DEFAULT_MAX_WAIT: dict[str, float] = {
+    "main": 300,
+    "repair": 120,
+    "oracle": 300,
+    "check": 30,
+}
+
+# Lower goes first when several calls are waiting for quota
+PRIORITY: dict[str, int] = {
+    "main": 0,
+    "repair": 0,  # Holds up the cycle just like the main call
+    "oracle": 1,
+    "check": 2,
+}
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+@dataclass
+class CallStats:
+    calls: int = 0
+    failures: int = 0
+    retries: int = 0
+    seconds: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_created_tokens: int = 0
+    queued_seconds: float = 0.0  # Waiting for quota or a retry slot, included in `seconds`
+
+    def summary(self) -> str:
+        avg = self.seconds / self.calls if self.calls else 0.0
+        queued = f", {self.queued_seconds:.0f}s queued" if self.queued_seconds >= 1 else ""
+        return (
+            f"{self.calls} calls, {self.failures} failed, {self.retries} retries, "
+            f"avg {avg:.1f}s{queued}, {self.input_tokens} in / {self.output_tokens} out, "
+            f"cache {self.cache_read_tokens} read / {self.cache_created_tokens} created"
+        )
+
+
+_stats: dict[str, CallStats] = {}
+_stats_lock = threading.Lock()
+
+
+def get_stats() -> dict[str, CallStats]:
+    """Snapshot of per-purpose call statistics since process start."""
+    with _stats_lock:
+        return {k: CallStats(**vars(v)) for k, v in _stats.items()}
+
+
+def _record(
+    purpose: str,
+    seconds: float,
+    *,
+    failed: bool = False,
+    retries: int = 0,
+    usage=None,
+    model: str = "",
+    batch: bool = False,
+    queued: float = 0.0,
+) -> None:
+    if usage is not None and model and not cassette.replaying():
+        ledger.record(purpose, model, usage, batch=batch)
+    telemetry.count("godmachine_api_calls_total", purpose=purpose, outcome="fail" if failed else "ok")
+    if usage is not None:
+        for kind, attr in (
+            ("input", "input_tokens"),
+            ("output", "output_tokens"),
+            ("cache_read", "cache_read_input_tokens"),
+            ("cache_write", "cache_creation_input_tokens"),
+        ):
+            telemetry.count("godmachine_tokens_total", getattr(usage, attr, 0) or 0, purpose=purpose, kind=kind)
+    with _stats_lock:
+        stats = _stats.setdefault(purpose, CallStats())
+        stats.calls += 1
+        stats.seconds += seconds
+        stats.retries += retries
+        stats.queued_seconds += queued
+        if failed:
+            stats.failures += 1
+        if usage is not None:
+            stats.input_tokens += getattr(usage, "input_tokens", 0) or 0
+            stats.output_tokens += getattr(usage, "output_tokens", 0) or 0
+            stats.cache_read_tokens += getattr(usage, "cache_read_input_tokens", 0) or 0
+            stats.cache_created_tokens += getattr(usage, "cache_creation_input_tokens", 0) or 0
+
+
+def record_usage(purpose: str, usage, seconds: float = 0.0, *, model: str = "", batch: bool = False) -> None:
+    """Record usage for work that didn't go through create_message (e.g. batch results)."""
+    _record(purpose, seconds, usage=usage, model=model, batch=batch)
+
+
+# ---------------------------------------------------------------------------
+# Rate limits
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Quota:
+    """One rate-limit bucket as last reported; it refills at a steady `rate` up to `limit`."""
+    remaining: float
+    limit: int
+    rate: float       # Units per second
+    observed: float   # Epoch seconds
+    reset: float | None = None  # When the API said it is full again
+
+    def available(self, now: float) -> float:
+        return min(self.limit, self.remaining + self.rate * (now - self.observed))
+
+    def ready_at(self, need: float, now: float) -> float:
+        """When `need` units are available; a request bigger than the bucket waits for it to be full."""
+        if self.available(now) >= need:
+            return now
+        return self.observed + (min(need, self.limit) - self.remaining) / self.rate
+
+
+@dataclass
+class RateLimitState:
+    """Quota picture from the API's response headers, across models (epoch seconds for times).
+
+    Limits are per model: `quotas` holds each model's buckets, the `*_remaining`
+    fields the tightest bucket of each kind and `reset_at` the refill of the most
+    depleted one. `retry_after_until` is the latest retry-after still running.
+    """
+    requests_remaining: int | None = None
+    input_tokens_remaining: int | None = None
+    output_tokens_remaining: int | None = None
+    reset_at: float | None = None        # When the most depleted quota refills
+    retry_after_until: float | None = None
+    last_status: int | None = None       # Status of the last failed call (429, 529, ...)
+    last_error_at: float | None = None
+    updated: float | None = None
+    quotas: dict[str, dict[str, Quota]] = field(default_factory=dict)
+
+
+_rate_limits = RateLimitState()  # Last status and update time; the quotas live below
+# Rate limits are per model: model -> "requests" | "input-tokens" | "output-tokens" -> bucket
+_quotas: dict[str, dict[str, Quota]] = {}
+_retry_after: dict[str, float] = {}  # model -> epoch seconds its retry-after runs out
+_warm_prefixes: dict[tuple[str, str], float] = {}  # (model, prefix digest) -> when last sent
+CACHE_TTL = 300
+
+
+def rate_limit_state(now: float | None = None) -> RateLimitState:
+    """Snapshot of the rate limits across models (see RateLimitState)."""
+    now = time.time() if now is None else now
+    with _stats_lock:
+        state = replace(_rate_limits)
+        state.quotas = {model: {kind: replace(q) for kind, q in buckets.items()} for model, buckets in _quotas.items()}
+        state.retry_after_until = max((t for t in _retry_after.values() if t > now), default=None)
+    def fill(quota: Quota) -> float:
+        return quota.available(now) / quota.limit
+
+    tightest: dict[str, Quota] = {}
+    for buckets in state.quotas.values():
+        for kind, quota in buckets.items():
+            if kind not in tightest or fill(quota) < fill(tightest[kind]):
+                tightest[kind] = quota
+    if "requests" in tightest:
+        state.requests_remaining = int(tightest["requests"].available(now))
+    if "input-tokens" in tightest:
+        state.input_tokens_remaining = int(tightest["input-tokens"].available(now))
+    if "output-tokens" in tightest:
+        state.output_tokens_remaining = int(tightest["output-tokens"].available(now))
+    if tightest:
+        state.reset_at = min(tightest.values(), key=fill).reset
+    return state
+
+
+def _header_int(headers, name: str) -> int | None:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _header_time(headers, name: str) -> float | None:
+    value = headers.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _note_headers(headers, status: int | None = None, model: str = "") -> None:
+    """Update `model`'s buckets and retry-after (and the last status) from a response's headers."""
+    if headers is None:
+        return
+    now = time.time()
+    with _stats_lock:
+        state = _rate_limits
+        state.updated = now
+        for kind in ("requests", "input-tokens", "output-tokens"):
+            left = _header_int(headers, f"anthropic-ratelimit-{kind}-remaining")
+            limit = _header_int(headers, f"anthropic-ratelimit-{kind}-limit")
+            if left is None or not limit:
+                continue
+            # Buckets refill continuously; the reset is when this one is full again
+            reset = _header_time(headers, f"anthropic-ratelimit-{kind}-reset")
+            rate = (limit - left) / (reset - now) if reset and reset > now and left < limit else limit / 60
+            _quotas.setdefault(model, {})[kind] = Quota(left, limit, max(rate, limit / 3600), now, reset)
+        # A response without the header leaves a running retry-after (of any model) alone
+        try:
+            retry_after = float(headers.get("retry-after") or 0)
+        except ValueError:
+            retry_after = 0
+        if retry_after > 0:
+            _retry_after[model] = now + retry_after
+        if status is not None:
+            state.last_status = status
+            state.last_error_at = now
+        else:
+            state.last_status = None
+
+
+# ---------------------------------------------------------------------------
+# Request scheduling
+# ---------------------------------------------------------------------------
+
+def _prompt_pieces(kwargs: dict) -> list[tuple[str, bool]]:
+    """(JSON, has cache breakpoint) for every tool, system block and content block, in prefix order."""
+    pieces = [(json.dumps(tool), "cache_control" in tool) for tool in kwargs.get("tools", [])]
+    system = kwargs.get("system", "")
+    for block in [system] if isinstance(system, str) else system:
+        pieces.append((json.dumps(block), isinstance(block, dict) and "cache_control" in block))
+    for message in kwargs.get("messages", []):
+        content = message.get("content", "")
+        for block in [content] if isinstance(content, str) else content:
+            pieces.append((json.dumps(block), isinstance(block, dict) and "cache_control" in block))
+    return pieces
+
+
+def _estimate_cost(kwargs: dict, now: float | None = None) -> dict[str, float]:
+    """What a messages.create call takes from each quota (~4 chars per input token).
+
+    Cache reads don't count toward the input-token limit: when the same model
+    was sent the same prefix (everything up to the last cache breakpoint)
+    within the cache lifetime, only the tail after it is counted.
+    """
+    now = time.time() if now is None else now
+    pieces = _prompt_pieces(kwargs)
+    marked = [i for i, (_, cached) in enumerate(pieces) if cached]
+    chars = sum(len(text) for text, _ in pieces)
+    if marked:
+        prefix = "".join(text for text, _ in pieces[: marked[-1] + 1])
+        key = (kwargs.get("model", ""), hashlib.sha256(prefix.encode("utf-8")).hexdigest())
+        with _stats_lock:
+            warm = now - _warm_prefixes.get(key, float("-inf")) < CACHE_TTL
+            _warm_prefixes[key] = now
+            for k in [k for k, t in _warm_prefixes.items() if now - t >= CACHE_TTL]:
+                del _warm_prefixes[k]
+        if warm:
+            chars -= len(prefix)
+    return {
+        "requests": 1,
+        "input-tokens": chars // 4,
+        "output-tokens": kwargs.get("max_tokens", 0),
+    }
+
+
+def _quota_wait(cost: dict[str, float], model: str, now: float, headroom: float = 0.1) -> tuple[float, str]:
+    """Seconds until `model`'s quotas (and any retry-after) allow a call costing `cost`, and the blocking quota.
+
+    The estimate is padded by `headroom`: the server counts real tokens, not characters / 4.
+    """
+    wait, reason = 0.0, ""
+    if _retry_after.get(model, 0) > now:
+        wait, reason = _retry_after[model] - now, "retry-after"
+    quotas = _quotas.get(model, {})
+    for kind, need in cost.items():
+        quota = quotas.get(kind)
+        if quota is not None and need:
+            until = quota.ready_at(need * (1 + headroom), now) - now
+            if until > wait:
+                wait, reason = until, kind
+    return wait, reason
+
+
+class RequestScheduler:
+    """Admits model calls one at a time, best first, when the quotas have room for them.
+
+    Each call takes a ticket. The waiting ticket with the lowest priority (then
+    the oldest) whose not-before time has passed is admitted once the request,
+    input-token and output-token buckets of its model cover its estimate. The estimate is
+    debited at once, so concurrent callers see it before the next response's
+    headers arrive. Retries come back with a not-before time.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._waiting: dict[int, tuple[int, float]] = {}  # seq -> (priority, not_before)
+        self._seq = itertools.count()
+
+    def wait_turn(
+        self, purpose: str, cost: dict[str, float], not_before: float = 0.0, max_wait: float = 300,
+        headroom: float = 0.1, model: str = "",
+    ) -> float:
+        """Block until this call may be sent. Returns the seconds it waited."""
+        seq = next(self._seq)
+        start = time.time()
+        quota_wait = 0.0
+        announced = False
+        with self._cond:
+            self._waiting[seq] = (PRIORITY.get(purpose, len(PRIORITY)), not_before)
+            try:
+                while True:
+                    now = time.time()
+                    ready = [(p, s) for s, (p, nb) in self._waiting.items() if nb <= now]
+                    if ready and min(ready)[1] == seq:
+                        with _stats_lock:
+                            wait, reason = _quota_wait(cost, model, now, headroom)
+                            if wait <= 0 or quota_wait >= max_wait:
+                                quotas = _quotas.get(model, {})
+                                for kind, need in cost.items():
+                                    if kind in quotas:
+                                        quotas[kind].remaining -= need
+                                return now - start
+                        wait = min(wait, max_wait - quota_wait)
+                        if not announced and wait >= 1:
+                            print(f"  Rate limits: {purpose} call waits {wait:.0f}s for {reason}")
+                            announced = True
+                    else:
+                        # Someone else's turn, or a retry not due yet
+                        due = [nb for nb in (v[1] for v in self._waiting.values()) if nb > now]
+                        wait = min(due) - now if due else 1.0
+                    paused = time.time()
+                    self._cond.wait(timeout=max(0.01, min(wait, 5.0)))
+                    if ready and min(ready)[1] == seq:
+                        quota_wait += time.time() - paused
+            finally:
+                del self._waiting[seq]
+                self._cond.notify_all()
+                if time.time() - start >= 0.01:
+                    telemetry.count("godmachine_api_wait_seconds_total", time.time() - start, purpose=purpose)
+
+    def queued(self) -> int:
+        with self._cond:
+            return len(self._waiting)
+
+
+_scheduler = RequestScheduler()
+
+
+def _retry_delay(e: Exception, attempt: int) -> float:
+    """The server's retry-after plus up to 20% jitter, or a jittered exponential backoff."""
+    if isinstance(e, anthropic.APIStatusError):
+        retry_after = e.response.headers.get("retry-after")
+        try:
+            if retry_after:
+                return float(retry_after) * random.uniform(1.0, 1.2)
+        except ValueError:
+            pass
+    base = min(60, 2 ** (attempt + 1))
+    return base / 2 + random.uniform(0, base / 2)
+
+
+# ---------------------------------------------------------------------------
+# Shared client
+# ---------------------------------------------------------------------------
+
+_client: anthropic.Anthropic | None = None
+_client_lock = threading.Lock()
+_api_cfg: dict = {}
+
+
+def configure(config: dict | None) -> None:
+    """Apply the `api` config section. Safe to call every cycle (config hot-reload).
+
+    Pool limits only take effect when the shared client is first built.
+    """
+    global _api_cfg
+    _api_cfg = (config or {}).get("api", {}) or {}
+
+
+def _build_client() -> anthropic.Anthropic:
+    pool_cfg = _api_cfg.get("pool", {})
+    # Same Limits class the SDK's own HTTP client uses, whichever transport it ships with
+    limits = type(anthropic.DEFAULT_CONNECTION_LIMITS)(
+        max_connections=pool_cfg.get("max_connections", 10),
+        max_keepalive_connections=pool_cfg.get("max_keepalive", 5),
+        keepalive_expiry=pool_cfg.get("keepalive_expiry", 300),
+    )
+    # Retries are handled here, not by the SDK, so every call site shares one policy.
+    # `base_url` points the whole orchestrator at a stand-in server (fake_anthropic.py).
+    return anthropic.Anthropic(
+        base_url=_api_cfg.get("base_url") or None,
+        http_client=anthropic.DefaultHttpxClient(limits=limits),
+        max_retries=0,
+    )
+
+
+def get_client(purpose: str = "main", timeout: float | None = None) -> anthropic.Anthropic:
+    """Return the shared client with the timeout for `purpose` applied.
+
+    `with_options` reuses the underlying HTTP connection pool.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _build_client()
+    return _client.with_options(timeout=timeout or purpose_timeout(purpose))
+
+
+def purpose_timeout(purpose: str) -> float:
+    timeouts = _api_cfg.get("timeouts", {})
+    return timeouts.get(purpose, DEFAULT_TIMEOUTS.get(purpose, 60))
+
+
+def _purpose_attempts(purpose: str) -> int:
+    attempts = _api_cfg.get("attempts", {})
+    return attempts.get(purpose, DEFAULT_ATTEMPTS.get(purpose, 1))
+
+
+def _retry_window(purpose: str) -> float:
+    windows = _api_cfg.get("retry_window", {})
+    return windows.get(purpose, DEFAULT_RETRY_WINDOWS.get(purpose, 0))
+
+
+def _max_wait(purpose: str) -> float:
+    pacing = _api_cfg.get("pacing", {})
+    return pacing.get("max_wait", {}).get(purpose, DEFAULT_MAX_WAIT.get(purpose, 60))
+
+
+def _is_retryable(e: Exception) -> bool:
+    if isinstance(e, anthropic.APIStatusError):
+        # Don't retry on client errors (4xx) except rate limits (429) and overload (529)
+        return e.status_code in (429, 529) or e.status_code >= 500
+    return isinstance(e, (anthropic.APIConnectionError, anthropic.APITimeoutError))
+
+
+def _describe(e: Exception, timeout: float) -> str:
+    if isinstance(e, anthropic.APITimeoutError):
+        return f"API timeout ({timeout}s)"
+    if isinstance(e, anthropic.APIStatusError):
+        return f"API error ({e.status_code})"
+    return "Connection error"
+
+
+# ---------------------------------------------------------------------------
+# Calls
+# ---------------------------------------------------------------------------
+
+def create_message(
+    purpose: str = "main",
+    *,
+    timeout: float | None = None,
+    max_attempts: int | None = None,
+    fallback_model: str = "",
+    **kwargs,
+):
+    """`messages.create` through the shared client and request scheduler, with retries and metrics.
+
+    A retryable failure (429, 529, 5xx, connection) is re-queued after its
+    retry-after or a jittered backoff, for at least `max_attempts` attempts and
+    for as long as the purpose's retry window lasts. Raises the last error after
+    that, or at once on a non-retryable error. The first 529 (overloaded) with a
+    `fallback_model` switches the call to that model and retries right away.
+    """
+    timeout = timeout or purpose_timeout(purpose)
+    attempts = max_attempts or _purpose_attempts(purpose)
+    window = _retry_window(purpose)
+
+    key = cassette.request_key("message", kwargs)
+    if cassette.replaying():
+        return _replay_message(purpose, key)
+
+    client = get_client(purpose, timeout=timeout)
+    cost = _estimate_cost(kwargs)
+    start = time.monotonic()
+    queued = 0.0
+    not_before = 0.0
+    attempt = 0
+    while True:
+        queued += _scheduler.wait_turn(
+            purpose, cost, not_before, _max_wait(purpose), _api_cfg.get("pacing", {}).get("headroom", 0.1),
+            model=kwargs.get("model", ""),
+        )
+        try:
+            raw = client.messages.with_raw_response.create(**kwargs)
+            _note_headers(raw.headers, model=kwargs.get("model", ""))
+            message = raw.parse()
+            _record(
+                purpose, time.monotonic() - start,
+                retries=attempt, usage=message.usage, model=kwargs.get("model", ""), queued=queued,
+            )
+            if cassette.recording():
+                cassette.record(key, "message", kwargs, message.model_dump(mode="json"))
+            return message
+        except Exception as e:
+            if isinstance(e, anthropic.APIStatusError):
+                _note_headers(e.response.headers, status=e.status_code, model=kwargs.get("model", ""))
+            if (
+                fallback_model and fallback_model != kwargs.get("model")
+                and isinstance(e, anthropic.APIStatusError) and e.status_code == 529
+            ):
+                print(f"  API overloaded (529) on {kwargs.get('model')}, falling back to {fallback_model}")
+                kwargs = {**kwargs, "model": fallback_model}
+                fallback_model = ""
+                cost = _estimate_cost(kwargs)
+                not_before = 0.0
+                attempt += 1
+                continue
+            delay = _retry_delay(e, attempt)
+            out_of_time = time.monotonic() - start + delay > window
+            if not _is_retryable(e) or (attempt >= attempts - 1 and out_of_time):
+                _record(purpose, time.monotonic() - start, failed=True, retries=attempt, queued=queued)
+                if cassette.recording():
+                    cassette.record(key, "message", kwargs, {"error": str(e)})
+                raise
+            print(f"  {_describe(e, timeout)}, re-queued for {delay:.0f}s...")
+            not_before = time.time() + delay
+            attempt += 1
+
+
+def _replay_message(purpose: str, key: str):
+    """Answer a messages.create call from the cycle's cassette."""
+    data = cassette.replay(key)
+    if "error" in data:
+        _record(purpose, 0.0, failed=True)
+        raise cassette.ReplayedError(data["error"])
+    message = anthropic.types.Message.model_validate(data)
+    _record(purpose, 0.0, usage=message.usage)
+    return message
+
+
+def count_message_tokens(**kwargs) -> int:
+    """`messages.count_tokens` through the shared client."""
+    key = cassette.request_key("count_tokens", kwargs)
+    if cassette.replaying():
+        return cassette.replay(key)
+
+    start = time.monotonic()
+    try:
+        result = get_client("count_tokens").messages.count_tokens(**kwargs)
+    except Exception:
+        _record("count_tokens", time.monotonic() - start, failed=True)
+        raise
+    _record("count_tokens", time.monotonic() - start)
+    if cassette.recording():
+        cassette.record(key, "count_tokens", kwargs, result.input_tokens)
+    return result.input_tokens
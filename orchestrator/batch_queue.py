@@ -0,0 +1,128 @@
+"""Message Batches queue — latency-insensitive model work at half price, applied in a later cycle."""
+
+import json
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import api_client
+
+# Job kinds that may be deferred to the batch API
+BATCH_KINDS = ("learnings_curation", "narrative_check", "oracle", "lore_rollup")
+
+
+@dataclass
+class BatchJob:
+    custom_id: str
+    kind: str
+    cycle: int
+    params: dict  # messages.create kwargs
+    meta: dict = field(default_factory=dict)
+
+
+class BatchQueue:
+    """Persistent queue of batch jobs.
+
+    Jobs are enqueued during a cycle, flushed as one batch by `submit()`, and
+    their results picked up by `collect()` in whichever later cycle the batch
+    has ended. State lives in a JSON file so restarts don't lose in-flight work.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.pending: list[BatchJob] = []
+        self.in_flight: dict[str, list[BatchJob]] = {}  # batch_id -> jobs
+        if path.exists():
+            try:
+                state = json.loads(path.read_text(encoding="utf-8"))
+                self.pending = [BatchJob(**j) for j in state.get("pending", [])]
+                self.in_flight = {
+                    bid: [BatchJob(**j) for j in jobs]
+                    for bid, jobs in state.get("in_flight", {}).items()
+                }
+            except Exception as e:
+                print(f"  Batch queue unreadable ({e}) — starting empty.")
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            "pending": [asdict(j) for j in self.pending],
+            "in_flight": {bid: [asdict(j) for j in jobs] for bid, jobs in self.in_flight.items()},
+        }
+        self.path.write_text(json.dumps(state, indent=1), encoding="utf-8")
+
+    def enqueue(self, kind: str, cycle: int, params: dict, meta: dict | None = None) -> BatchJob:
+        job = BatchJob(
+            custom_id=f"{kind}-{cycle}-{uuid.uuid4().hex[:8]}",
+            kind=kind,
+            cycle=cycle,
+            params=params,
+            meta=meta or {},
+        )
+        self.pending.append(job)
+        self._save()
+        print(f"  Batch job queued: {job.custom_id}")
+        return job
+
+    def has_outstanding(self, kind: str) -> bool:
+        """True if a job of this kind is queued or waiting on a batch."""
+        jobs = self.pending + [j for js in self.in_flight.values() for j in js]
+        return any(j.kind == kind for j in jobs)
+
+    def submit(self) -> str | None:
+        """Send all pending jobs as one batch. Returns the batch id, or None."""
+        if not self.pending:
+            return None
+        try:
+            batch = api_client.get_client("batch").messages.batches.create(
+                requests=[{"custom_id": j.custom_id, "params": j.params} for j in self.pending],
+            )
+        except Exception as e:
+            print(f"  Batch submit failed ({e}) — will retry next cycle.")
+            return None
+        self.in_flight[batch.id] = self.pending
+        print(f"  Batch submitted: {batch.id} ({len(self.pending)} jobs)")
+        self.pending = []
+        self._save()
+        return batch.id
+
+    def collect(self) -> list[tuple[BatchJob, str, str]]:
+        """Poll in-flight batches. Returns (job, response_text, error) for every finished job.
+
+        `error` is the result type ("errored", "expired", "canceled") of a job
+        that produced no response, and empty otherwise.
+        """
+        if not self.in_flight:
+            return []
+        client = api_client.get_client("batch")
+        finished: list[tuple[BatchJob, str, str]] = []
+
+        for batch_id in list(self.in_flight):
+            try:
+                batch = client.messages.batches.retrieve(batch_id)
+            except Exception as e:
+                print(f"  Batch poll failed for {batch_id} ({e})")
+                continue
+            if batch.processing_status != "ended":
+                continue
+
+            jobs = {j.custom_id: j for j in self.in_flight[batch_id]}
+            try:
+                for entry in client.messages.batches.results(batch_id):
+                    job = jobs.get(entry.custom_id)
+                    if job is None:
+                        continue
+                    if entry.result.type != "succeeded":
+                        finished.append((job, "", entry.result.type))
+                        continue
+                    message = entry.result.message
+                    api_client.record_usage("batch", message.usage, model=message.model, batch=True)
+                    finished.append((job, message.content[0].text, ""))
+            except Exception as e:
+                print(f"  Batch results unreadable for {batch_id} ({e})")
+                continue
+
+            del self.in_flight[batch_id]
+
+        self._save()
+        return finished
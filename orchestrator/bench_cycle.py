@@ -0,0 +1,403 @@
+"""Offline benchmark of the full cycle loop — fake Godot, fake Messages API, synthetic worlds.
+
+Runs `run_cycle` end to end against generated game/ and lore/ trees of
+increasing size, with fake_godot.py standing in for the Godot binary and
+fake_anthropic.py for the API. Reports per-stage wall time, peak Python
+memory and throughput (cycles/hour), and compares against stored baselines.
+
+    python bench_cycle.py --sizes 20,100,400 --cycles 5
+    python bench_cycle.py --save-baseline          # record baselines for this machine
+    python bench_cycle.py --tolerance 0.25         # exit 1 if a stage regresses >25%
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+try:
+    import resource  # Unix only — max RSS is skipped elsewhere
+except ImportError:
+    resource = None
+
+os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+
+import api_client
+import main as orchestrator
+from fake_anthropic import DEFAULT_REPLY, FakeAnthropic
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_BASELINE_PATH = HERE / "bench_baselines.json"
+
+# Stage name -> functions looked up by run_cycle in main's namespace
+STAGES: dict[str, list[str]] = {
+    "context": ["scan_capabilities", "summarize_file_contents_tiered", "compress_world_state"],
+    "prompt": ["build_cycle_prompt"],
+    "baseline": ["capture_baseline_errors"],
+    "llm_call": ["call_llm"],
+    "apply": ["apply_files"],
+    "pre_validate": ["pre_validate_gdscript", "validate_scene_refs"],
+    "repair": ["repair_change"],  # Only when a change fails validation
+    "godot_test": ["test_headless"],
+    "resources": ["impacted", "validate_resources"],
+    "scene_shards": ["test_scenes_sharded"],
+    "smoke": ["run_smoke_test"],
+    "perf": ["perf_history.run_benchmarks"],  # Gate baseline and candidate runs
+    "verify": ["verify_cycle"],  # Runs concurrently with resources, scene_shards and perf
+    "commit": ["git_commit"],
+    "record": ["display_pool.record"],
+}
+
+DOMAINS = ["enemy", "pickup", "room", "ui", "trap"]
+
+
+# ---------------------------------------------------------------------------
+# Synthetic worlds
+# ---------------------------------------------------------------------------
+
+_SCRIPT_TEMPLATE = '''extends Node2D
+## Synthetic {name} for benchmarking.
+
+signal triggered(amount: int)
+
+@export var speed: float = {speed}.0
+@export var health: int = 10
+
+var _timer := 0.0
+var _target: Node2D
+
+
+func _ready() -> void:
+\tadd_to_group("{domain}s")
+
+
+func _physics_process(delta: float) -> void:
+\t_timer += delta
+\tif _timer > 1.0:
+\t\t_timer = 0.0
+\t\ttriggered.emit(health)
+\tif _target:
+\t\tposition = position.move_toward(_target.position, speed * delta)
+
+
+func take_damage(amount: int) -> void:
+\thealth -= amount
+\tif health <= 0:
+\t\tqueue_free()
+'''
+
+_SCENE_TEMPLATE = '''[gd_scene load_steps=2 format=3]
+
+[ext_resource type="Script" path="res://scripts/{name}.gd" id="1"]
+
+[node name="{title}" type="Node2D"]
+script = ExtResource("1")
+
+[node name="Sprite" type="ColorRect" parent="."]
+offset_right = 16.0
+offset_bottom = 16.0
+'''
+
+
+def build_world(root: Path, size: int) -> None:
+    """Generate a git-tracked world with `size` scripts/scenes and a matching amount of lore."""
+    game = root / "game"
+    (game / "scripts").mkdir(parents=True)
+    (game / "scenes").mkdir(parents=True)
+    (root / "lore").mkdir()
+
+    (game / "project.godot").write_text(
+        'config_version=5\n\n[application]\n\nconfig/name="Bench"\n'
+        'run/main_scene="res://scenes/main.tscn"\n',
+        encoding="utf-8",
+    )
+    (game / "scenes" / "main.tscn").write_text(
+        '[gd_scene format=3]\n\n[node name="Main" type="Node2D"]\n', encoding="utf-8",
+    )
+    for i in range(size):
+        domain = DOMAINS[i % len(DOMAINS)]
+        name = f"{domain}_{i}"
+        (game / "scripts" / f"{name}.gd").write_text(
+            _SCRIPT_TEMPLATE.format(name=name, domain=domain, speed=50 + i), encoding="utf-8",
+        )
+        (game / "scenes" / f"{name}.tscn").write_text(
+            _SCENE_TEMPLATE.format(name=name, title=name.title().replace("_", "")), encoding="utf-8",
+        )
+
+    entries = "\n".join(
+        f'    <entry day="{d}">The machine shaped chamber {d} from memory and rust.</entry>'
+        for d in range(1, size + 1)
+    )
+    (root / "lore" / "world_state.xml").write_text(
+        f"<?xml version='1.0' encoding='utf-8'?>\n<world_state current_day=\"{size}\">\n"
+        f"  <chronicle>\n{entries}\n  </chronicle>\n</world_state>\n",
+        encoding="utf-8",
+    )
+    cycles = "\n".join(
+        f'  <cycle day="{d}" action="spawn" target="{DOMAINS[d % len(DOMAINS)]}_{d}" result="success" />'
+        for d in range(max(1, size - 19), size + 1)
+    )
+    (root / "lore" / "cycle_log.xml").write_text(
+        f"<?xml version='1.0' encoding='utf-8'?>\n<cycle_log>\n{cycles}\n</cycle_log>\n", encoding="utf-8",
+    )
+    learnings = "".join(
+        f"- **Cycle {d}** [discovery] (spawn): Use @onready for node refs in {DOMAINS[d % len(DOMAINS)]}_{d}.gd.\n"
+        for d in range(max(1, size - 49), size + 1)
+    )
+    (root / "lore" / "learnings.md").write_text("# GODMACHINE Learnings\n\n" + learnings, encoding="utf-8")
+
+    git = lambda *a: subprocess.run(["git", *a], cwd=root, check=True, capture_output=True)
+    git("init", "-q")
+    git("config", "user.email", "bench@localhost")
+    git("config", "user.name", "bench")
+    git("add", "-A")
+    git("commit", "-qm", "synthetic world")
+
+
+def write_godot_shim(root: Path) -> str:
+    """An executable that runs fake_godot.py with this interpreter."""
+    fake = HERE / "fake_godot.py"
+    if os.name == "nt":
+        shim = root / "fake_godot.bat"
+        shim.write_text(f'@"{sys.executable}" "{fake}" %*\n', encoding="utf-8")
+    else:
+        shim = root / "fake_godot"
+        shim.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{fake}" "$@"\n', encoding="utf-8")
+        shim.chmod(0o755)
+    return str(shim)
+
+
+def cycle_reply_factory():
+    """Model replies that add one new enemy per cycle, so every cycle has something to commit."""
+    counter = itertools.count(1)
+
+    def reply(body: dict) -> str:
+        n = next(counter)
+        return (
+            f"<action>spawn</action>\n<target>bench_enemy_{n}</target>\n\n<files>\n"
+            f'<file path="game/scripts/bench_enemy_{n}.gd" mode="create">\n'
+            + _SCRIPT_TEMPLATE.format(name=f"bench_enemy_{n}", domain="enemy", speed=60)
+            + "</file>\n"
+            f'<file path="game/scenes/bench_enemy_{n}.tscn" mode="create">\n'
+            + _SCENE_TEMPLATE.format(name=f"bench_enemy_{n}", title=f"BenchEnemy{n}")
+            + "</file>\n</files>\n\n"
+            f"<lore_entry>A benchmark creature, number {n}, crawled out of the test harness.</lore_entry>\n"
+            f"<patch_notes>bench enemy {n}. it exists to be measured.</patch_notes>\n"
+            f"<learning>Synthetic cycle {n} completed.</learning>\n"
+        )
+
+    return reply
+
+
+# ---------------------------------------------------------------------------
+# Stage timing
+# ---------------------------------------------------------------------------
+
+class StageTimer:
+    """Wraps main's stage functions and accumulates wall time per stage per cycle."""
+
+    def __init__(self):
+        self.current: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._originals: dict[str, object] = {}
+
+    def _wrap(self, stage: str, fn):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.current[stage] = self.current.get(stage, 0.0) + time.perf_counter() - start
+        return timed
+
+    @staticmethod
+    def _owner(name: str) -> tuple[object, str]:
+        """Object holding `name` — main itself, or a module main uses ("display_pool.record")."""
+        module, _, attr = name.rpartition(".")
+        return (getattr(orchestrator, module) if module else orchestrator), attr
+
+    def install(self) -> None:
+        for stage, names in STAGES.items():
+            for name in names:
+                owner, attr = self._owner(name)
+                self._originals[name] = getattr(owner, attr)
+                setattr(owner, attr, self._wrap(stage, self._originals[name]))
+
+    def uninstall(self) -> None:
+        for name, fn in self._originals.items():
+            owner, attr = self._owner(name)
+            setattr(owner, attr, fn)
+        self._originals.clear()
+
+    def take(self) -> dict[str, float]:
+        with self._lock:
+            times, self.current = self.current, {}
+        return times
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def bench_config(godot_exe: str, base_url: str) -> dict:
+    config = orchestrator.load_config()
+    config["godot"]["executable"] = godot_exe
+    config.setdefault("api", {})["base_url"] = base_url
+    config.setdefault("twitter", {})["enabled"] = False
+    config.setdefault("batch", {})["enabled"] = False
+    config.setdefault("cassette", {})["mode"] = "off"
+    config.setdefault("recording", {})["enabled"] = True
+    perf_cfg = config.setdefault("perf", {})
+    perf_cfg["enabled"] = True
+    perf_cfg.setdefault("gate", {})["enabled"] = True
+    return config
+
+
+def run_size(size: int, cycles: int, fake: FakeAnthropic, godot_behaviour: dict, verbose: bool = False) -> dict:
+    """Benchmark `cycles` cycles (after one warm-up) on a world of `size` scripts."""
+    timer = StageTimer()
+    with tempfile.TemporaryDirectory(prefix=f"godmachine_bench_{size}_") as tmp:
+        root = Path(tmp)
+        build_world(root, size)
+        godot_exe = write_godot_shim(root)
+        behaviour_path = root / "fake_godot.json"
+        behaviour_path.write_text(json.dumps(godot_behaviour), encoding="utf-8")
+        os.environ["FAKE_GODOT_SCRIPT"] = str(behaviour_path)
+
+        config = bench_config(godot_exe, fake.base_url)
+        api_client.configure(config)
+        saved_root = orchestrator.ROOT
+        orchestrator.set_root(root)
+        timer.install()
+
+        samples: list[dict] = []
+        try:
+            for i in range(cycles + 1):
+                out = io.StringIO()
+                tracemalloc.start()
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(sys.stdout if verbose else out):
+                    orchestrator.run_cycle(config)
+                total = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                stages = timer.take()
+                if i == 0:
+                    continue  # Warm-up: imports, pool connections, first git objects
+                stages["total"] = total
+                stages["peak_mb"] = peak / 1e6
+                samples.append(stages)
+        finally:
+            timer.uninstall()
+            orchestrator.set_root(saved_root)
+
+    stage_names = sorted({k for s in samples for k in s} - {"peak_mb"})
+    report = {
+        "size": size,
+        "cycles": len(samples),
+        "stages_ms": {
+            name: round(statistics.mean(s.get(name, 0.0) for s in samples) * 1000, 2)
+            for name in stage_names
+        },
+        "peak_mb": round(max(s["peak_mb"] for s in samples), 2),
+    }
+    report["cycles_per_hour"] = round(3600 / (report["stages_ms"]["total"] / 1000), 1)
+    return report
+
+
+def compare(reports: list[dict], baselines: dict, tolerance: float, min_ms: float) -> list[str]:
+    """Regressions: a stage slower than baseline by more than `tolerance` and `min_ms`."""
+    flagged = []
+    for report in reports:
+        base = baselines.get(str(report["size"]))
+        if not base:
+            continue
+        for stage, ms in report["stages_ms"].items():
+            before = base["stages_ms"].get(stage)
+            if before is None:
+                continue
+            if ms > before * (1 + tolerance) and ms - before > min_ms:
+                flagged.append(f"size {report['size']}: {stage} {before:.1f}ms -> {ms:.1f}ms")
+        if report["peak_mb"] > base["peak_mb"] * (1 + tolerance):
+            flagged.append(f"size {report['size']}: peak memory {base['peak_mb']}MB -> {report['peak_mb']}MB")
+    return flagged
+
+
+def print_report(reports: list[dict]) -> None:
+    stages = sorted({k for r in reports for k in r["stages_ms"]}, key=lambda s: (s == "total", s))
+    print(f"\n{'stage (ms)':<14}" + "".join(f"{'size ' + str(r['size']):>14}" for r in reports))
+    for stage in stages:
+        print(f"{stage:<14}" + "".join(f"{r['stages_ms'].get(stage, 0.0):>14.1f}" for r in reports))
+    print(f"{'peak MB':<14}" + "".join(f"{r['peak_mb']:>14.2f}" for r in reports))
+    print(f"{'cycles/hour':<14}" + "".join(f"{r['cycles_per_hour']:>14.1f}" for r in reports))
+    if resource is not None:
+        rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"\nProcess max RSS: {rss_mb:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the GODMACHINE cycle loop.")
+    parser.add_argument("--sizes", default="20,100,400", help="Comma-separated world sizes (scripts)")
+    parser.add_argument("--cycles", type=int, default=5, help="Measured cycles per size")
+    parser.add_argument("--godot-delay", type=float, default=0.05, help="Fake Godot startup seconds")
+    parser.add_argument("--godot-per-file", type=float, default=0.0005, help="Fake Godot seconds per script")
+    parser.add_argument("--api-latency", type=float, default=0.05, help="Fake API seconds per request")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE_PATH))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-ms", type=float, default=5.0, help="Ignore regressions smaller than this")
+    parser.add_argument("--json", help="Write the full report to this file")
+    parser.add_argument("--verbose", action="store_true", help="Show orchestrator output")
+    args = parser.parse_args()
+
+    fake = FakeAnthropic(
+        default_reply=cycle_reply_factory(),
+        rules=[("Respond with ONLY valid JSON", DEFAULT_REPLY)],
+        latency=args.api_latency,
+    )
+    fake.start()
+    godot_behaviour = {"delay": args.godot_delay, "per_file_delay": args.godot_per_file}
+
+    reports = []
+    try:
+        for size in (int(s) for s in args.sizes.split(",")):
+            print(f"Benchmarking world size {size}...")
+            reports.append(run_size(size, args.cycles, fake, godot_behaviour, args.verbose))
+    finally:
+        fake.stop()
+
+    print_report(reports)
+    if args.json:
+        Path(args.json).write_text(json.dumps(reports, indent=2), encoding="utf-8")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baselines = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+        baselines.update({str(r["size"]): r for r in reports})
+        baseline_path.write_text(json.dumps(baselines, indent=2), encoding="utf-8")
+        print(f"Baselines saved: {baseline_path}")
+        return
+
+    if baseline_path.exists():
+        flagged = compare(reports, json.loads(baseline_path.read_text(encoding="utf-8")), args.tolerance, args.min_ms)
+        if flagged:
+            print("\nREGRESSIONS:")
+            for line in flagged:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Record/replay cassettes — a cycle's model calls and Godot subprocesses, for offline re-runs.
+
+In `record` mode every model request/response and every Godot subprocess result
+of a cycle is written to a gzipped per-cycle bundle, keyed by a content hash of
+the request. In `replay` mode the same calls are answered from the bundle with
+no network and no Godot, so orchestrator changes can be regression-tested and
+profiled against real historical cycles.
+
+Replay a cycle in a scratch clone checked out at the commit before that cycle —
+the orchestrator still writes, rolls back and commits files as usual.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import subprocess
+import threading
+from pathlib import Path
+
+
+class CassetteMiss(Exception):
+    """Replay found no recorded interaction for a request."""
+
+
+class ReplayedError(Exception):
+    """A failure that was recorded and is being replayed."""
+
+
+_lock = threading.Lock()
+_mode = "off"  # off | record | replay
+_dir: Path | None = None
+_cycle: int | None = None
+_tape: dict[str, dict] = {}
+_cursor: dict[str, int] = {}
+
+
+def configure(config: dict | None, root: Path) -> None:
+    """Apply the `cassette` config section."""
+    global _mode, _dir
+    cassette_cfg = (config or {}).get("cassette", {}) or {}
+    _mode = cassette_cfg.get("mode", "off")
+    _dir = root / cassette_cfg.get("dir", "output/cassettes")
+
+
+def recording() -> bool:
+    return _mode == "record" and _cycle is not None
+
+
+def replaying() -> bool:
+    return _mode == "replay" and _cycle is not None
+
+
+def bundle_path(cycle_num: int) -> Path:
+    return _dir / f"cycle_{cycle_num}.json.gz"
+
+
+def begin_cycle(cycle_num: int) -> None:
+    """Start a cycle's tape — empty when recording, loaded from its bundle when replaying."""
+    global _cycle, _tape, _cursor
+    with _lock:
+        _cycle = cycle_num if _mode in ("record", "replay") else None
+        _tape, _cursor = {}, {}
+        if _mode == "replay":
+            path = bundle_path(cycle_num)
+            if not path.exists():
+                raise CassetteMiss(f"No cassette for cycle {cycle_num} at {path}")
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                _tape = json.load(f)["interactions"]
+            print(f"  Replaying cassette: {path}")
+
+
+def end_cycle() -> None:
+    """Write the cycle's bundle (record mode) and close the tape."""
+    global _cycle
+    with _lock:
+        if _mode == "record" and _cycle is not None and _tape:
+            path = bundle_path(_cycle)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                json.dump({"cycle": _cycle, "interactions": _tape}, f)
+            print(f"  Cassette recorded: {path}")
+        _cycle = None
+
+
+def request_key(kind: str, request) -> str:
+    """Content hash of a request."""
+    blob = json.dumps([kind, request], sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+
+def record(key: str, kind: str, request, response) -> None:
+    """Append a response to the tape. Repeated identical requests keep their order."""
+    with _lock:
+        entry = _tape.setdefault(key, {"kind": kind, "request": request, "responses": []})
+        entry["responses"].append(response)
+
+
+def replay(key: str):
+    """Next recorded response for a request."""
+    with _lock:
+        entry = _tape.get(key)
+        index = _cursor.get(key, 0)
+        if entry is None or index >= len(entry["responses"]):
+            raise CassetteMiss(f"No recorded interaction for {key} in cycle {_cycle}")
+        _cursor[key] = index + 1
+        return entry["responses"][index]
+
+
+# ---------------------------------------------------------------------------
+# Subprocesses
+# ---------------------------------------------------------------------------
+
+# Flags naming a file the process writes — a fresh, timestamped path on every run
+_OUTPUT_FLAGS = {"--autopilot-log"}
+
+
+def _normalize_arg(arg: str) -> str:
+    """An argument with an absolute path (bare or as `--flag=path`) reduced to the path's name.
+
+    Output paths (`_OUTPUT_FLAGS`) become a placeholder, since they aren't inputs.
+    """
+    flag, eq, value = arg.partition("=")
+    if eq and flag in _OUTPUT_FLAGS:
+        return f"{flag}=<output>"
+    if eq and flag.startswith("-"):
+        return f"{flag}={_normalize_arg(value)}"
+    return Path(arg).name if os.path.isabs(arg) else arg
+
+
+def _normalize_cmd(cmd: list[str]) -> list[str]:
+    """Machine-independent form of a command: executable and absolute paths reduced to names."""
+    return ["<exe>"] + [_normalize_arg(str(arg)) for arg in cmd[1:]]
+
+
+def run(cmd: list[str], timeout: float | None = None, **kwargs) -> subprocess.CompletedProcess:
+    """`subprocess.run(cmd, capture_output=True, text=True)` that records or replays its result."""
+    if not (recording() or replaying()):
+        return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, **kwargs)
+
+    request = _normalize_cmd(cmd)
+    key = request_key("subprocess", request)
+
+    if replaying():
+        result = replay(key)
+        if result.get("timeout"):
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        if result.get("missing"):
+            raise FileNotFoundError(cmd[0])
+        return subprocess.CompletedProcess(cmd, result["returncode"], result["stdout"], result["stderr"])
+
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, **kwargs)
+    except subprocess.TimeoutExpired:
+        record(key, "subprocess", request, {"timeout": True})
+        raise
+    except FileNotFoundError:
+        record(key, "subprocess", request, {"missing": True})
+        raise
+    record(key, "subprocess", request, {
+        "returncode": proc.returncode, "stdout": proc.stdout, "stderr": proc.stderr,
+    })
+    return proc
@@ -0,0 +1,99 @@
+"""Post-processing for gameplay clips — keep the most active span, encode to a size.
+
+The recording captures a longer window than the posted clip. FFmpeg scores
+every frame by motion (signalstats YDIF, the mean luma change from the
+previous frame) and scene-change energy (the `scene` score), the scores are
+summed into one-second segments, and the contiguous run of segments with the
+most activity becomes the clip. Encoding targets a file size in one pass with
+a capped bitrate, instead of a fixed CRF whose size depends on the content.
+"""
+
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+import telemetry
+
+# A full scene change (score 1.0) counts like this many levels of mean luma change
+SCENE_WEIGHT = 50.0
+# Share of the target size given to video; the rest covers container overhead
+SIZE_MARGIN = 0.92
+
+_FRAME_RE = re.compile(r"^frame:\s*\d+\s+pts:\s*\S+\s+pts_time:\s*([\d.]+)")
+_METRIC_RE = re.compile(r"^lavfi\.(signalstats\.YDIF|scene_score)=([\d.]+)")
+
+
+def parse_activity(output: str) -> list[tuple[float, float]]:
+    """(time, score) per frame from the `metadata=mode=print` filter output."""
+    frames = []
+    for line in output.splitlines():
+        m = _FRAME_RE.match(line.strip())
+        if m:
+            frames.append([float(m.group(1)), 0.0])
+            continue
+        m = _METRIC_RE.match(line.strip())
+        if m and frames:
+            value = float(m.group(2))
+            frames[-1][1] += value * SCENE_WEIGHT if m.group(1) == "scene_score" else value
+    return [(t, score) for t, score in frames]
+
+
+@telemetry.traced("clip_activity")
+def frame_activity(video: Path, timeout: int = 60) -> list[tuple[float, float]]:
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        return []
+    cmd = [
+        ffmpeg, "-hide_banner", "-nostats", "-i", str(video),
+        "-vf", "scale=320:-2,signalstats,select='gte(scene\\,0)',metadata=mode=print:file=-",
+        "-an", "-f", "null", "-",
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except (subprocess.TimeoutExpired, OSError) as e:
+        print(f"  Clip activity scan failed: {e}")
+        return []
+    return parse_activity(result.stdout)
+
+
+def most_active_window(activity: list[tuple[float, float]], length: float, segment: float = 1.0) -> float:
+    """Start time of the `length`-second span with the most activity."""
+    if not activity or length <= 0:
+        return 0.0
+    end = activity[-1][0]
+    if end <= length:
+        return 0.0
+    segments = [0.0] * (int(end / segment) + 1)
+    for t, score in activity:
+        segments[int(t / segment)] += score
+    prefix = [0.0]
+    for score in segments:
+        prefix.append(prefix[-1] + score)
+
+    width = max(1, round(length / segment))
+    last_start = max(0, len(segments) - width)
+    # Most activity; ties keep the earlier span
+    best = max(
+        range(last_start + 1),
+        key=lambda i: (prefix[min(i + width, len(segments))] - prefix[i], -i),
+    )
+    return min(best * segment, end - length)  # The last segment may be partial
+
+
+def target_bitrate_kbps(target_bytes: int, length: float) -> int:
+    """Video bitrate that lands a `length`-second clip near `target_bytes`."""
+    return max(100, int(target_bytes * 8 * SIZE_MARGIN / max(length, 0.1) / 1000))
+
+
+def encode_args(start: float = 0.0, length: float = 0.0, target_bytes: int = 0) -> tuple[list[str], list[str]]:
+    """(input options, output options) for trimming and size-targeted H.264."""
+    before_input = ["-ss", f"{start:.3f}"] if start > 0 else []
+    if length > 0:
+        before_input += ["-t", f"{length:.3f}"]
+    if target_bytes and length > 0:
+        kbps = target_bitrate_kbps(target_bytes, length)
+        rate = ["-b:v", f"{kbps}k", "-maxrate", f"{kbps}k", "-bufsize", f"{kbps * 2}k"]
+    else:
+        rate = ["-crf", "23"]
+    return before_input, rate
@@ -0,0 +1,201 @@
+"""Local code index of the game project — served to the model through tools.
+
+With `context.mode: lazy` the cycle prompt carries only `CodeIndex.summary()`
+(one line per script and scene), and the model pulls in what it needs with
+three tools: read_file, search_symbol and list_scene.
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+_DEFINITION_RE = re.compile(
+    r"^\s*(?:static\s+)?(func|signal|class_name|const|var|@export\s+var|@onready\s+var)\s+(\w+)"
+)
+_EXTENDS_RE = re.compile(r"^extends\s+(.+)$", re.MULTILINE)
+_NODE_RE = re.compile(r'^\[node name="([^"]+)"(?: type="([^"]+)")?(?: parent="([^"]*)")?(?: instance=ExtResource\("([^"]+)"\))?')
+_EXT_RE = re.compile(r'^\[ext_resource[^\]]*?path="([^"]+)"[^\]]*?id="([^"]+)"')
+_SCRIPT_REF_RE = re.compile(r'^script = ExtResource\("([^"]+)"\)')
+
+TOOLS = [
+    {
+        "name": "read_file",
+        "description": (
+            "Full source of one game file (.gd, .tscn, .tres or project.godot). "
+            "Paths as in the index, e.g. scripts/player.gd."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {"path": {"type": "string"}},
+            "required": ["path"],
+        },
+    },
+    {
+        "name": "search_symbol",
+        "description": (
+            "Where a function, signal, class_name, variable or constant is defined, "
+            "and the lines that use it, across all scripts and scenes."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {"name": {"type": "string"}},
+            "required": ["name"],
+        },
+    },
+    {
+        "name": "list_scene",
+        "description": "Node tree of a .tscn scene: names, types, parents, attached scripts and instanced scenes.",
+        "input_schema": {
+            "type": "object",
+            "properties": {"path": {"type": "string"}},
+            "required": ["path"],
+        },
+    },
+]
+
+
+@dataclass
+class Definition:
+    name: str
+    kind: str
+    file: str
+    line: int
+    text: str
+
+
+class CodeIndex:
+    """Sources and definitions of every script and scene, read once per cycle."""
+
+    def __init__(self, game_path: Path, max_file_chars: int = 20000, max_results: int = 25):
+        self.game_path = game_path
+        self.max_file_chars = max_file_chars
+        self.max_results = max_results
+        self.files: dict[str, str] = {}
+        self.definitions: dict[str, list[Definition]] = {}
+        self.calls: list[tuple[str, str]] = []  # (tool, argument) served this cycle
+        self.chars_served = 0
+
+        for path in sorted(game_path.rglob("*")):
+            if path.suffix not in (".gd", ".tscn", ".tres") or ".godot" in path.parts or path.name.startswith("_"):
+                continue
+            try:
+                self.files[path.relative_to(game_path).as_posix()] = path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                continue
+        project = game_path / "project.godot"
+        if project.exists():
+            self.files["project.godot"] = project.read_text(encoding="utf-8")
+
+        for rel, text in self.files.items():
+            if not rel.endswith(".gd"):
+                continue
+            for i, line in enumerate(text.splitlines(), 1):
+                m = _DEFINITION_RE.match(line)
+                if m:
+                    kind = m.group(1).split()[-1] if m.group(1) != "class_name" else "class_name"
+                    self.definitions.setdefault(m.group(2), []).append(
+                        Definition(m.group(2), kind, rel, i, line.strip()),
+                    )
+
+    def _normalize(self, path: str) -> str:
+        path = path.strip().removeprefix("res://").removeprefix("./")
+        return path.removeprefix("game/")
+
+    # -- prompt ------------------------------------------------------------
+
+    def summary(self) -> str:
+        """One line per file: scripts with their base class and functions, scenes with their root."""
+        lines = []
+        for rel, text in self.files.items():
+            if rel.endswith(".gd"):
+                m = _EXTENDS_RE.search(text)
+                funcs = [d.name for defs in self.definitions.values() for d in defs if d.file == rel and d.kind == "func"]
+                names = ", ".join(funcs[:12]) + (f", +{len(funcs) - 12}" if len(funcs) > 12 else "")
+                lines.append(f"- {rel} — extends {m.group(1).strip() if m else '?'}; {len(text.splitlines())} lines; {names}")
+            elif rel.endswith(".tscn"):
+                nodes = [m for m in map(_NODE_RE.match, text.splitlines()) if m]
+                root = f"{nodes[0].group(1)} ({nodes[0].group(2) or 'instance'})" if nodes else "?"
+                lines.append(f"- {rel} — root {root}; {len(nodes)} nodes")
+            elif rel == "project.godot":
+                lines.append("- project.godot — autoloads, input actions, physics layers")
+            else:
+                lines.append(f"- {rel}")
+        return "\n".join(lines)
+
+    def prompt_section(self) -> str:
+        return (
+            "Full sources are not included this cycle. Use the read_file, search_symbol and "
+            "list_scene tools to look at exactly what you need before writing code — read every "
+            "file you edit or extend, and check the names you call.\n\n" + self.summary()
+        )
+
+    # -- tools -------------------------------------------------------------
+
+    def read_file(self, path: str) -> str:
+        rel = self._normalize(path)
+        text = self.files.get(rel)
+        if text is None:
+            close = [f for f in self.files if Path(f).name == Path(rel).name]
+            hint = f" Did you mean {close[0]}?" if close else ""
+            return f"No such file: {rel}.{hint}"
+        if len(text) > self.max_file_chars:
+            return text[: self.max_file_chars] + f"\n... (truncated at {self.max_file_chars} characters)"
+        return text
+
+    def search_symbol(self, name: str) -> str:
+        name = name.strip()
+        defs = self.definitions.get(name, [])
+        word = re.compile(rf"\b{re.escape(name)}\b")
+        refs = []
+        for rel, text in self.files.items():
+            for i, line in enumerate(text.splitlines(), 1):
+                if word.search(line) and not any(d.file == rel and d.line == i for d in defs):
+                    refs.append(f"{rel}:{i}: {line.strip()[:160]}")
+        if not defs and not refs:
+            return f"No definitions or uses of {name}."
+        out = [f"Definitions of {name}:"]
+        out.extend([f"{d.file}:{d.line}: {d.text}" for d in defs] or ["(none)"])
+        out.append(f"Uses ({len(refs)}):")
+        out.extend(refs[: self.max_results])
+        if len(refs) > self.max_results:
+            out.append(f"... and {len(refs) - self.max_results} more")
+        return "\n".join(out)
+
+    def list_scene(self, path: str) -> str:
+        rel = self._normalize(path)
+        text = self.files.get(rel)
+        if text is None or not rel.endswith(".tscn"):
+            return f"No such scene: {rel}."
+        ext = {}
+        out = [rel]
+        current = None
+        for line in text.splitlines():
+            m = _EXT_RE.match(line)
+            if m:
+                ext[m.group(2)] = m.group(1).removeprefix("res://")
+                continue
+            m = _NODE_RE.match(line)
+            if m:
+                name, kind, parent, instance = m.groups()
+                depth = 0 if parent is None else (1 if parent == "." else parent.count("/") + 2)
+                current = f"{'  ' * depth}{name}: {kind or 'instance of ' + ext.get(instance, '?')}"
+                out.append(current)
+                continue
+            m = _SCRIPT_REF_RE.match(line)
+            if m and current is not None:
+                out[-1] += f" [script {ext.get(m.group(1), '?')}]"
+        return "\n".join(out)
+
+    def run_tool(self, name: str, tool_input: dict) -> str:
+        handlers = {"read_file": self.read_file, "search_symbol": self.search_symbol, "list_scene": self.list_scene}
+        handler = handlers.get(name)
+        if handler is None:
+            return f"Unknown tool {name}."
+        argument = next(iter(tool_input.values()), "") if tool_input else ""
+        self.calls.append((name, str(argument)))
+        result = handler(str(argument))
+        self.chars_served += len(result)
+        return result
+
+    def describe_calls(self) -> str:
+        return ", ".join(f"{tool}({arg})" for tool, arg in self.calls)
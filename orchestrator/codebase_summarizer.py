@@ -26,25 +26,26 @@ def classify_file_domain(filepath: str) -> str:
     return "other"
 
 
+_SIGNATURE_RE = re.compile(
+    r"^\s*("
+    r"extends\s|class_name\s|@export\s|func\s|signal\s|const\s"
+    r")"
+)
+
+
+def extract_signatures(source: str) -> str:
+    """Pull extends, class_name, @export, func, signal, const lines from GDScript source."""
+    sigs = [line.rstrip() for line in source.splitlines() if _SIGNATURE_RE.match(line)]
+    return "\n".join(sigs) if sigs else "(no signatures)"
+
+
 def _extract_signatures(path: Path) -> str:
-    """Pull extends, class_name, @export, func, signal, const lines from a .gd file."""
+    """Signatures of a .gd file on disk."""
     try:
-        lines = path.read_text(encoding="utf-8").splitlines()
+        return extract_signatures(path.read_text(encoding="utf-8"))
     except Exception:
         return "(unreadable)"
 
-    sig_patterns = re.compile(
-        r"^\s*("
-        r"extends\s|class_name\s|@export\s|func\s|signal\s|const\s"
-        r")"
-    )
-
-    sigs = []
-    for line in lines:
-        if sig_patterns.match(line):
-            sigs.append(line.rstrip())
-    return "\n".join(sigs) if sigs else "(no signatures)"
-
 
 # ---------------------------------------------------------------------------
 # Tiered summarization
@@ -164,10 +165,14 @@ def compress_world_state(xml_text: str, max_entries: int = 10) -> str:
     # Split into old (to summarize) and recent (to keep verbatim)
     old_entries = entries[:-max_entries]
     recent_entries = entries[-max_entries:]
+    # Summaries already written by lore rollups cover the oldest days — keep them first
+    rolled_up = chronicle.findall("summary")
 
     # Remove all entries from chronicle
     for e in list(chronicle):
         chronicle.remove(e)
+    for e in rolled_up:
+        chronicle.append(e)
 
     # Summarize old entries in batches of 3
     for i in range(0, len(old_entries), 3):
@@ -0,0 +1,85 @@
+"""Per-cycle context snapshot — one rendering of the cycle's state for every model call.
+
+The snapshot is built once per cycle, after the context is gathered, and never
+changes afterwards. The main call sends `render()` as its first user block, with
+a cache breakpoint, followed by the cycle-specific instructions. The Oracle sends
+the same block and gets a cache hit on the prefix the main call already paid for.
+A hit also needs the same model, tools and system prompt, so the Oracle only
+shares the prefix when it runs on the main model (see oracle.build_oracle_request).
+
+Sections go from the most stable to the least, ending with the file contents.
+"""
+
+import hashlib
+from dataclasses import dataclass, replace
+from functools import cached_property
+
+TRUNCATED_NOTE = "\n\n... (file contents truncated to fit token budget)"
+OMITTED_NOTE = "(file contents omitted — token budget exceeded. See codebase summary above.)"
+
+
+@dataclass(frozen=True)
+class ContextSnapshot:
+    cycle_num: int
+    cycle_log_xml: str = ""
+    world_state_xml: str = ""
+    soul_state: str = ""
+    capabilities: str = ""
+    learnings: str = ""
+    lint_notes: str = ""  # Prompt only: kept apart so curation never writes them into learnings.md
+    file_contents: str = ""
+
+    @cached_property
+    def text(self) -> str:
+        """The shared prefix, identical for every call that renders this snapshot."""
+        parts = []
+        if self.capabilities:
+            parts.extend(["## Game Capabilities", self.capabilities, ""])
+        if self.soul_state:
+            parts.extend([
+                "## Your Soul",
+                "This is your persistent inner state. You wrote it. You may rewrite it.",
+                self.soul_state,
+                "",
+            ])
+        if self.learnings:
+            parts.extend(["## Learnings (accumulated knowledge from past cycles)", self.learnings, ""])
+        if self.lint_notes:
+            parts.extend([self.lint_notes, ""])
+        parts.extend([
+            "## World State (Lore)",
+            f"```xml\n{self.world_state_xml}\n```",
+            "",
+            "## Recent Cycle Log",
+            f"```xml\n{self.cycle_log_xml}\n```",
+            "",
+            "## Current File Contents",
+            self.file_contents,
+        ])
+        return "\n".join(parts)
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256(self.text.encode("utf-8")).hexdigest()[:12]
+
+    def tokens(self) -> int:
+        return len(self.text) // 4
+
+    def fit(self, token_budget: int, reserve_tokens: int = 0) -> "ContextSnapshot":
+        """A snapshot whose prefix plus `reserve_tokens` fits the budget, trimming file contents."""
+        overshoot = self.tokens() + reserve_tokens - token_budget
+        if overshoot <= 0 or not self.file_contents:
+            return self
+        chars_to_trim = overshoot * 4
+        if chars_to_trim < len(self.file_contents):
+            contents = self.file_contents[: len(self.file_contents) - chars_to_trim] + TRUNCATED_NOTE
+        else:
+            contents = OMITTED_NOTE
+        return replace(self, file_contents=contents)
+
+    def blocks(self, tail: str) -> list[dict]:
+        """User message content: the cached shared prefix, then `tail`."""
+        return [
+            {"type": "text", "text": self.text, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": tail},
+        ]
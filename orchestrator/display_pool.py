@@ -0,0 +1,272 @@
+"""Virtual X displays for Movie Maker recordings on headless Linux servers.
+
+Movie Maker can't run with --headless, so each recording needs a display. The
+pool starts Xvfb servers on demand (`:99`, `:100`, ... skipping numbers another
+server holds), hands each recording its own display with software rendering,
+restarts servers that died, and shuts them all down at exit. Callers on
+different threads get different displays, so clips can render concurrently.
+
+    recording:
+      virtual_display:
+        enabled: true
+        displays: 2
+"""
+
+import atexit
+import os
+import select
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from godot_runner import RecordingResult, record_gameplay
+
+# Godot/X11 messages that mean the display, not the game, failed
+DISPLAY_FAILURES = (
+    "can't open display",
+    "cannot open display",
+    "failed to open x display",
+    "x11 display server",
+    "unable to initialize",
+    "no video driver",
+)
+
+
+class DisplayUnavailable(Exception):
+    """No virtual display could be started or freed in time."""
+
+
+@dataclass
+class VirtualDisplay:
+    number: int
+    process: subprocess.Popen | None = None
+    software_rendering: bool = True
+    restarts: int = 0
+
+    @property
+    def name(self) -> str:
+        return f":{self.number}"
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    @property
+    def env(self) -> dict[str, str]:
+        """Environment for a process that should render on this display."""
+        env = dict(os.environ)
+        env.pop("WAYLAND_DISPLAY", None)
+        env["DISPLAY"] = self.name
+        if self.software_rendering:
+            env["LIBGL_ALWAYS_SOFTWARE"] = "1"  # Mesa llvmpipe; no GPU on these boxes
+            env["GALLIUM_DRIVER"] = "llvmpipe"
+        return env
+
+
+class DisplayPool:
+    def __init__(
+        self,
+        size: int = 2,
+        first: int = 99,
+        resolution: str = "1280x720x24",
+        software_rendering: bool = True,
+        xvfb: str = "Xvfb",
+        start_timeout: float = 10.0,
+    ):
+        self.size = max(1, size)
+        self.first = first
+        self.resolution = resolution
+        self.software_rendering = software_rendering
+        self.xvfb = xvfb
+        self.start_timeout = start_timeout
+        self._free: list[VirtualDisplay] = []
+        self._busy: set[int] = set()
+        self._created = 0
+        self._next_number = first
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _claim_number(self) -> int:
+        """Next display number no other X server holds."""
+        while Path(f"/tmp/.X{self._next_number}-lock").exists():
+            self._next_number += 1
+        number = self._next_number
+        self._next_number += 1
+        return number
+
+    def _start(self, display: VirtualDisplay) -> None:
+        """Start Xvfb and wait until it reports itself ready on -displayfd
+        (a leftover socket file from a crashed server proves nothing)."""
+        read_fd, write_fd = os.pipe()
+        try:
+            display.process = subprocess.Popen(
+                [self.xvfb, display.name, "-screen", "0", self.resolution,
+                 "-nolisten", "tcp", "-noreset", "-displayfd", str(write_fd)],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, pass_fds=(write_fd,),
+            )
+            os.close(write_fd)
+            write_fd = -1
+            ready, _, _ = select.select([read_fd], [], [], self.start_timeout)
+            if ready and os.read(read_fd, 16).strip():
+                return
+        finally:
+            os.close(read_fd)
+            if write_fd >= 0:
+                os.close(write_fd)
+        self._stop(display)
+        raise DisplayUnavailable(f"Xvfb {display.name} did not start")
+
+    @staticmethod
+    def _stop(display: VirtualDisplay) -> None:
+        if display.process is None:
+            return
+        if display.process.poll() is None:
+            display.process.terminate()
+            try:
+                display.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                display.process.kill()
+        display.process = None
+
+    def _restart(self, display: VirtualDisplay) -> None:
+        self._stop(display)
+        display.restarts += 1
+        try:
+            self._start(display)
+        except DisplayUnavailable:
+            # The number may have been taken meanwhile; move to a fresh one
+            display.number = self._claim_number()
+            self._start(display)
+
+    @contextmanager
+    def acquire(self, timeout: float = 120.0):
+        """A running display for the duration of the block."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._free:
+                    display = self._free.pop()
+                    break
+                if self._created < self.size:
+                    self._created += 1
+                    display = VirtualDisplay(self._claim_number(), software_rendering=self.software_rendering)
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DisplayUnavailable(f"all {self.size} displays busy for {timeout:.0f}s")
+                self._cond.wait(remaining)
+            self._busy.add(display.number)
+
+        try:
+            if not display.alive():
+                if display.process is not None:
+                    print(f"  Xvfb {display.name} died — restarting")
+                    self._restart(display)
+                else:
+                    self._start(display)
+        except (DisplayUnavailable, OSError) as e:
+            self._release(display, keep=False)
+            raise DisplayUnavailable(str(e)) from e
+
+        try:
+            yield display
+        finally:
+            self._release(display, keep=True)
+
+    def _release(self, display: VirtualDisplay, keep: bool) -> None:
+        with self._cond:
+            self._busy.discard(display.number)
+            if self._closed:
+                self._stop(display)
+            elif keep:
+                self._free.append(display)
+            else:
+                self._created -= 1
+            self._cond.notify()
+
+    def mark_broken(self, display: VirtualDisplay) -> None:
+        """Restart a display a recording couldn't use (call while holding it)."""
+        print(f"  Xvfb {display.name} unusable — restarting")
+        self._restart(display)
+
+    def shutdown(self) -> None:
+        """Stop idle displays now; busy ones stop when they are released."""
+        with self._cond:
+            self._closed = True
+            for display in self._free:
+                self._stop(display)
+            self._free.clear()
+            self._created = len(self._busy)
+
+    def status(self) -> dict:
+        with self._cond:
+            return {"size": self.size, "free": [d.name for d in self._free], "busy": sorted(self._busy)}
+
+
+# ---------------------------------------------------------------------------
+# Process-wide pool
+# ---------------------------------------------------------------------------
+
+_pool: DisplayPool | None = None
+_settings: tuple | None = None
+
+
+def configure(config: dict) -> None:
+    """(Re)build the pool from `recording.virtual_display`; no pool when disabled or Xvfb is missing."""
+    global _pool, _settings
+    vd_cfg = config.get("recording", {}).get("virtual_display", {}) or {}
+    settings = None
+    if vd_cfg.get("enabled", False):
+        xvfb = shutil.which(vd_cfg.get("xvfb", "Xvfb")) or ""
+        settings = (
+            vd_cfg.get("displays", 2), vd_cfg.get("first", 99), vd_cfg.get("resolution", "1280x720x24"),
+            vd_cfg.get("software_rendering", True), xvfb,
+        )
+    if settings == _settings:
+        return
+    if _pool is not None:
+        _pool.shutdown()
+    _pool = None
+    _settings = settings
+    if settings and not settings[-1]:
+        print("  Xvfb not found — recordings use the current display")
+    elif settings:
+        _pool = DisplayPool(*settings)
+
+
+def pool() -> DisplayPool | None:
+    return _pool
+
+
+def looks_like_display_failure(output: str) -> bool:
+    lowered = output.lower()
+    return any(marker in lowered for marker in DISPLAY_FAILURES)
+
+
+def record(godot_exe: str, project_path: Path, output_path: Path, rendering_driver: str = "", **kwargs) -> RecordingResult:
+    """record_gameplay on a pooled display (or the current one without a pool).
+
+    A recording that fails because of the display is retried once on a
+    restarted display."""
+    if _pool is None:
+        return record_gameplay(godot_exe, project_path, output_path, **kwargs)
+    try:
+        with _pool.acquire() as display:
+            for attempt in range(2):
+                result = record_gameplay(
+                    godot_exe, project_path, output_path,
+                    env=display.env, rendering_driver=rendering_driver, **kwargs,
+                )
+                if result.success or not looks_like_display_failure(result.raw_output + result.error):
+                    return result
+                if attempt == 0:
+                    _pool.mark_broken(display)
+            return result
+    except DisplayUnavailable as e:
+        return RecordingResult(success=False, error=f"No virtual display: {e}")
+
+
+atexit.register(lambda: _pool.shutdown() if _pool is not None else None)
@@ -0,0 +1,323 @@
+"""Local stand-in for the Anthropic Messages API — for offline runs of the orchestrator.
+
+Point the orchestrator at it with `api.base_url: "http://127.0.0.1:8765"` in config.yaml.
+Supports messages, count_tokens and the Message Batches endpoints, reports
+cache reads and writes the way prefix caching would, and with `rate_limits`
+sends rate-limit headers and answers over-quota calls with 429; calls to a model
+in `overloaded` are answered with 529. Replies are
+scripted: the first rule whose substring appears in the last user message wins,
+otherwise the default reply (a string, or a callable given the request body) is returned.
+A callable may also return a list of content blocks (e.g. tool_use), which are sent as-is.
+
+    python fake_anthropic.py --port 8765 --script replies.json
+
+replies.json: {"default": "...", "rules": [["substring", "reply text"], ...]}
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = '{"pass": true, "reason": "stand-in", "coherent": true, "feedback": "stand-in"}'
+
+
+def _timestamp(t: float | None = None) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(t if t is not None else time.time()))
+
+
+def _text_of(content) -> str:
+    if isinstance(content, str):
+        return content
+    parts = []
+    for b in content:
+        if isinstance(b, dict):
+            inner = b.get("content", "")  # tool_result blocks
+            parts.append(b.get("text", "") + (inner if isinstance(inner, str) else _text_of(inner)))
+    return "".join(parts)
+
+
+class FakeAnthropic:
+    """Scripted replies plus in-memory batch state, served over HTTP."""
+
+    def __init__(
+        self,
+        default_reply: str | Callable[[dict], str] = DEFAULT_REPLY,
+        rules: list[tuple[str, str]] | None = None,
+        latency: float = 0.0,
+        batch_delay: float = 0.0,
+        rate_limits: dict[str, int] | None = None,
+        overloaded: set[str] | None = None,
+    ):
+        self.default_reply = default_reply
+        self.rules = list(rules or [])
+        self.latency = latency
+        self.batch_delay = batch_delay
+        # Per-minute quotas ("requests", "input-tokens", "output-tokens"), refilled continuously
+        self.rate_limits = dict(rate_limits or {})
+        self._buckets = {kind: [float(limit), time.time()] for kind, limit in self.rate_limits.items()}
+        self.overloaded = set(overloaded or ())
+        self.rejected = 0  # messages.create calls answered with 429 or 529
+        self.requests: list[dict] = []  # every messages.create body received
+        self.batches: dict[str, dict] = {}
+        self._cached_prefixes: set[str] = set()
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+
+    # -- replies -----------------------------------------------------------
+
+    def reply_for(self, body: dict) -> str | list[dict]:
+        messages = body.get("messages", [])
+        last = _text_of(messages[-1].get("content", "")) if messages else ""
+        for needle, reply in self.rules:
+            if needle in last:
+                return reply
+        if callable(self.default_reply):
+            return self.default_reply(body)
+        return self.default_reply
+
+    def cache_usage(self, body: dict) -> tuple[int, int, int]:
+        """(uncached, cache write, cache read) prompt characters, as prompt caching would split them.
+
+        Every cache_control breakpoint caches the prefix up to it (model, tools,
+        system, messages); a later request whose prefix matches a cached one reads it.
+        """
+        prefix = hashlib.sha256(json.dumps([body.get("model"), body.get("tools")], sort_keys=True).encode())
+        system = body.get("system", "")
+        blocks = [("system", b) for b in ([{"text": system}] if isinstance(system, str) else system)]
+        for m in body.get("messages", []):
+            content = m.get("content", "")
+            blocks.extend((m["role"], b) for b in ([{"text": content}] if isinstance(content, str) else content))
+        chars = 0
+        breakpoints = []
+        for role, block in blocks:
+            prefix.update(json.dumps([role, {k: v for k, v in block.items() if k != "cache_control"}], sort_keys=True).encode())
+            chars += len(_text_of([block]))
+            if "cache_control" in block:
+                breakpoints.append((prefix.hexdigest(), chars))
+        with self._lock:
+            read = max((n for key, n in breakpoints if key in self._cached_prefixes), default=0)
+            written = max((n for _, n in breakpoints), default=0)
+            self._cached_prefixes.update(key for key, _ in breakpoints)
+        written = max(0, written - read)
+        return chars - read - written, written, read
+
+    def message(self, body: dict) -> dict:
+        with self._lock:
+            self.requests.append(body)
+        reply = self.reply_for(body)
+        content = reply if isinstance(reply, list) else [{"type": "text", "text": reply}]
+        text = _text_of(content)
+        uncached, written, read = self.cache_usage(body)
+        return {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "stand-in"),
+            "content": content,
+            "stop_reason": "tool_use" if any(b.get("type") == "tool_use" for b in content) else "end_turn",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": uncached // 4,
+                "output_tokens": len(text) // 4,
+                "cache_creation_input_tokens": written // 4,
+                "cache_read_input_tokens": read // 4,
+            },
+        }
+
+    # -- rate limits -------------------------------------------------------
+
+    def admit(self, body: dict) -> tuple[dict[str, str], float]:
+        """Rate-limit headers for a messages.create call, and its retry-after (0 when admitted)."""
+        if not self.rate_limits:
+            return {}, 0.0
+        cost = {
+            "requests": 1,
+            "input-tokens": len(json.dumps([body.get("system", ""), body.get("messages", [])])) // 4,
+            "output-tokens": body.get("max_tokens", 0),
+        }
+        now = time.time()
+        with self._lock:
+            for kind, bucket in self._buckets.items():
+                limit = self.rate_limits[kind]
+                bucket[0] = min(limit, bucket[0] + (now - bucket[1]) * limit / 60)
+                bucket[1] = now
+            short = [
+                (cost[kind] - bucket[0]) * 60 / self.rate_limits[kind]
+                for kind, bucket in self._buckets.items() if bucket[0] < min(cost[kind], self.rate_limits[kind])
+            ]
+            if not short:
+                for kind, bucket in self._buckets.items():
+                    bucket[0] -= min(cost[kind], bucket[0])
+            else:
+                self.rejected += 1
+            headers = {}
+            for kind, (left, _) in self._buckets.items():
+                limit = self.rate_limits[kind]
+                headers[f"anthropic-ratelimit-{kind}-limit"] = str(limit)
+                headers[f"anthropic-ratelimit-{kind}-remaining"] = str(int(left))
+                headers[f"anthropic-ratelimit-{kind}-reset"] = _timestamp(now + (limit - left) * 60 / limit)
+        retry_after = max(1.0, float(int(max(short)) + 1)) if short else 0.0
+        return headers, retry_after
+
+    # -- batches -----------------------------------------------------------
+
+    def create_batch(self, body: dict) -> dict:
+        batch_id = f"msgbatch_{uuid.uuid4().hex[:24]}"
+        with self._lock:
+            self.batches[batch_id] = {
+                "created": time.time(),
+                "requests": body.get("requests", []),
+            }
+        return self.batch_status(batch_id)
+
+    def batch_status(self, batch_id: str) -> dict | None:
+        batch = self.batches.get(batch_id)
+        if batch is None:
+            return None
+        ended = time.time() - batch["created"] >= self.batch_delay
+        count = len(batch["requests"])
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else count,
+                "succeeded": count if ended else 0,
+                "errored": 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": _timestamp(batch["created"]),
+            "expires_at": _timestamp(batch["created"] + 86400),
+            "ended_at": _timestamp() if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{self.base_url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def batch_results(self, batch_id: str) -> str:
+        lines = []
+        for req in self.batches[batch_id]["requests"]:
+            lines.append(json.dumps({
+                "custom_id": req["custom_id"],
+                "result": {"type": "succeeded", "message": self.message(req["params"])},
+            }))
+        return "\n".join(lines) + "\n"
+
+    # -- server ------------------------------------------------------------
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve in a background thread. Returns the base URL."""
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _make_handler(fake: FakeAnthropic):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):  # Keep orchestrator output readable
+            pass
+
+        def _send(self, status: int, payload, content_type: str = "application/json", headers: dict | None = None) -> None:
+            data = payload if isinstance(payload, bytes) else (
+                payload.encode("utf-8") if isinstance(payload, str) else json.dumps(payload).encode("utf-8")
+            )
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _not_found(self) -> None:
+            self._send(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            path = self.path.split("?")[0]
+            if fake.latency:
+                time.sleep(fake.latency)
+            if path == "/v1/messages":
+                headers, retry_after = fake.admit(body)
+                if body.get("model") in fake.overloaded:
+                    with fake._lock:
+                        fake.rejected += 1
+                    self._send(529, {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}})
+                elif retry_after:
+                    headers["retry-after"] = str(int(retry_after))
+                    self._send(429, {"type": "error", "error": {"type": "rate_limit_error", "message": "rate limited"}},
+                               headers=headers)
+                else:
+                    self._send(200, fake.message(body), headers=headers)
+            elif path == "/v1/messages/count_tokens":
+                chars = len(_text_of(body.get("system", ""))) + sum(
+                    len(_text_of(m.get("content", ""))) for m in body.get("messages", [])
+                )
+                self._send(200, {"input_tokens": chars // 4})
+            elif path == "/v1/messages/batches":
+                self._send(200, fake.create_batch(body))
+            else:
+                self._not_found()
+
+        def do_GET(self):
+            parts = self.path.split("?")[0].strip("/").split("/")
+            # v1/messages/batches/{id}[/results]
+            if len(parts) >= 4 and parts[:3] == ["v1", "messages", "batches"]:
+                status = fake.batch_status(parts[3])
+                if status is None:
+                    self._not_found()
+                elif len(parts) == 5 and parts[4] == "results":
+                    self._send(200, fake.batch_results(parts[3]), "application/x-jsonl")
+                else:
+                    self._send(200, status)
+            else:
+                self._not_found()
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--script", help="JSON file with scripted replies")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every POST")
+    parser.add_argument("--batch-delay", type=float, default=0.0, help="Seconds before a batch ends")
+    args = parser.parse_args()
+
+    default_reply, rules = DEFAULT_REPLY, []
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            script = json.load(f)
+        default_reply = script.get("default", default_reply)
+        rules = [tuple(r) for r in script.get("rules", [])]
+
+    fake = FakeAnthropic(default_reply, rules, latency=args.latency, batch_delay=args.batch_delay)
+    url = fake.start(args.host, args.port)
+    print(f"Fake Anthropic API listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
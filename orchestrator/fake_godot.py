@@ -0,0 +1,147 @@
+"""Scriptable stand-in for the Godot executable — for offline benchmarks of the cycle loop.
+
+Understands the command lines godot_runner builds (--path, --headless,
+--quit-after, --script, --write-movie). Behaviour comes from a JSON file named
+by the FAKE_GODOT_SCRIPT environment variable:
+
+    {"delay": 0.2, "per_file_delay": 0.001, "exit_code": 0, "output": "extra stdout"}
+
+Any .gd file under the project containing the marker `FAKE_GODOT_ERROR` is
+reported as a Godot parse error, so failures can be scripted through content.
+A scene whose file or scripts contain `FAKE_GODOT_RUNTIME_ERROR` loads fine but
+reports a null-instance script error while the scene runner plays it.
+The resource validator and scene runner scripts get one result line per resource
+on stderr, interleaved with the engine errors as real Godot prints them;
+the performance benchmark gets synthetic samples from the script's "perf" entry.
+An --autopilot-log user argument gets a short synthetic input track derived
+from --autopilot-seed, the way _autopilot.gd writes one.
+"""
+
+import json
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ERROR_MARKER = "FAKE_GODOT_ERROR"
+RUNTIME_ERROR_MARKER = "FAKE_GODOT_RUNTIME_ERROR"
+_SCRIPT_PATH_RE = re.compile(r'path="(res://[^"]+\.gd)"')
+
+
+def _arg(args: list[str], flag: str, default: str = "") -> str:
+    if flag in args:
+        i = args.index(flag)
+        if i + 1 < len(args):
+            return args[i + 1]
+    return default
+
+
+def main() -> int:
+    args = sys.argv[1:]
+    script_path = os.environ.get("FAKE_GODOT_SCRIPT", "")
+    behaviour = {}
+    if script_path and Path(script_path).exists():
+        behaviour = json.loads(Path(script_path).read_text(encoding="utf-8"))
+
+    project = Path(_arg(args, "--path", "."))
+    scripts = sorted(project.rglob("*.gd"))
+
+    # Simulate load time: fixed startup plus a cost per script parsed
+    time.sleep(behaviour.get("delay", 0.0) + behaviour.get("per_file_delay", 0.0) * len(scripts))
+
+    print("Godot Engine v4.6.stable.official - https://godotengine.org")
+    if behaviour.get("output"):
+        print(behaviour["output"])
+
+    for script in scripts:
+        try:
+            lines = script.read_text(encoding="utf-8").splitlines()
+        except Exception:
+            continue
+        for i, line in enumerate(lines, 1):
+            if ERROR_MARKER in line:
+                rel = script.relative_to(project).as_posix()
+                print(f"SCRIPT ERROR: Parse Error: Unexpected {ERROR_MARKER}", file=sys.stderr)
+                print(f"   at: GDScript::reload (res://{rel}:{i})", file=sys.stderr)
+
+    if _arg(args, "--script").endswith("_smoke_test.gd"):
+        print("SMOKE_RESULT: OK")
+
+    if _arg(args, "--script").endswith("_perf_bench.gd") and "--" in args:
+        # {"perf": {"frame_ms": 2.0, "nodes": 150, "memory_mb": 40, "jitter": 0.1}}
+        perf = behaviour.get("perf", {})
+        user = args[args.index("--") + 1:]
+        frames = int(user[1]) if len(user) > 1 else 600
+        rng = random.Random(0)
+        base, jitter = perf.get("frame_ms", 2.0), perf.get("jitter", 0.1)
+        nodes = perf.get("nodes", 150)
+        memory = int(perf.get("memory_mb", 40) * 1e6)
+        print("PERF_RESULT: " + json.dumps({
+            "scene": user[0] if user else "", "success": True, "error": "",
+            "frame_ms": [base * (1 + rng.uniform(-jitter, jitter)) for _ in range(frames)],
+            "process_ms": [base * 0.6 for _ in range(frames)],
+            "physics_ms": [base * 0.3 for _ in range(frames)],
+            "nodes": nodes, "max_nodes": nodes, "objects": nodes * 3, "max_objects": nodes * 3,
+            "orphan_nodes": perf.get("orphan_nodes", 0),
+            "memory_bytes": memory, "max_memory_bytes": memory,
+        }))
+
+    if _arg(args, "--script").endswith("_run_scenes.gd") and "--" in args:
+        for res in args[args.index("--") + 2:]:
+            print(f"SCENE_BEGIN: {res}", file=sys.stderr)
+            path = project / res.removeprefix("res://")
+            if path.exists():
+                text = path.read_text(encoding="utf-8")
+                sources = [(res, text)] + [
+                    (ref, (project / ref.removeprefix("res://")).read_text(encoding="utf-8"))
+                    for ref in _SCRIPT_PATH_RE.findall(text) if (project / ref.removeprefix("res://")).exists()
+                ]
+                for source, content in sources:
+                    if RUNTIME_ERROR_MARKER in content:
+                        line = content[: content.index(RUNTIME_ERROR_MARKER)].count("\n") + 1
+                        print("SCRIPT ERROR: Invalid access to property or key 'position' on a base object "
+                              "of type 'null instance'.", file=sys.stderr)
+                        print(f"   at: _process ({source}:{line})", file=sys.stderr)
+            print("SCENE_RESULT: " + json.dumps({
+                "path": res, "ok": path.exists(), "kind": "scene", "error": "" if path.exists() else "load failed",
+            }), file=sys.stderr)
+
+    if _arg(args, "--script").endswith("_validate_resources.gd") and "--" in args:
+        for res in args[args.index("--") + 1:]:
+            print(f"RESOURCE_BEGIN: {res}", file=sys.stderr)
+            path = project / res.removeprefix("res://")
+            text = path.read_text(encoding="utf-8") if path.exists() else ""
+            broken = ERROR_MARKER in text
+            if broken:
+                line = text[: text.index(ERROR_MARKER)].count("\n") + 1
+                print(f"SCRIPT ERROR: Parse Error: Unexpected {ERROR_MARKER}", file=sys.stderr)
+                print(f"   at: GDScript::reload ({res}:{line})", file=sys.stderr)
+            kind = "scene" if res.endswith(".tscn") else "script"
+            print("RESOURCE_RESULT: " + json.dumps({
+                "path": res, "ok": path.exists() and not broken, "kind": kind,
+                "error": "" if path.exists() and not broken else "load failed",
+            }), file=sys.stderr)
+
+    user_args = args[args.index("--") + 1:] if "--" in args else []
+    options = dict(a.split("=", 1) for a in user_args if a.startswith("--autopilot-") and "=" in a)
+    if "--autopilot-log" in options:
+        seed = int(options["--autopilot-seed"]) if "--autopilot-seed" in options else None
+        rng = random.Random(seed)
+        actions = ["move_left", "move_right", "move_up", "move_down", "attack"]
+        with open(options["--autopilot-log"], "w", encoding="utf-8") as f:
+            f.write(json.dumps({"seed": seed, "physics_fps": 60}) + "\n")
+            for frame in range(3, 300, 30):
+                f.write(json.dumps({"f": frame, "a": sorted(rng.sample(actions, 2))}) + "\n")
+
+    movie = _arg(args, "--write-movie")
+    if movie:
+        # Not a playable file — just enough bytes for record_gameplay to accept it
+        Path(movie).write_bytes(b"RIFF\0\0\0\0AVI LIST" + b"\0" * 1024)
+
+    return int(behaviour.get("exit_code", 0))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""Static hot-path linter for GDScript — per-frame anti-patterns in the game's scripts.
+
+A function is hot when it is `_process`, `_physics_process`, `_integrate_forces`
+or `_draw`, or is called (transitively, within the same script) from one. Inside
+hot functions the linter flags tree and group lookups, node creation and freeing,
+runtime resource loads and untyped variables, each weighted by how much it
+usually costs per frame.
+
+    python gdscript_lint.py                # ranked report for game/scripts
+    python gdscript_lint.py --limit 50 --rule allocation
+"""
+
+import argparse
+import re
+import subprocess
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+from codebase_summarizer import classify_file_domain
+from godot_runner import GodotError
+
+HOT_ROOTS = ("_process", "_physics_process", "_integrate_forces", "_draw")
+
+# Rules whose findings count as per-frame allocations for the rejection check
+ALLOCATION_RULES = {"allocation", "resource_load"}
+
+# rule -> (weight, pattern, message, suggestion). Patterns run on code with
+# string literals blanked and comments removed.
+RULES: dict[str, tuple[int, re.Pattern, str, str]] = {
+    "group_lookup": (
+        3,
+        re.compile(r"\bget_tree\(\)\s*\.\s*(?:get_nodes_in_group|get_first_node_in_group|call_group|get_node_count_in_group)\b"),
+        "group lookup every frame",
+        "Look the node(s) up once in _ready (or on the group's node_added signal) and keep a reference.",
+    ),
+    "tree_access": (
+        1,
+        re.compile(r"\bget_tree\(\)(?!\s*\.\s*(?:get_nodes_in_group|get_first_node_in_group|call_group|get_node_count_in_group)\b)"),
+        "get_tree() every frame",
+        "Cache what you need from the SceneTree in _ready.",
+    ),
+    "node_lookup": (
+        2,
+        re.compile(r"\b(?:get_node|get_node_or_null|find_child|find_children|get_parent\(\)\s*\.\s*get_node)\s*\(|\$[A-Za-z_\"%]"),
+        "node path lookup every frame",
+        "Use an @onready var for the node instead of looking it up per frame.",
+    ),
+    "allocation": (
+        3,
+        re.compile(r"\b[A-Z]\w*\.new\(|\.instantiate\(|\.duplicate\("),
+        "allocates every frame",
+        "Create objects once (or pool them) and update them in place.",
+    ),
+    "node_free": (
+        3,
+        re.compile(r"\.queue_free\(\)|\.free\(\)|^\s*queue_free\(\)"),
+        "frees nodes every frame",
+        "Reuse nodes (hide/show, update properties) instead of freeing and recreating them.",
+    ),
+    "resource_load": (
+        3,
+        re.compile(r"(?<![\w.])load\("),
+        "loads a resource every frame",
+        "preload() the resource into a const, or load it once in _ready.",
+    ),
+    "untyped_var": (
+        1,
+        re.compile(r"^\s*var\s+\w+\s*=(?!=)"),
+        "untyped variable in a hot function",
+        "Declare a type (var x: float = ...) or use := so GDScript can use typed instructions.",
+    ),
+}
+
+_FUNC_RE = re.compile(r"^(\s*)(?:static\s+)?func\s+(\w+)\s*\(")
+_CALL_RE = re.compile(r"(?<![\w.])(?:self\s*\.\s*)?(\w+)\s*\(")
+_CONDITIONAL_RE = re.compile(r"^\s*(?:if|elif|else|match)\b")
+_STRING_RE = re.compile(r'"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'')
+
+
+@dataclass
+class Finding:
+    rule: str
+    file: str          # Relative to the game directory
+    line: int
+    function: str
+    via: str           # Call chain from the hot root, e.g. "_process > _update_display"
+    code: str
+    weight: int
+
+    @property
+    def message(self) -> str:
+        return RULES[self.rule][2]
+
+    @property
+    def suggestion(self) -> str:
+        return RULES[self.rule][3]
+
+    def __str__(self) -> str:
+        return f"{self.file}:{self.line} {self.function}() [{self.rule}] {self.message} — `{self.code}`"
+
+    def to_error(self) -> GodotError:
+        return GodotError(
+            "performance", self.file, self.line,
+            f"{self.function}() {self.message} (hot via {self.via}): {self.code}",
+            self.suggestion,
+        )
+
+
+def _strip(line: str) -> str:
+    """Code part of a line: string literals blanked, comment removed."""
+    code = _STRING_RE.sub('""', line)
+    return code.split("#", 1)[0].rstrip()
+
+
+def _functions(lines: list[str]) -> dict[str, tuple[int, int]]:
+    """Function name -> (first body line index, end index) in `lines`."""
+    funcs = {}
+    starts = []
+    for i, line in enumerate(lines):
+        m = _FUNC_RE.match(line)
+        if m:
+            starts.append((i, len(m.group(1).expandtabs(4)), m.group(2)))
+    for i, indent, name in starts:
+        end = i + 1
+        while end < len(lines):
+            text = lines[end].expandtabs(4)
+            if text.strip() and not text.lstrip().startswith("#") and len(text) - len(text.lstrip()) <= indent:
+                break
+            end += 1
+        funcs.setdefault(name, (i + 1, end))
+    return funcs
+
+
+def _unconditional(lines: list[str], start: int, end: int) -> list[str]:
+    """Code lines of a function body that aren't inside an if/elif/else/match block."""
+    kept = []
+    blocks: list[tuple[int, bool]] = []  # (indent, conditional) of enclosing blocks
+    for line in lines[start:end]:
+        code = _strip(line).expandtabs(4)
+        if not code.strip():
+            continue
+        indent = len(code) - len(code.lstrip())
+        while blocks and blocks[-1][0] >= indent:
+            blocks.pop()
+        if not any(conditional for _, conditional in blocks):
+            kept.append(code)
+        if code.endswith(":"):
+            blocks.append((indent, bool(_CONDITIONAL_RE.match(code))))
+    return kept
+
+
+def _hot_functions(lines: list[str], funcs: dict[str, tuple[int, int]]) -> dict[str, str]:
+    """Hot function name -> call chain from its hot root.
+
+    Only unconditional calls spread hotness: a helper called on death or on a
+    timeout inside `_process` doesn't run every frame.
+    """
+    hot = {name: name for name in HOT_ROOTS if name in funcs}
+    queue = list(hot)
+    while queue:
+        name = queue.pop(0)
+        for line in _unconditional(lines, *funcs[name]):
+            for callee in _CALL_RE.findall(line):
+                if callee in funcs and callee not in hot:
+                    hot[callee] = f"{hot[name]} > {callee}"
+                    queue.append(callee)
+    return hot
+
+
+def lint_source(source: str, rel: str) -> list[Finding]:
+    lines = source.splitlines()
+    funcs = _functions(lines)
+    findings = []
+    for name, via in _hot_functions(lines, funcs).items():
+        start, end = funcs[name]
+        for i in range(start, end):
+            code = _strip(lines[i])
+            if not code.strip():
+                continue
+            for rule, (weight, pattern, _, _) in RULES.items():
+                if pattern.search(code):
+                    findings.append(Finding(rule, rel, i + 1, name, via, lines[i].strip()[:120], weight))
+    return findings
+
+
+def lint_file(path: Path, game_path: Path) -> list[Finding]:
+    try:
+        source = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return []
+    return lint_source(source, path.resolve().relative_to(game_path.resolve()).as_posix())
+
+
+def lint_project(game_path: Path) -> list[Finding]:
+    """Findings for every project script, ranked."""
+    findings = []
+    for path in sorted(game_path.rglob("*.gd")):
+        if ".godot" in path.parts or path.name.startswith("_"):
+            continue  # Orchestrator helper scripts are not part of the game
+        findings.extend(lint_file(path, game_path))
+    return rank(findings)
+
+
+def rank(findings: list[Finding]) -> list[Finding]:
+    """Heaviest first; within a weight, files with the most hot-path weight first."""
+    per_file = Counter()
+    for f in findings:
+        per_file[f.file] += f.weight
+    return sorted(findings, key=lambda f: (-f.weight, -per_file[f.file], f.file, f.line))
+
+
+# ---------------------------------------------------------------------------
+# Reports
+# ---------------------------------------------------------------------------
+
+def report(findings: list[Finding], limit: int = 30) -> str:
+    if not findings:
+        return "No hot-path findings."
+    by_rule = Counter(f.rule for f in findings)
+    per_file = Counter()
+    for f in findings:
+        per_file[f.file] += f.weight
+    lines = [
+        f"{len(findings)} hot-path findings in {len(per_file)} scripts",
+        "  " + ", ".join(f"{rule} {n}" for rule, n in by_rule.most_common()),
+        "",
+        "Heaviest scripts:",
+        *(f"  {weight:4d}  {file}" for file, weight in per_file.most_common(10)),
+        "",
+        "Findings:",
+        *(f"  {f}" for f in findings[:limit]),
+    ]
+    if len(findings) > limit:
+        lines.append(f"  ... and {len(findings) - limit} more")
+    return "\n".join(lines)
+
+
+def prompt_section(findings: list[Finding], focus_domains: list[str], limit: int = 8) -> str:
+    """Findings worth showing the model: scripts in the focus domains first, then the heaviest."""
+    if not findings or limit <= 0:
+        return ""
+    focused = [f for f in findings if classify_file_domain(f.file) in focus_domains]
+    chosen = focused[:limit]
+    chosen += [f for f in findings if f not in chosen][:limit - len(chosen)]
+    lines = [
+        "## Hot-path performance findings (static lint of per-frame code)",
+        "These run every frame. Don't add more of them; fix them when you touch the function.",
+    ]
+    for f in chosen:
+        lines.append(f"- {f.file}:{f.line} `{f.function}()` (via {f.via}): {f.message} — {f.suggestion}")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Change checks
+# ---------------------------------------------------------------------------
+
+def _committed_source(game_path: Path, rel: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", "show", f"HEAD:./{rel}"], cwd=game_path, capture_output=True, text=True, check=True,
+        ).stdout
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return ""  # New file, or not a git checkout
+
+
+def new_allocations(written: list[str], game_path: Path) -> list[GodotError]:
+    """Per-frame allocations the written scripts add over their committed versions."""
+    errors = []
+    game_root = game_path.resolve()
+    for filepath in written:
+        path = Path(filepath).resolve()
+        if path.suffix != ".gd" or not path.is_relative_to(game_root):
+            continue
+        rel = path.relative_to(game_root).as_posix()
+        before = Counter(
+            (f.rule, f.function, f.code)
+            for f in lint_source(_committed_source(game_path, rel), rel) if f.rule in ALLOCATION_RULES
+        )
+        for f in lint_file(path, game_path):
+            if f.rule not in ALLOCATION_RULES:
+                continue
+            key = (f.rule, f.function, f.code)
+            if before[key]:
+                before[key] -= 1  # Already there before this change
+            else:
+                errors.append(f.to_error())
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank per-frame anti-patterns in GDScript")
+    parser.add_argument("--game", default=str(Path(__file__).resolve().parent.parent / "game"))
+    parser.add_argument("--limit", type=int, default=30, help="Findings to list")
+    parser.add_argument("--rule", choices=sorted(RULES), help="Only this rule")
+    args = parser.parse_args()
+
+    findings = lint_project(Path(args.game))
+    if args.rule:
+        findings = [f for f in findings if f.rule == args.rule]
+    print(report(findings, args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,20 @@
 """Run Godot headless to test the project, with structured error parsing and video recording."""
 
+import contextvars
+import json
+import os
 import re
 import shutil
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 
+import cassette
+import clip_editor
+import telemetry
+
 
 # ---------------------------------------------------------------------------
 # Data classes
@@ -179,6 +188,19 @@ def parse_godot_errors(output: str) -> list[GodotError]:
     return errors
 
 
+# ---------------------------------------------------------------------------
+# Launching Godot
+# ---------------------------------------------------------------------------
+
+def _run_godot(cmd: list[str], timeout: float, kind: str, env: dict | None = None):
+    """Run a Godot process (recorded/replayed by the cassette layer) inside a span."""
+    telemetry.count("godmachine_godot_launches_total", kind=kind)
+    with telemetry.span("godot_process", kind=kind, timeout=timeout) as attrs:
+        result = cassette.run(cmd, timeout=timeout, env=env)
+        attrs["returncode"] = result.returncode
+        return result
+
+
 # ---------------------------------------------------------------------------
 # Pre-validation (before launching Godot)
 # ---------------------------------------------------------------------------
@@ -305,6 +327,7 @@ def _find_game_root(path: Path) -> Path | None:
 # Smoke testing (Phase 2)
 # ---------------------------------------------------------------------------
 
+@telemetry.traced("smoke_test")
 def run_smoke_test(godot_exe: str, project_path: Path, timeout: int = 15) -> "TestResult":
     """Write a temp smoke-test script, run it headless, parse results."""
     smoke_script = project_path / "scripts" / "_smoke_test.gd"
@@ -352,7 +375,7 @@ func _init():
             "--headless",
             "--script", "res://scripts/_smoke_test.gd",
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        result = _run_godot(cmd, timeout, "smoke_test")
         output = result.stdout + result.stderr
 
         success = "SMOKE_RESULT: OK" in output
@@ -375,10 +398,541 @@ func _init():
             smoke_script.unlink()
 
 
+# ---------------------------------------------------------------------------
+# Batch resource validation
+# ---------------------------------------------------------------------------
+
+_VALIDATOR_SCRIPT = '''\
+extends SceneTree
+
+# Loads each resource given after `--`, instantiates scenes off-tree, and prints
+# one RESOURCE_RESULT JSON line per resource. Markers go to stderr with the engine
+# errors, so the errors for a resource land between its RESOURCE_BEGIN and result.
+func _init():
+\tfor path in OS.get_cmdline_user_args():
+\t\tprinterr("RESOURCE_BEGIN: " + path)
+\t\tvar result := {"path": path, "ok": true, "kind": "", "error": ""}
+\t\tvar res = ResourceLoader.load(path, "", ResourceLoader.CACHE_MODE_IGNORE)
+\t\tif res == null:
+\t\t\tresult["ok"] = false
+\t\t\tresult["error"] = "load failed"
+\t\telif res is PackedScene:
+\t\t\tresult["kind"] = "scene"
+\t\t\tif not res.can_instantiate():
+\t\t\t\tresult["ok"] = false
+\t\t\t\tresult["error"] = "scene cannot be instantiated"
+\t\t\telse:
+\t\t\t\tvar node = res.instantiate()
+\t\t\t\tif node == null:
+\t\t\t\t\tresult["ok"] = false
+\t\t\t\t\tresult["error"] = "instantiate returned null"
+\t\t\t\telse:
+\t\t\t\t\tnode.free()
+\t\telif res is Script:
+\t\t\tresult["kind"] = "script"
+\t\t\tif not res.can_instantiate():
+\t\t\t\tresult["ok"] = false
+\t\t\t\tresult["error"] = "script has errors"
+\t\telse:
+\t\t\tresult["kind"] = res.get_class()
+\t\tprinterr("RESOURCE_RESULT: " + JSON.stringify(result))
+\tquit()
+'''
+
+_RESOURCE_BEGIN = "RESOURCE_BEGIN: "
+_RESOURCE_RESULT = "RESOURCE_RESULT: "
+
+
+@dataclass
+class ResourceCheck:
+    path: str            # res:// path
+    ok: bool
+    kind: str = ""       # scene, script, ...
+    error: str = ""
+    output: str = ""     # Engine output printed while this resource loaded
+
+
+def _parse_resource_results(
+    output: str, begin: str = _RESOURCE_BEGIN, marker: str = _RESOURCE_RESULT,
+) -> list[ResourceCheck]:
+    checks = []
+    chunk: list[str] = []
+    for line in output.splitlines():
+        if line.startswith(begin):
+            chunk = []
+        elif line.startswith(marker):
+            try:
+                data = json.loads(line.removeprefix(marker))
+            except json.JSONDecodeError:
+                continue
+            checks.append(ResourceCheck(
+                path=data.get("path", ""), ok=bool(data.get("ok")),
+                kind=data.get("kind", ""), error=data.get("error", ""),
+                output="\n".join(chunk),
+            ))
+            chunk = []
+        else:
+            chunk.append(line)
+    return checks
+
+
+@telemetry.traced("resource_validate")
+def validate_resources(
+    godot_exe: str,
+    project_path: Path,
+    resources: list[str],
+    timeout: int = 30,
+    baseline_errors: set[tuple[str, int, str]] | None = None,
+) -> tuple[TestResult, list[ResourceCheck]]:
+    """Load every resource in one headless Godot run; instantiate scenes off-tree.
+
+    Results come from the validator's per-resource JSON lines; engine errors printed
+    while a resource loaded are attached to it. Resources that never report back
+    (crash, timeout) count as failures.
+    """
+    if not resources:
+        return TestResult(success=True, raw_output=""), []
+
+    validator = project_path / "scripts" / "_validate_resources.gd"
+    results = ""
+    try:
+        validator.parent.mkdir(parents=True, exist_ok=True)
+        validator.write_text(_VALIDATOR_SCRIPT, encoding="utf-8")
+        cmd = [
+            godot_exe,
+            "--path", str(project_path),
+            "--headless",
+            "--script", "res://scripts/_validate_resources.gd",
+            "--", *resources,
+        ]
+        result = _run_godot(cmd, timeout, "resource_validate")
+        output = result.stdout + result.stderr
+        # Markers and engine errors share stderr, in the order they were printed
+        results = result.stderr
+    except subprocess.TimeoutExpired:
+        output = f"Resource validation timed out after {timeout}s"
+    except FileNotFoundError:
+        return TestResult(success=False, raw_output=f"Godot executable not found: {godot_exe}"), []
+    finally:
+        if validator.exists():
+            validator.unlink()
+
+    checks = _parse_resource_results(results)
+    reported = {c.path for c in checks}
+    checks.extend(
+        ResourceCheck(path=r, ok=False, error="no result (validator crashed or timed out)")
+        for r in resources if r not in reported
+    )
+    errors = _check_errors(
+        checks, baseline_errors, "resource_check",
+        "Fix the errors above; the scene or script must load and instantiate on its own.",
+    )
+    return TestResult(success=not errors, raw_output=output, errors=errors), checks
+
+
+def _check_errors(
+    checks: list[ResourceCheck],
+    baseline_errors: set[tuple[str, int, str]] | None,
+    category: str,
+    suggestion: str,
+    fail_on_engine_errors: bool = False,
+) -> list[GodotError]:
+    """GodotErrors for failed checks: attributed engine errors (minus baseline) plus one summary each."""
+    errors = []
+    for check in checks:
+        all_engine_errors = parse_godot_errors(check.output)
+        engine_errors = [
+            e for e in all_engine_errors
+            if not baseline_errors or (e.file, e.line, e.message) not in baseline_errors
+        ]
+        if check.ok:
+            if not (fail_on_engine_errors and engine_errors):
+                continue
+        elif all_engine_errors and not engine_errors:
+            continue  # Only pre-existing errors — not this change's fault
+        errors.extend(engine_errors)
+        errors.append(GodotError(
+            category, check.path.removeprefix("res://"), 0,
+            f"{check.kind or 'resource'} {check.error or 'reported errors'}", suggestion,
+        ))
+    return errors
+
+
+# ---------------------------------------------------------------------------
+# Sharded scene testing
+# ---------------------------------------------------------------------------
+
+_SCENE_RUNNER_SCRIPT = '''\
+extends SceneTree
+
+# Runs each scene given after `--` (first argument: frames per scene) in turn:
+# add it to the tree, process the frames, free it. One SCENE_RESULT JSON line
+# per scene; markers go to stderr, so engine errors for a scene print between
+# its SCENE_BEGIN and result.
+var _scenes := PackedStringArray()
+var _frames_per_scene := 2
+var _index := -1
+var _frames := 0
+var _node: Node = null
+
+func _init():
+\tvar args := OS.get_cmdline_user_args()
+\tif args.size() > 0:
+\t\t_frames_per_scene = int(args[0])
+\t\t_scenes = args.slice(1)
+
+func _result(path: String, ok: bool, error: String) -> void:
+\tprinterr("SCENE_RESULT: " + JSON.stringify({"path": path, "ok": ok, "kind": "scene", "error": error}))
+
+func _process(_delta):
+\tif _node != null:
+\t\t_frames += 1
+\t\tif _frames < _frames_per_scene:
+\t\t\treturn false
+\t\t_node.queue_free()
+\t\t_node = null
+\t\t_result(_scenes[_index], true, "")
+\t_index += 1
+\tif _index >= _scenes.size():
+\t\treturn true
+\tvar path: String = _scenes[_index]
+\tprinterr("SCENE_BEGIN: " + path)
+\tvar packed = load(path)
+\tif not (packed is PackedScene):
+\t\t_result(path, false, "load failed")
+\t\treturn false
+\t_node = packed.instantiate()
+\tif _node == null:
+\t\t_result(path, false, "instantiate returned null")
+\t\treturn false
+\troot.add_child(_node)
+\t_frames = 0
+\treturn false
+'''
+
+
+@dataclass
+class ShardResult:
+    index: int
+    scenes: list[str]
+    seconds: float
+    success: bool
+
+
+def plan_shards(project_path: Path, scenes: list[str], shards: int) -> list[list[str]]:
+    """Split scenes into `shards` groups, balanced by file size (largest first, to the lightest shard)."""
+    def weight(scene: str) -> int:
+        path = project_path / scene.removeprefix("res://")
+        return path.stat().st_size if path.exists() else 0
+
+    groups: list[list[str]] = [[] for _ in range(max(1, min(shards, len(scenes))))]
+    loads = [0] * len(groups)
+    for scene in sorted(scenes, key=weight, reverse=True):
+        i = loads.index(min(loads))
+        groups[i].append(scene)
+        loads[i] += weight(scene) + 1
+    return groups
+
+
+def _run_shard(
+    godot_exe: str, project_path: Path, index: int, scenes: list[str], frames: int, timeout: int,
+) -> tuple[ShardResult, list[ResourceCheck], str]:
+    start = time.monotonic()
+    cmd = [
+        godot_exe,
+        "--path", str(project_path),
+        "--headless",
+        "--script", "res://scripts/_run_scenes.gd",
+        "--", str(frames), *scenes,
+    ]
+    results = ""
+    try:
+        result = _run_godot(cmd, timeout, "scene_shard")
+        output = result.stdout + result.stderr
+        results = result.stderr  # Markers and runtime errors, interleaved
+    except subprocess.TimeoutExpired:
+        output = f"Shard {index} timed out after {timeout}s"
+    except FileNotFoundError:
+        output = f"Godot executable not found: {godot_exe}"
+
+    checks = _parse_resource_results(results, "SCENE_BEGIN: ", "SCENE_RESULT: ")
+    reported = {c.path for c in checks}
+    checks.extend(
+        ResourceCheck(path=s, ok=False, kind="scene", error="no result (shard crashed or timed out)")
+        for s in scenes if s not in reported
+    )
+    shard = ShardResult(index, scenes, time.monotonic() - start, all(c.ok for c in checks))
+    return shard, checks, output
+
+
+@telemetry.traced("scene_shards")
+def test_scenes_sharded(
+    godot_exe: str,
+    project_path: Path,
+    scenes: list[str],
+    shards: int = 0,
+    frames: int = 5,
+    timeout: int = 30,
+    baseline_errors: set[tuple[str, int, str]] | None = None,
+    cassette_shards: int = 4,
+) -> tuple[TestResult, list[ShardResult]]:
+    """Run scenes in parallel shards of headless Godot processes and merge the results.
+
+    `shards` = 0 sizes the pool to the host's cores, or to `cassette_shards` while a
+    cassette records or replays: each shard's command line is part of its tape key, so
+    the layout must not depend on the machine. A scene fails when it can't be loaded or
+    instantiated, or when new (non-baseline) engine errors appear while it runs.
+    """
+    if not scenes:
+        return TestResult(success=True, raw_output=""), []
+    if not shards:
+        shards = cassette_shards if cassette.recording() or cassette.replaying() else os.cpu_count() or 1
+    groups = plan_shards(project_path, scenes, shards)
+
+    runner = project_path / "scripts" / "_run_scenes.gd"
+    try:
+        runner.parent.mkdir(parents=True, exist_ok=True)
+        runner.write_text(_SCENE_RUNNER_SCRIPT, encoding="utf-8")
+        with ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix="shard") as pool:
+            futures = [
+                pool.submit(
+                    contextvars.copy_context().run, _run_shard,
+                    godot_exe, project_path, i, group, frames, timeout,
+                )
+                for i, group in enumerate(groups)
+            ]
+            runs = [f.result() for f in futures]
+    finally:
+        if runner.exists():
+            runner.unlink()
+
+    checks = [c for _, shard_checks, _ in runs for c in shard_checks]
+    errors = _check_errors(
+        checks, baseline_errors, "scene_test",
+        "This scene breaks when run on its own — check its script's _ready/_process and node paths.",
+        fail_on_engine_errors=True,
+    )
+    raw_output = "\n".join(f"--- shard {shard.index} ({shard.seconds:.1f}s) ---\n{output}" for shard, _, output in runs)
+    return TestResult(success=not errors, raw_output=raw_output, errors=errors), [shard for shard, _, _ in runs]
+
+
+# ---------------------------------------------------------------------------
+# Performance benchmark
+# ---------------------------------------------------------------------------
+
+_PERF_BENCH_SCRIPT = '''\
+extends SceneTree
+
+# Runs one scene for a warm-up plus N frames (use with --fixed-fps for a fixed
+# timestep) and prints a PERF_RESULT JSON line: per-frame wall, process and
+# physics times, peak node/object counts and static memory from Performance.
+# User args: scene frames warmup [--autopilot]
+var _scene := ""
+var _frames := 600
+var _warmup := 60
+var _frame := 0
+var _last_usec := 0
+var _frame_ms: Array[float] = []
+var _process_ms: Array[float] = []
+var _physics_ms: Array[float] = []
+var _max_nodes := 0
+var _max_objects := 0
+var _max_memory := 0
+
+func _init():
+\tvar args := OS.get_cmdline_user_args()
+\tif args.size() < 3:
+\t\t_finish(false, "usage: scene frames warmup")
+\t\treturn
+\t_scene = args[0]
+\t_frames = int(args[1])
+\t_warmup = int(args[2])
+\tvar packed = load(_scene)
+\tif not (packed is PackedScene):
+\t\t_finish(false, "cannot load " + _scene)
+\t\treturn
+\tchange_scene_to_packed(packed)
+\t_last_usec = Time.get_ticks_usec()
+
+func _process(_delta):
+\tvar now := Time.get_ticks_usec()
+\tvar elapsed := (now - _last_usec) / 1000.0
+\t_last_usec = now
+\t_frame += 1
+\tif _frame > _warmup:
+\t\t_frame_ms.append(elapsed)
+\t\t_process_ms.append(Performance.get_monitor(Performance.TIME_PROCESS) * 1000.0)
+\t\t_physics_ms.append(Performance.get_monitor(Performance.TIME_PHYSICS_PROCESS) * 1000.0)
+\t\t_max_nodes = max(_max_nodes, int(Performance.get_monitor(Performance.OBJECT_NODE_COUNT)))
+\t\t_max_objects = max(_max_objects, int(Performance.get_monitor(Performance.OBJECT_COUNT)))
+\t\t_max_memory = max(_max_memory, int(Performance.get_monitor(Performance.MEMORY_STATIC)))
+\tif _frame >= _warmup + _frames:
+\t\t_finish(true, "")
+\t\treturn true
+\treturn false
+
+func _finish(ok: bool, error: String) -> void:
+\tprint("PERF_RESULT: " + JSON.stringify({
+\t\t"scene": _scene, "success": ok, "error": error,
+\t\t"frame_ms": _frame_ms, "process_ms": _process_ms, "physics_ms": _physics_ms,
+\t\t"nodes": int(Performance.get_monitor(Performance.OBJECT_NODE_COUNT)),
+\t\t"max_nodes": _max_nodes,
+\t\t"objects": int(Performance.get_monitor(Performance.OBJECT_COUNT)),
+\t\t"max_objects": _max_objects,
+\t\t"orphan_nodes": int(Performance.get_monitor(Performance.OBJECT_ORPHAN_NODE_COUNT)),
+\t\t"memory_bytes": int(Performance.get_monitor(Performance.MEMORY_STATIC)),
+\t\t"max_memory_bytes": _max_memory,
+\t}))
+\tif not ok:
+\t\tquit(1)
+'''
+
+_PERF_RESULT = "PERF_RESULT: "
+
+
+def autopilot_args(seed: int | None = None, input_track: str = "", input_log: str = "") -> list[str]:
+    """User arguments for _autopilot.gd: RNG seed, a track to replay, where to log inputs."""
+    args = []
+    if seed is not None:
+        args.append(f"--autopilot-seed={seed}")
+    if input_track:
+        args.append(f"--autopilot-replay={Path(input_track).resolve()}")
+    if input_log:
+        args.append(f"--autopilot-log={Path(input_log).resolve()}")
+    return args
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+@dataclass
+class PerfResult:
+    scene: str
+    success: bool
+    error: str = ""
+    frame_ms: list[float] = field(default_factory=list)    # Wall time per frame
+    process_ms: list[float] = field(default_factory=list)
+    physics_ms: list[float] = field(default_factory=list)
+    nodes: int = 0
+    max_nodes: int = 0
+    objects: int = 0
+    max_objects: int = 0
+    orphan_nodes: int = 0
+    memory_mb: float = 0.0
+    max_memory_mb: float = 0.0
+    seconds: float = 0.0
+    seed: int | None = None
+    input_log: str = ""      # Autopilot input track of this run, for replaying it
+
+    def summary(self) -> dict:
+        """Scalar metrics for trend storage (no per-frame samples)."""
+        out = {"scene": self.scene, "success": self.success, "frames": len(self.frame_ms)}
+        for name in ("frame_ms", "process_ms", "physics_ms"):
+            samples = getattr(self, name)
+            out[f"{name}_mean"] = round(sum(samples) / len(samples), 4) if samples else 0.0
+            out[f"{name}_p95"] = round(_percentile(samples, 0.95), 4)
+        out["frame_ms_p99"] = round(_percentile(self.frame_ms, 0.99), 4)
+        for name in ("nodes", "max_nodes", "objects", "max_objects", "orphan_nodes", "memory_mb", "max_memory_mb"):
+            out[name] = getattr(self, name)
+        return out
+
+    def __str__(self) -> str:
+        if not self.success:
+            return f"{self.scene}: FAILED ({self.error})"
+        s = self.summary()
+        return (
+            f"{self.scene}: frame {s['frame_ms_mean']:.2f} ms (p95 {s['frame_ms_p95']:.2f}), "
+            f"process {s['process_ms_mean']:.2f} ms, physics {s['physics_ms_mean']:.2f} ms, "
+            f"{self.max_nodes} nodes, {self.orphan_nodes} orphans, {self.max_memory_mb:.1f} MB"
+        )
+
+
+@telemetry.traced("perf_bench")
+def benchmark_scene(
+    godot_exe: str,
+    project_path: Path,
+    scene: str = "",
+    frames: int = 600,
+    warmup: int = 60,
+    fixed_fps: int = 60,
+    autopilot: bool = True,
+    timeout: int = 120,
+    seed: int | None = None,
+    input_track: str = "",
+    input_log: str = "",
+) -> PerfResult:
+    """Run a scene (default: the main scene) headless for a warm-up plus `frames`
+    fixed-timestep frames, with the autopilot playing, and collect Performance data.
+
+    `seed` and `input_track` make the autopilot repeat a run; `input_log` records
+    the inputs of this one."""
+    scene = scene or _detect_main_scene(project_path)
+    if not scene:
+        return PerfResult(scene="", success=False, error="No main scene found in project.godot")
+
+    bench = project_path / "scripts" / "_perf_bench.gd"
+    start = time.monotonic()
+    try:
+        bench.parent.mkdir(parents=True, exist_ok=True)
+        bench.write_text(_PERF_BENCH_SCRIPT, encoding="utf-8")
+        cmd = [
+            godot_exe,
+            "--path", str(project_path),
+            "--headless",
+            "--fixed-fps", str(fixed_fps),
+            "--script", "res://scripts/_perf_bench.gd",
+            "--", scene, str(frames), str(warmup),
+        ]
+        if autopilot:
+            cmd.append("--autopilot")
+            cmd.extend(autopilot_args(seed, input_track, input_log))
+        result = _run_godot(cmd, timeout, "perf_bench")
+        output = result.stdout + result.stderr
+    except subprocess.TimeoutExpired:
+        return PerfResult(scene=scene, success=False, error=f"Benchmark timed out after {timeout}s")
+    except FileNotFoundError:
+        return PerfResult(scene=scene, success=False, error=f"Godot executable not found: {godot_exe}")
+    finally:
+        if bench.exists():
+            bench.unlink()
+
+    line = next((l for l in output.splitlines() if l.startswith(_PERF_RESULT)), "")
+    if not line:
+        return PerfResult(scene=scene, success=False, error="No PERF_RESULT in output: " + output[-300:])
+    try:
+        data = json.loads(line.removeprefix(_PERF_RESULT))
+    except json.JSONDecodeError as e:
+        return PerfResult(scene=scene, success=False, error=f"Unreadable PERF_RESULT ({e})")
+
+    return PerfResult(
+        scene=scene,
+        success=bool(data.get("success")),
+        error=data.get("error", ""),
+        frame_ms=[float(x) for x in data.get("frame_ms", [])],
+        process_ms=[float(x) for x in data.get("process_ms", [])],
+        physics_ms=[float(x) for x in data.get("physics_ms", [])],
+        nodes=data.get("nodes", 0),
+        max_nodes=data.get("max_nodes", 0),
+        objects=data.get("objects", 0),
+        max_objects=data.get("max_objects", 0),
+        orphan_nodes=data.get("orphan_nodes", 0),
+        memory_mb=round(data.get("memory_bytes", 0) / 1e6, 2),
+        max_memory_mb=round(data.get("max_memory_bytes", 0) / 1e6, 2),
+        seconds=round(time.monotonic() - start, 3),
+        seed=seed,
+        input_log=input_log if autopilot else "",
+    )
+
+
 # ---------------------------------------------------------------------------
 # Main test function
 # ---------------------------------------------------------------------------
 
+@telemetry.traced("baseline")
 def capture_baseline_errors(godot_exe: str, project_path: Path, timeout: int = 10) -> set[tuple[str, int, str]]:
     """Run Godot headless and return the set of pre-existing errors as (file, line, message) tuples."""
     cmd = [
@@ -388,7 +942,7 @@ def capture_baseline_errors(godot_exe: str, project_path: Path, timeout: int = 1
         "--quit-after", "1",
     ]
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        result = _run_godot(cmd, timeout, "baseline")
         output = result.stdout + result.stderr
         errors = parse_godot_errors(output)
         return {(e.file, e.line, e.message) for e in errors}
@@ -396,6 +950,7 @@ def capture_baseline_errors(godot_exe: str, project_path: Path, timeout: int = 1
         return set()
 
 
+@telemetry.traced("godot_test")
 def test_headless(
     godot_exe: str,
     project_path: Path,
@@ -416,12 +971,7 @@ def test_headless(
     ]
 
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-        )
+        result = _run_godot(cmd, timeout, "test_headless")
         output = result.stdout + result.stderr
         errors = parse_godot_errors(output)
 
@@ -465,19 +1015,32 @@ def test_headless(
 # Video recording (Godot Movie Maker)
 # ---------------------------------------------------------------------------
 
-def _convert_to_mp4(avi_path: Path, mp4_path: Path, timeout: int = 30) -> bool:
-    """Convert AVI to MP4 using FFmpeg. Returns True on success."""
+@telemetry.traced("ffmpeg")
+def _convert_to_mp4(
+    avi_path: Path,
+    mp4_path: Path,
+    timeout: int = 30,
+    start: float = 0.0,
+    length: float = 0.0,
+    target_bytes: int = 0,
+) -> bool:
+    """Convert AVI to MP4 using FFmpeg. Returns True on success.
+
+    `start`/`length` trim the clip; `target_bytes` encodes to about that size
+    (one pass, capped bitrate) instead of CRF 23."""
     ffmpeg = shutil.which("ffmpeg")
     if not ffmpeg:
         print("  FFmpeg not found — skipping AVI→MP4 conversion.")
         return False
 
+    input_args, rate_args = clip_editor.encode_args(start, length, target_bytes)
     cmd = [
         ffmpeg, "-y",
+        *input_args,
         "-i", str(avi_path),
         "-c:v", "libx264",
         "-preset", "fast",
-        "-crf", "23",
+        *rate_args,
         "-pix_fmt", "yuv420p",
         "-an",  # No audio (Godot Movie Maker doesn't record audio)
         str(mp4_path),
@@ -490,6 +1053,22 @@ def _convert_to_mp4(avi_path: Path, mp4_path: Path, timeout: int = 30) -> bool:
         return False
 
 
+def _encode_clip(avi_path: Path, mp4_path: Path, duration: float, clip_seconds: float, target_mb: float) -> bool:
+    """MP4 of the most active `clip_seconds` of the capture (all of it when
+    `clip_seconds` doesn't shorten it), encoded to `target_mb` when set."""
+    start, length = 0.0, float(duration)
+    if 0 < clip_seconds < duration:
+        activity = clip_editor.frame_activity(avi_path)
+        start = clip_editor.most_active_window(activity, clip_seconds)
+        length = float(clip_seconds)
+        if activity:
+            print(f"  Clip: most active {clip_seconds:g}s of {duration:g}s starts at {start:g}s")
+    return _convert_to_mp4(
+        avi_path, mp4_path, timeout=max(30, int(length * 3)),
+        start=start, length=length, target_bytes=int(target_mb * 1e6),
+    )
+
+
 def _detect_main_scene(project_path: Path) -> str:
     """Read main scene from project.godot. Returns empty string if not found."""
     project_file = project_path / "project.godot"
@@ -522,6 +1101,7 @@ def _looks_like_project_manager(output: str) -> bool:
     return any(ind.lower() in output_lower for ind in indicators)
 
 
+@telemetry.traced("record_gameplay")
 def record_gameplay(
     godot_exe: str,
     project_path: Path,
@@ -529,6 +1109,13 @@ def record_gameplay(
     duration: int = 10,
     fps: int = 30,
     timeout: int = 30,
+    seed: int | None = None,
+    input_track: str = "",
+    input_log: str = "",
+    env: dict | None = None,
+    rendering_driver: str = "",
+    clip_seconds: float = 0.0,
+    target_mb: float = 0.0,
 ) -> RecordingResult:
     """Record gameplay using Godot's Movie Maker mode.
 
@@ -538,6 +1125,12 @@ def record_gameplay(
 
     SAFETY: If the main scene cannot be determined, recording is SKIPPED entirely
     to prevent recording the Godot project manager (which shows file paths).
+
+    `seed`, `input_track` and `input_log` are passed to the autopilot (see
+    `autopilot_args`), so a recording can be replayed exactly. `env` selects the
+    display (see display_pool.py); `rendering_driver` e.g. "opengl3" for software GL.
+    With `clip_seconds` shorter than `duration` only the most active span is
+    kept (see clip_editor.py); `target_mb` sets the MP4's size.
     """
     # CRITICAL: Detect main scene FIRST. If we can't find it, do NOT record.
     # Without a valid main scene, Godot opens the project manager which exposes
@@ -574,14 +1167,14 @@ def record_gameplay(
         "--fixed-fps", str(fps),
         "--quit-after", str(total_frames),
     ]
+    if rendering_driver:
+        cmd[1:1] = ["--rendering-driver", rendering_driver]
+    replay_args = autopilot_args(seed, input_track, input_log)
+    if replay_args:
+        cmd.extend(["--", *replay_args])
 
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-        )
+        result = _run_godot(cmd, timeout, "record_gameplay", env=env)
         output = result.stdout + result.stderr
 
         # SAFETY: If Godot opened the project manager, discard everything
@@ -604,7 +1197,7 @@ def record_gameplay(
             )
 
         # Convert AVI → MP4 for Twitter compatibility
-        if _convert_to_mp4(avi_path, mp4_path):
+        if _encode_clip(avi_path, mp4_path, duration, clip_seconds, target_mb):
             avi_path.unlink()  # Clean up AVI
             return RecordingResult(
                 success=True,
@@ -621,7 +1214,7 @@ def record_gameplay(
 
     except subprocess.TimeoutExpired:
         if avi_path.exists() and avi_path.stat().st_size > 0:
-            if _convert_to_mp4(avi_path, mp4_path):
+            if _encode_clip(avi_path, mp4_path, duration, clip_seconds, target_mb):
                 avi_path.unlink()
                 return RecordingResult(
                     success=True,
@@ -0,0 +1,135 @@
+"""Reproducible autopilot runs — seeds, input tracks and replays against any commit.
+
+Every benchmark and recording gets a seed for the game's RNG and, with
+`autopilot.log_inputs`, writes the autopilot's input track to
+`<dir>/<kind>_<time>_<label>.jsonl`: a header line with the seed, then the
+pressed actions on each physics frame where they changed. Replaying a track
+with its seed repeats the run exactly on the same commit, and feeds the same
+inputs to any other commit. Only the newest `autopilot.keep_tracks` tracks are kept.
+
+    python input_replay.py output/inputs/perf_20260101_120000_main.jsonl
+    python input_replay.py TRACK --commit HEAD~3          # same inputs, older code
+    python input_replay.py TRACK --record replay.avi      # watch it
+"""
+
+import argparse
+import json
+import random
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import yaml
+
+import display_pool
+from godot_runner import benchmark_scene
+
+
+def input_dir(root: Path, config: dict) -> Path:
+    return root / config.get("autopilot", {}).get("dir", "output/inputs")
+
+
+def run_options(autopilot_cfg: dict, directory: Path | None, kind: str, label: str) -> dict:
+    """Seed and input-log keyword arguments for benchmark_scene / record_gameplay."""
+    seed = autopilot_cfg.get("seed")
+    if seed is None:
+        seed = random.randrange(1, 2**31)  # Fresh per run, but still logged
+    options = {"seed": int(seed)}
+    if directory is not None and autopilot_cfg.get("log_inputs", True):
+        directory.mkdir(parents=True, exist_ok=True)
+        prune_tracks(directory, autopilot_cfg.get("keep_tracks", 200) - 1)
+        label = re.sub(r"[^\w.-]+", "_", label.removeprefix("res://")).strip("_") or "main"
+        options["input_log"] = str(directory / f"{kind}_{time.strftime('%Y%m%d_%H%M%S')}_{label}.jsonl")
+    return options
+
+
+def prune_tracks(directory: Path, keep: int) -> None:
+    """Delete all but the newest `keep` input tracks in `directory`."""
+    tracks = sorted(directory.glob("*.jsonl"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for path in tracks[max(keep, 0):]:
+        path.unlink(missing_ok=True)
+
+
+def read_track(path: Path) -> tuple[dict, list[dict]]:
+    """(header, entries) of an input track."""
+    header, entries = {}, []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            continue  # A crash can leave a torn last line
+        if "f" in row:
+            entries.append(row)
+        elif not header:
+            header = row
+    return header, entries
+
+
+@contextmanager
+def checkout(root: Path, commit: str):
+    """A detached worktree of `commit`, removed afterwards."""
+    path = Path(tempfile.mkdtemp(prefix="replay_"))
+    try:
+        subprocess.run(
+            ["git", "worktree", "add", "--detach", "--force", str(path), commit],
+            cwd=root, capture_output=True, text=True, check=True,
+        )
+        yield path
+    finally:
+        subprocess.run(["git", "worktree", "remove", "--force", str(path)], cwd=root, capture_output=True)
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay an autopilot input track")
+    parser.add_argument("track", help="Input track written by a benchmark or recording")
+    parser.add_argument("--commit", default="", help="Replay against this commit (default: working tree)")
+    parser.add_argument("--scene", default="", help="Scene to run (default: the main scene)")
+    parser.add_argument("--record", default="", help="Record a video here instead of benchmarking")
+    parser.add_argument("--frames", type=int, default=0, help="Frames to run (default: the track's length)")
+    args = parser.parse_args()
+
+    root = Path(__file__).resolve().parent.parent
+    with open(Path(__file__).resolve().parent / "config.yaml", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    track = Path(args.track).resolve()
+    header, entries = read_track(track)
+    seed = header.get("seed")
+    frames = args.frames or (entries[-1]["f"] + 60 if entries else 600)
+    print(f"Replaying {track.name}: seed {seed}, {len(entries)} input changes, {frames} frames")
+
+    def run(world_root: Path) -> None:
+        game_path = world_root / config["paths"].get("game", "game")
+        godot_exe = config["godot"]["executable"]
+        if args.record:
+            fps = config.get("recording", {}).get("fps", 30)
+            display_pool.configure(config)
+            result = display_pool.record(
+                godot_exe, game_path, Path(args.record).resolve(),
+                rendering_driver=config["recording"].get("virtual_display", {}).get("rendering_driver", ""),
+                duration=max(1, round(frames / header.get("physics_fps", 60))), fps=fps,
+                timeout=config.get("recording", {}).get("timeout", 30),
+                seed=seed, input_track=str(track),
+            )
+            print(result.video_path if result.success else f"Recording failed: {result.error}")
+        else:
+            perf_cfg = config.get("perf", {})
+            print(benchmark_scene(
+                godot_exe, game_path, args.scene, frames=frames, warmup=0,
+                fixed_fps=perf_cfg.get("fixed_fps", 60), timeout=perf_cfg.get("timeout", 120),
+                seed=seed, input_track=str(track),
+            ))
+
+    if args.commit:
+        with checkout(root, args.commit) as path:
+            run(path)
+    else:
+        run(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Usage ledger — every billed model call priced and persisted, plus a budget governor.
+
+Each call is appended as one JSON line to `output/usage_ledger.jsonl` (cycle,
+model, purpose, tokens, cost). The governor compares the recent spend rate with
+the configured daily and monthly budgets and, when spend runs ahead, tightens
+the cycle's config: a smaller context budget, optional checks off, a longer
+sleep between cycles.
+"""
+
+import calendar
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import telemetry
+
+# Model family -> USD per million tokens: (input, output, cache write, cache read)
+PRICES: dict[str, tuple[float, float, float, float]] = {
+    "opus": (5.00, 25.00, 6.25, 0.50),
+    "sonnet": (3.00, 15.00, 3.75, 0.30),
+    "haiku": (1.00, 5.00, 1.25, 0.10),
+}
+BATCH_DISCOUNT = 0.5
+
+_lock = threading.Lock()
+_path: Path | None = None
+_world = "main"
+_cycle: int | None = None
+_entries: list[tuple[float, str, int | None, float]] = []  # (timestamp, world, cycle, cost) this month
+_loaded_from: Path | None = None
+
+
+def configure(config: dict | None, root: Path) -> None:
+    """Apply the `budget` config section; loads this month's entries on first use."""
+    global _path, _entries, _loaded_from
+    budget_cfg = (config or {}).get("budget", {}) or {}
+    _path = root / budget_cfg.get("ledger", "output/usage_ledger.jsonl")
+    if _loaded_from == _path:
+        return
+    _loaded_from = _path
+    month_start = _month_start(time.time())
+    entries = []
+    if _path.exists():
+        with open(_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if row.get("ts", 0) >= month_start:
+                    entries.append((row["ts"], row.get("world", "main"), row.get("cycle"), row.get("cost_usd", 0.0)))
+    with _lock:
+        _entries = entries
+
+
+def begin_cycle(cycle_num: int, world: str = "main") -> None:
+    global _cycle, _world
+    _cycle = cycle_num
+    _world = world
+
+
+def current_cycle() -> int | None:
+    return _cycle
+
+
+def price(model: str, usage, batch: bool = False) -> float:
+    """USD cost of one call. Unknown models are priced as Sonnet."""
+    family = next((name for name in PRICES if name in (model or "")), "sonnet")
+    input_rate, output_rate, write_rate, read_rate = PRICES[family]
+    cost = (
+        (getattr(usage, "input_tokens", 0) or 0) * input_rate
+        + (getattr(usage, "output_tokens", 0) or 0) * output_rate
+        + (getattr(usage, "cache_creation_input_tokens", 0) or 0) * write_rate
+        + (getattr(usage, "cache_read_input_tokens", 0) or 0) * read_rate
+    ) / 1_000_000
+    return cost * BATCH_DISCOUNT if batch else cost
+
+
+def record(purpose: str, model: str, usage, batch: bool = False) -> None:
+    """Price a call and append it to the ledger."""
+    if usage is None:
+        return
+    now = time.time()
+    cost = price(model, usage, batch=batch)
+    row = {
+        "ts": round(now, 3),
+        "world": _world,
+        "cycle": _cycle,
+        "model": model,
+        "purpose": purpose,
+        "batch": batch,
+        "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+        "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+        "cache_read_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+        "cache_created_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+        "cost_usd": round(cost, 6),
+    }
+    telemetry.count("godmachine_cost_usd_total", cost, purpose=purpose, model=model)
+    with _lock:
+        if _entries and _month_start(_entries[0][0]) != _month_start(now):
+            _entries.clear()  # New month
+        _entries.append((now, _world, _cycle, cost))
+        if _path is None:
+            return
+        try:
+            _path.parent.mkdir(parents=True, exist_ok=True)
+            with open(_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(row) + "\n")
+        except OSError as e:
+            print(f"  Usage ledger not written ({e})")
+
+
+def spend_since(since: float) -> float:
+    with _lock:
+        return sum(cost for ts, _, _, cost in _entries if ts >= since)
+
+
+def cycle_spend(cycle_num: int, world: str = "main") -> float:
+    with _lock:
+        return sum(cost for _, w, cycle, cost in _entries if cycle == cycle_num and w == world)
+
+
+def _month_start(ts: float) -> float:
+    t = time.gmtime(ts)
+    return calendar.timegm((t.tm_year, t.tm_mon, 1, 0, 0, 0))
+
+
+def _day_start(ts: float) -> float:
+    t = time.gmtime(ts)
+    return calendar.timegm((t.tm_year, t.tm_mon, t.tm_mday, 0, 0, 0))
+
+
+# ---------------------------------------------------------------------------
+# Governor
+# ---------------------------------------------------------------------------
+
+@dataclass
+class BudgetDecision:
+    pace: float = 0.0            # Projected spend / budget; above 1.0 means over budget
+    exhausted: bool = False      # A budget is already spent
+    today_usd: float = 0.0
+    month_usd: float = 0.0
+    actions: list[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        text = f"${self.today_usd:.2f} today, ${self.month_usd:.2f} this month, pace {self.pace:.2f}"
+        if self.exhausted:
+            text += " (budget exhausted)"
+        return text
+
+
+def assess(config: dict, now: float | None = None) -> BudgetDecision:
+    """Project the spend rate against the daily and monthly budgets (UTC)."""
+    budget_cfg = config.get("budget", {}) or {}
+    daily = budget_cfg.get("daily_usd", 0)
+    monthly = budget_cfg.get("monthly_usd", 0)
+    window = budget_cfg.get("window_hours", 6) * 3600
+    now = now or time.time()
+
+    decision = BudgetDecision(
+        today_usd=spend_since(_day_start(now)),
+        month_usd=spend_since(_month_start(now)),
+    )
+    paces = []
+    if daily:
+        # Trailing window scaled to a full day
+        paces.append(spend_since(now - window) * (86400 / window) / daily)
+        decision.exhausted |= decision.today_usd >= daily
+    if monthly:
+        t = time.gmtime(now)
+        month_seconds = calendar.monthrange(t.tm_year, t.tm_mon)[1] * 86400
+        # Never judge on less than one window, or the first hours of a month always look expensive
+        elapsed = max(now - _month_start(now), window)
+        paces.append(decision.month_usd / (monthly * elapsed / month_seconds))
+        decision.exhausted |= decision.month_usd >= monthly
+    decision.pace = max(paces, default=0.0)
+    return decision
+
+
+def govern(config: dict, now: float | None = None) -> BudgetDecision:
+    """Tighten this cycle's config in place when spend runs ahead of budget."""
+    budget_cfg = config.get("budget", {}) or {}
+    decision = assess(config, now)
+    telemetry.gauge("godmachine_budget_pace", decision.pace)
+    if not budget_cfg.get("govern", True) or (decision.pace <= 1.0 and not decision.exhausted):
+        return decision
+
+    context_cfg = config.setdefault("context", {})
+    validation_cfg = config.setdefault("validation", {})
+    cycle_cfg = config.setdefault("cycle", {})
+    pace = max(decision.pace, 1.0)
+
+    # Smaller prompts, in proportion to the overshoot
+    token_budget = context_cfg.get("token_budget", 80000)
+    narrowed = max(int(token_budget / pace), budget_cfg.get("min_token_budget", 30000))
+    if narrowed < token_budget:
+        context_cfg["token_budget"] = narrowed
+        decision.actions.append(f"token_budget {token_budget} -> {narrowed}")
+
+    # Optional checks and the Oracle go first; the intent check only once a budget is spent
+    if validation_cfg.get("narrative_check"):
+        validation_cfg["narrative_check"] = False
+        decision.actions.append("narrative check off")
+    if config.get("oracle", {}).get("enabled"):
+        config["oracle"]["enabled"] = False
+        decision.actions.append("oracle off")
+    if decision.exhausted and validation_cfg.get("intent_check"):
+        validation_cfg["intent_check"] = False
+        decision.actions.append("intent check off")
+
+    # Stretch the sleep so the spend rate falls back under budget
+    max_stretch = budget_cfg.get("max_interval_stretch", 10)
+    stretch = max_stretch if decision.exhausted else min(pace, max_stretch)
+    interval = cycle_cfg.get("interval_seconds", 300)
+    cycle_cfg["interval_seconds"] = int(interval * stretch)
+    if cycle_cfg["interval_seconds"] != interval:
+        decision.actions.append(f"interval {interval}s -> {cycle_cfg['interval_seconds']}s")
+
+    return decision
@@ -1,8 +1,13 @@
 """Anthropic SDK wrapper — builds prompts and calls Claude."""
 
-import time
+import hashlib
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
 
-import anthropic
+import api_client
+import telemetry
 
 SYSTEM_PROMPT = """\
 You are GODMACHINE — an all-powerful but unreliable deity constructing a dungeon world in Godot 4.6.
@@ -168,23 +173,29 @@ def get_system_prompt(config: dict | None = None) -> str:
     return "\n".join(parts)
 
 
+def system_blocks(config: dict | None = None) -> list[dict]:
+    """The system prompt as a cached block — shared by every call that wants the main call's cache."""
+    # The system prompt + few-shot + cheat sheet are identical every cycle.
+    # Cache TTL is 5 min, refreshed on each use — stays warm across cycles.
+    return [{"type": "text", "text": get_system_prompt(config), "cache_control": {"type": "ephemeral"}}]
+
+
 # ---------------------------------------------------------------------------
 # Token estimation
 # ---------------------------------------------------------------------------
 
-def count_tokens(messages: list[dict], model: str, system: str | list = "") -> int:
+def count_tokens(messages: list[dict], model: str, system: str | list = "", tools: list[dict] | None = None) -> int:
     """Exact token count via the Anthropic API. Falls back to estimate on error."""
     try:
-        client = anthropic.Anthropic()
-        result = client.messages.count_tokens(
+        return api_client.count_message_tokens(
             model=model,
             system=system if system else [],
             messages=messages,
+            **({"tools": tools} if tools else {}),
         )
-        return result.input_tokens
     except Exception as e:
         print(f"  Token count API failed ({e}), using estimate")
-        total = sum(len(m.get("content", "")) for m in messages)
+        total = sum(_content_len(m.get("content", "")) for m in messages)
         if isinstance(system, str):
             total += len(system)
         elif isinstance(system, list):
@@ -192,9 +203,16 @@ def count_tokens(messages: list[dict], model: str, system: str | list = "") -> i
         return total // 4
 
 
-def estimate_tokens(text: str) -> int:
-    """Rough token count: ~4 chars per token."""
-    return len(text) // 4
+def _content_len(content: str | list) -> int:
+    """Character length of message content given as a string or a list of blocks."""
+    if isinstance(content, str):
+        return len(content)
+    return sum(len(b.get("text", "")) for b in content)
+
+
+def estimate_tokens(text: str | list) -> int:
+    """Rough token count: ~4 chars per token (text, or a list of content blocks)."""
+    return _content_len(text) // 4
 
 
 # ---------------------------------------------------------------------------
@@ -204,57 +222,26 @@ def estimate_tokens(text: str) -> int:
 def build_cycle_prompt(
     strategy: str,
     strategy_explanation: str,
-    cycle_log_xml: str,
-    world_state_xml: str,
-    file_contents: str,
     cycle_num: int,
     last_error: str = "",
-    capabilities_summary: str = "",
     last_diff: str = "",
-    learnings: str = "",
-    token_budget: int = 80000,
     curate_learnings: bool = False,
     learnings_token_budget: int = 4000,
     oracle_context: str = "",
     oracle_available: bool = False,
     whispers: str = "",
-    soul_state: str = "",
 ) -> str:
-    """Build the user prompt for a cycle, respecting token budget."""
+    """Build the cycle-specific part of the user prompt.
+
+    It follows the shared context snapshot (context_snapshot.py) in the same
+    user turn; the snapshot carries the logs, lore, soul, learnings and files.
+    """
     parts = [
         f"# Cycle {cycle_num} — Strategy: {strategy.upper()}",
         f"**Why:** {strategy_explanation}",
         "",
-        "## Recent Cycle Log",
-        f"```xml\n{cycle_log_xml}\n```",
-        "",
-        "## World State (Lore)",
-        f"```xml\n{world_state_xml}\n```",
-        "",
     ]
 
-    if soul_state:
-        parts.extend([
-            "## Your Soul",
-            "This is your persistent inner state. You wrote it. You may rewrite it.",
-            soul_state,
-            "",
-        ])
-
-    if capabilities_summary:
-        parts.extend([
-            "## Game Capabilities",
-            capabilities_summary,
-            "",
-        ])
-
-    if learnings:
-        parts.extend([
-            "## Learnings (accumulated knowledge from past cycles)",
-            learnings,
-            "",
-        ])
-
     if oracle_context:
         parts.extend([
             "## Oracle Response",
@@ -281,7 +268,7 @@ def build_cycle_prompt(
             "",
         ])
 
-    if curate_learnings and learnings:
+    if curate_learnings:
         parts.extend([
             "## CURATION REQUEST",
             "Your learnings file above has grown. Along with your normal cycle output, "
@@ -294,16 +281,8 @@ def build_cycle_prompt(
             "",
         ])
 
-    # Use a unique marker for file_contents so we can safely replace it later
-    file_contents_marker = "<<<GODMACHINE_FILE_CONTENTS>>>"
-    parts.extend([
-        "## Current File Contents",
-        file_contents_marker,
-    ])
-
     if last_error and strategy in ("retry", "pivot"):
         parts.extend([
-            "",
             "## Last Error",
             f"```\n{last_error}\n```",
         ])
@@ -316,116 +295,80 @@ def build_cycle_prompt(
                 "The diff above shows exactly what was tried. Fix the specific errors, "
                 "don't rewrite everything from scratch.",
             ])
+        parts.append("")
 
     if strategy == "explore" and cycle_num == 1:
-        parts.extend([
-            "",
+        parts.append(
             "You are in EXPLORE mode. This is the FIRST CYCLE — the game is a blank slate "
             "(empty room, green square, WASD only). Start with something foundational: "
             "a simple enemy, a basic combat mechanic, or a core system like health. "
-            "Don't try anything that depends on systems that don't exist yet.",
-        ])
+            "Don't try anything that depends on systems that don't exist yet."
+        )
     elif strategy == "explore":
-        parts.extend([
-            "",
+        parts.append(
             "You are in EXPLORE mode. Choose one thing to add to the world. "
-            "Be creative but keep it small and testable.",
-        ])
+            "Be creative but keep it small and testable."
+        )
     elif strategy == "retry":
-        parts.extend([
-            "",
+        parts.append(
             "You are in RETRY mode. Your last attempt failed (see error above). "
-            "Try a different, simpler approach to the same feature.",
-        ])
+            "Try a different, simpler approach to the same feature."
+        )
     elif strategy == "pivot":
-        parts.extend([
-            "",
+        parts.append(
             "You are in PIVOT mode. Your last several attempts at the same feature failed. "
-            "Abandon it completely and try something entirely different.",
-        ])
+            "Abandon it completely and try something entirely different."
+        )
 
-    prompt = "\n".join(parts)
-
-    # Token budget enforcement: progressively trim file_contents
-    current_tokens = estimate_tokens(prompt.replace(file_contents_marker, file_contents))
-    if current_tokens > token_budget and file_contents:
-        overshoot = current_tokens - token_budget
-        chars_to_trim = overshoot * 4  # Convert back to chars
-        if chars_to_trim < len(file_contents):
-            trimmed = file_contents[: len(file_contents) - chars_to_trim]
-            trimmed += "\n\n... (file contents truncated to fit token budget)"
-            prompt = prompt.replace(file_contents_marker, trimmed)
-        else:
-            prompt = prompt.replace(
-                file_contents_marker,
-                "(file contents omitted — token budget exceeded. See codebase summary above.)",
-            )
-    else:
-        prompt = prompt.replace(file_contents_marker, file_contents)
+    return "\n".join(parts).rstrip()
 
-    return prompt
+
+def build_retry_turn(
+    cycle_num: int,
+    strategy_explanation: str,
+    last_error: str,
+) -> str:
+    """The follow-up user turn for a retry that continues the previous conversation.
+
+    The previous prompt and response stay in the (cached) conversation prefix,
+    so only the error report is new. The failed diff is the previous response
+    itself and isn't repeated.
+    """
+    return "\n".join([
+        f"# Cycle {cycle_num} — Strategy: RETRY",
+        f"**Why:** {strategy_explanation}",
+        "",
+        "## Last Error",
+        f"```\n{last_error}\n```",
+        "",
+        "Your previous response (above) failed when it was applied and tested. "
+        "The project has been rolled back to the state described in the first message. "
+        "Respond again in the exact same format with corrected, complete files. "
+        "Fix the specific errors, don't rewrite everything from scratch.",
+    ])
 
 
 # ---------------------------------------------------------------------------
 # LLM call
 # ---------------------------------------------------------------------------
 
-def verify_intent(
-    action: str,
-    target: str,
-    files_written: dict[str, str],
-    model: str = "claude-haiku-4-5-20251001",
-) -> tuple[bool, str]:
-    """Cheap Haiku call to check if the code matches the stated intent.
+def _parse_json_reply(text: str) -> dict:
+    """Parse a JSON reply from a check model — handles markdown code fences."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1].rsplit("```", 1)[0].strip()
+    return json.loads(text)
 
-    Returns (passed, reason). On any error, returns (True, "") to avoid blocking.
-    """
-    file_listing = ""
-    for path, content in files_written.items():
-        file_listing += f"\n--- {path} ---\n{content}\n"
-
-    prompt = (
-        f"The AI said it would: {action} {target}\n\n"
-        f"Here are the files it produced:\n{file_listing}\n\n"
-        "Does the code actually implement what was claimed? "
-        "Check that the files contain real, meaningful implementation of the stated action/target — "
-        "not just boilerplate, empty stubs, or unrelated code.\n\n"
-        'Respond with ONLY valid JSON: {"pass": true/false, "reason": "brief explanation"}'
-    )
 
-    try:
-        import json
-        client = anthropic.Anthropic()
-        message = client.messages.create(
-            model=model,
-            max_tokens=256,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        text = message.content[0].text.strip()
-        # Parse JSON — handle markdown code fences
-        if text.startswith("```"):
-            text = text.split("\n", 1)[1].rsplit("```", 1)[0].strip()
-        result = json.loads(text)
-        return bool(result.get("pass", True)), result.get("reason", "")
-    except Exception as e:
-        print(f"  Intent check skipped (error: {e})")
-        return True, ""
-
-
-def check_narrative_coherence(
+def build_narrative_prompt(
     soul_state: str,
     action: str,
     target: str,
     lore_entry: str,
     patch_notes: str,
-    model: str = "claude-haiku-4-5-20251001",
-) -> tuple[bool, str]:
-    """Cheap Haiku call to check if cycle output is coherent with the soul.
-
-    Returns (coherent, feedback). Non-blocking — dissonance is noted, not punished.
-    On any error, returns (True, "") to avoid interfering.
-    """
-    prompt = (
+) -> str:
+    """Prompt for the narrative coherence check (sync or batched)."""
+    return (
         f"GODMACHINE's soul (its persistent beliefs, desires, aesthetic):\n{soul_state}\n\n"
         f"This cycle it did: {action} {target}\n"
         f"Lore entry: {lore_entry}\n"
@@ -436,99 +379,316 @@ def check_narrative_coherence(
         'Respond with ONLY valid JSON: {"coherent": true/false, "feedback": "brief note"}'
     )
 
+
+def parse_narrative_reply(text: str) -> tuple[bool, str]:
+    """Parse a narrative check reply into (coherent, feedback)."""
+    result = _parse_json_reply(text)
+    return bool(result.get("coherent", True)), result.get("feedback", "")
+
+
+# ---------------------------------------------------------------------------
+# Batch request builders (latency-insensitive work, see batch_queue)
+# ---------------------------------------------------------------------------
+
+def build_curation_request(
+    learnings: str,
+    model: str,
+    token_budget: int = 4000,
+) -> dict:
+    """messages.create params for a standalone learnings curation job."""
+    prompt = (
+        "Below is GODMACHINE's learnings file — technical lessons accumulated across cycles.\n\n"
+        f"{learnings}\n\n"
+        "Output a compressed, deduplicated version inside a `<curated_learnings>` tag. "
+        "Merge duplicate insights, remove stale or obsolete "
+        f"entries, and keep it under ~{token_budget} tokens. Prioritize "
+        "specific, actionable lessons (file paths, API names, patterns). Format each "
+        "entry as `- **Cycle N** [tag] (action): lesson` just like the originals. "
+        "You may combine multiple cycle entries into one if they teach the same lesson."
+    )
+    return {
+        "model": model,
+        "max_tokens": token_budget + 1024,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+
+
+def build_lore_rollup_request(entries: list[tuple[str, str]], model: str) -> dict:
+    """messages.create params summarizing old chronicle entries into one passage.
+
+    `entries` is a list of (day, text) pairs, oldest first.
+    """
+    chronicle = "\n".join(f"Day {day}: {text}" for day, text in entries)
+    prompt = (
+        "These are old entries from the chronicle of a dungeon built by GODMACHINE, "
+        "an unreliable deity:\n\n"
+        f"{chronicle}\n\n"
+        "Roll them up into a single passage of at most three sentences, in the same "
+        "voice. Keep every creature, place and mechanic that was introduced. "
+        "Respond with ONLY the passage."
+    )
+    return {
+        "model": model,
+        "max_tokens": 512,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Merged verification (intent + narrative in one call, cached by content hash)
+# ---------------------------------------------------------------------------
+
+VERDICT_CACHE_MAX = 200
+
+
+@dataclass
+class VerificationResult:
+    intent_passed: bool = True
+    intent_reason: str = ""
+    coherent: bool = True
+    narrative_feedback: str = ""
+    cached: bool = False
+
+
+def _hash_key(*parts: str) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _load_verdict_cache(path: Path | None) -> dict:
+    if not path or not path.exists():
+        return {}
     try:
-        import json
-        client = anthropic.Anthropic()
-        message = client.messages.create(
-            model=model,
-            max_tokens=256,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        text = message.content[0].text.strip()
-        if text.startswith("```"):
-            text = text.split("\n", 1)[1].rsplit("```", 1)[0].strip()
-        result = json.loads(text)
-        return bool(result.get("coherent", True)), result.get("feedback", "")
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+def _save_verdict_cache(path: Path | None, cache: dict) -> None:
+    if not path:
+        return
+    # Dicts keep insertion order — drop the oldest verdicts first
+    while len(cache) > VERDICT_CACHE_MAX:
+        cache.pop(next(iter(cache)))
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(cache), encoding="utf-8")
     except Exception as e:
-        print(f"  Narrative check skipped (error: {e})")
-        return True, ""
+        print(f"  Verdict cache not saved ({e})")
+
 
+@telemetry.traced("verify")
+def verify_cycle(
+    action: str,
+    target: str,
+    diff: str,
+    signatures: str = "",
+    soul_state: str = "",
+    lore_entry: str = "",
+    patch_notes: str = "",
+    check_intent: bool = True,
+    check_narrative: bool = True,
+    model: str = "claude-haiku-4-5-20251001",
+    cache_path: Path | None = None,
+) -> VerificationResult:
+    """One cheap Haiku call covering both the intent and narrative checks.
+
+    The code is sent as a unified diff plus GDScript signatures rather than
+    whole files. Verdicts are cached by content hash — intent on the diff,
+    narrative on the soul and cycle text — so a retry with identical code
+    skips the intent half. On any error, both checks pass (non-blocking).
+    """
+    result = VerificationResult()
+    cache = _load_verdict_cache(cache_path)
+    intent_key = _hash_key("intent", model, action, target, diff)
+    narrative_key = _hash_key("narrative", model, soul_state, action, target, lore_entry, patch_notes)
+
+    need_intent = check_intent and intent_key not in cache
+    need_narrative = check_narrative and bool(soul_state) and narrative_key not in cache
+
+    if need_intent or need_narrative:
+        sections = [f"The AI said it would: {action} {target}"]
+        reply_fields = []
+        if need_intent:
+            sections.append(f"Here is the diff it produced:\n```diff\n{diff}\n```")
+            if signatures:
+                sections.append(f"Signatures of the changed scripts:\n```\n{signatures}\n```")
+            sections.append(
+                "INTENT: Does the code actually implement what was claimed? "
+                "Check that the diff contains real, meaningful implementation of the stated "
+                "action/target — not just boilerplate, empty stubs, or unrelated code."
+            )
+            reply_fields.append('"pass": true/false, "reason": "brief explanation"')
+        if need_narrative:
+            sections.append(
+                f"GODMACHINE's soul (its persistent beliefs, desires, aesthetic):\n{soul_state}\n\n"
+                f"Lore entry: {lore_entry}\nTweet: {patch_notes}"
+            )
+            sections.append(
+                "NARRATIVE: Is this cycle's output narratively coherent with the soul? "
+                "Not whether it's good code — whether the voice, the choices, and the lore "
+                "feel like they come from the same entity."
+            )
+            reply_fields.append('"coherent": true/false, "feedback": "brief note"')
+        sections.append("Respond with ONLY valid JSON: {" + ", ".join(reply_fields) + "}")
+
+        try:
+            message = api_client.create_message(
+                "check",
+                model=model,
+                max_tokens=384,
+                messages=[{"role": "user", "content": "\n\n".join(sections)}],
+            )
+            reply = _parse_json_reply(message.content[0].text)
+            if need_intent:
+                cache[intent_key] = [bool(reply.get("pass", True)), reply.get("reason", "")]
+            if need_narrative:
+                cache[narrative_key] = [bool(reply.get("coherent", True)), reply.get("feedback", "")]
+            _save_verdict_cache(cache_path, cache)
+        except Exception as e:
+            print(f"  Verification skipped (error: {e})")
+            return result
+    else:
+        result.cached = True
+
+    if check_intent and intent_key in cache:
+        result.intent_passed, result.intent_reason = cache[intent_key]
+    if check_narrative and narrative_key in cache:
+        result.coherent, result.narrative_feedback = cache[narrative_key]
+    return result
+
+
+# Breakpoints the API accepts per request; the system prompt always takes one
+MAX_CACHE_BREAKPOINTS = 4
+
+
+def _copy_turn(message: dict) -> dict:
+    content = message["content"]
+    return {**message, "content": [dict(b) for b in content] if isinstance(content, list) else content}
 
+
+def _mark_last(content: str | list) -> list[dict]:
+    """Content blocks with a cache breakpoint on the last one."""
+    if isinstance(content, str):
+        return [{"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}]
+    content[-1]["cache_control"] = {"type": "ephemeral"}
+    return content
+
+
+def _cap_breakpoints(messages: list[dict], limit: int) -> None:
+    """Keep the newest `limit` message breakpoints; each covers every prefix before it."""
+    for m in reversed(messages):
+        if isinstance(m["content"], str):
+            continue
+        for block in reversed(m["content"]):
+            if "cache_control" in block:
+                if limit > 0:
+                    limit -= 1
+                else:
+                    del block["cache_control"]
+
+
+@telemetry.traced("llm_call")
 def call_llm(
-    prompt: str,
-    model: str = "claude-sonnet-4-5-20250929",
+    prompt: str | list[dict],
+    model: str = "",
     max_tokens: int = 4096,
     config: dict | None = None,
-    max_retries: int = 3,
+    max_retries: int | None = None,
+    fallback_model: str = "",
+    history: list[dict] | None = None,
+    tools: list[dict] | None = None,
+    run_tool: Callable[[str, dict], str] | None = None,
+    max_tool_turns: int = 6,
 ) -> str:
     """Call Claude and return the response text.
 
     Uses prompt caching for the system prompt (identical every cycle) to cut
-    input costs by ~90% on that portion. Retries on transient failures.
+    input costs by ~90% on that portion. Retries on transient failures are
+    handled by the shared client in api_client; `max_retries` defaults to
+    `api.attempts.main`.
+
+    `prompt` is a string or content blocks (a context snapshot's shared prefix
+    and the cycle's instructions, see context_snapshot.py).
+
+    `history` holds earlier turns ({"role", "content"} dicts) when a retry
+    continues the previous cycle's conversation. With `prompt.cache_conversation`
+    the newest turns carry cache breakpoints, so that continuation reads the
+    previous prompt and response from the cache instead of paying for them again.
+
+    With `tools` the model may call them (answered by `run_tool`) for up to
+    `max_tool_turns` rounds; the round after that has tools disabled so it must
+    answer. Each round's newest tool results carry the moving cache breakpoint.
+
+    `model` overrides `prompt.model` (see model_router); on overload the call
+    switches to `fallback_model`, and later tool rounds stay on it.
     """
     config = config or {}
     prompt_cfg = config.get("prompt", {})
 
-    actual_model = prompt_cfg.get("model", model)
+    actual_model = model or prompt_cfg.get("model", "claude-sonnet-4-5-20250929")
     actual_max_tokens = prompt_cfg.get("max_tokens", max_tokens)
-    api_timeout = prompt_cfg.get("api_timeout", 120)
-    system_prompt = get_system_prompt(config)
+    api_timeout = prompt_cfg.get("api_timeout", api_client.purpose_timeout("main"))
+    system_with_cache = system_blocks(config)
 
-    # Wrap system prompt with cache_control for prompt caching.
-    # The system prompt + few-shot + cheat sheet are identical every cycle.
-    # Cache TTL is 5 min, refreshed on each use — stays warm across cycles.
-    system_with_cache = [
-        {
-            "type": "text",
-            "text": system_prompt,
-            "cache_control": {"type": "ephemeral"},
-        }
-    ]
+    messages = [_copy_turn(m) for m in (history or [])] + [_copy_turn({"role": "user", "content": prompt})]
+    if prompt_cfg.get("cache_conversation", False):
+        # Breakpoints on the last prior turn and the new turn (plus the system
+        # prompt) — the API finds earlier cached prefixes by looking back.
+        for m in messages[-2:] if history else messages[-1:]:
+            m["content"] = _mark_last(m["content"])
+    _cap_breakpoints(messages, MAX_CACHE_BREAKPOINTS - 1)
 
-    messages = [{"role": "user", "content": prompt}]
+    tool_kwargs = {"tools": tools} if tools else {}
 
     # Exact token count (pre-flight check)
-    token_count = count_tokens(messages, actual_model, system_with_cache)
+    token_count = count_tokens(messages, actual_model, system_with_cache, **tool_kwargs)
     print(f"  Exact input tokens: {token_count}")
 
-    client = anthropic.Anthropic(timeout=api_timeout)
-
-    for attempt in range(max_retries):
-        try:
-            message = client.messages.create(
-                model=actual_model,
-                max_tokens=actual_max_tokens,
-                system=system_with_cache,
-                messages=messages,
-            )
-            # Log cache performance
-            usage = message.usage
-            cached = getattr(usage, "cache_read_input_tokens", 0)
-            created = getattr(usage, "cache_creation_input_tokens", 0)
-            if cached or created:
-                print(f"  Cache: {cached} read, {created} created, {usage.input_tokens} input, {usage.output_tokens} output")
-            return message.content[0].text
-        except anthropic.APIStatusError as e:
-            # Don't retry on client errors (4xx) except rate limits (429) and overload (529)
-            if e.status_code not in (429, 529) and 400 <= e.status_code < 500:
-                raise
-            if attempt < max_retries - 1:
-                wait = 2 ** (attempt + 1)
-                print(f"  API error ({e.status_code}), retrying in {wait}s...")
-                time.sleep(wait)
-            else:
-                raise
-        except anthropic.APIConnectionError:
-            if attempt < max_retries - 1:
-                wait = 2 ** (attempt + 1)
-                print(f"  Connection error, retrying in {wait}s...")
-                time.sleep(wait)
-            else:
-                raise
-        except anthropic.APITimeoutError:
-            if attempt < max_retries - 1:
-                wait = 2 ** (attempt + 1)
-                print(f"  API timeout ({api_timeout}s), retrying in {wait}s...")
-                time.sleep(wait)
-            else:
-                raise
+    rounds = 0
+    while True:
+        if tools and rounds >= max_tool_turns:
+            tool_kwargs["tool_choice"] = {"type": "none"}
+        message = api_client.create_message(
+            "main",
+            timeout=api_timeout,
+            max_attempts=max_retries,
+            fallback_model=fallback_model,
+            model=actual_model,
+            max_tokens=actual_max_tokens,
+            system=system_with_cache,
+            messages=messages,
+            **tool_kwargs,
+        )
+        if fallback_model and message.model == fallback_model:
+            actual_model, fallback_model = fallback_model, ""
+        # Log cache performance
+        usage = message.usage
+        cached = getattr(usage, "cache_read_input_tokens", 0)
+        created = getattr(usage, "cache_creation_input_tokens", 0)
+        if cached or created:
+            print(f"  Cache: {cached} read, {created} created, {usage.input_tokens} input, {usage.output_tokens} output")
+
+        tool_uses = [b for b in message.content if b.type == "tool_use"]
+        if not tool_uses or run_tool is None or message.stop_reason != "tool_use":
+            break
+        rounds += 1
+        results = []
+        for block in tool_uses:
+            print(f"  Tool: {block.name}({', '.join(str(v) for v in block.input.values())})")
+            results.append({"type": "tool_result", "tool_use_id": block.id, "content": run_tool(block.name, block.input)})
+        for m in messages[len(history or []) + 1:]:
+            if m["role"] == "user":  # Only the newest tool results keep a breakpoint
+                for block in m["content"]:
+                    block.pop("cache_control", None)
+        results[-1]["cache_control"] = {"type": "ephemeral"}
+        messages.append({"role": "assistant", "content": [b.model_dump(exclude_none=True) for b in message.content]})
+        messages.append({"role": "user", "content": results})
+        _cap_breakpoints(messages, MAX_CACHE_BREAKPOINTS - 1)
+
+    if rounds:
+        print(f"  Tool rounds: {rounds}")
+    return "".join(b.text for b in message.content if b.type == "text")
@@ -13,38 +13,90 @@ from dotenv import load_dotenv
 load_dotenv(_Path(__file__).resolve().parent.parent / ".env")
 del _Path  # Avoid shadowing the real Path import below
 
+import contextvars
+import difflib
+import json
 import re
 import subprocess
 import time
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import yaml
 
+import api_client
+import cassette
+import display_pool
+import gdscript_lint
+import ledger
+import model_router
+import perf_history
+import scheduler
+import telemetry
+import validation_queue
+from batch_queue import BATCH_KINDS, BatchQueue
 from codebase_summarizer import (
     classify_file_domain,
     compress_world_state,
+    extract_signatures,
     summarize_file_contents_tiered,
 )
+from code_index import TOOLS as CODE_TOOLS, CodeIndex
+from context_snapshot import ContextSnapshot
 from cycle_logger import append_cycle, read_cycles
 from godot_runner import (
+    GodotError,
     TestResult,
     capture_baseline_errors,
     pre_validate_gdscript,
-    record_gameplay,
     run_smoke_test,
     test_headless,
+    test_scenes_sharded,
+    validate_resources,
     validate_scene_refs,
 )
-from llm import build_cycle_prompt, call_llm, check_narrative_coherence, estimate_tokens, verify_intent
-from oracle import consult_oracle
+from input_replay import input_dir, run_options
+from llm import (
+    build_curation_request,
+    build_cycle_prompt,
+    build_lore_rollup_request,
+    build_narrative_prompt,
+    build_retry_turn,
+    call_llm,
+    estimate_tokens,
+    get_system_prompt,
+    parse_narrative_reply,
+    verify_cycle,
+)
+from oracle import build_oracle_request, consult_oracle
+from repair import build_repair_request, request_repair
+from scene_graph import impacted
 from strategy import GameCapabilities, determine_strategy, scan_capabilities
 from twitter_poster import is_configured as twitter_configured, post_tweet
+from worlds import World, load_worlds, next_world
 
 ROOT = Path(__file__).resolve().parent.parent
+HOME_ROOT = ROOT  # The orchestrator's own checkout; ROOT follows the world being built
+WORLD = "main"
 CONFIG_PATH = Path(__file__).resolve().parent / "config.yaml"
 
 
+def set_root(root: Path, world: str = "main") -> None:
+    """Point the orchestrator at another world directory (game/, lore/, output/).
+
+    Used to switch between worlds, and by the offline benchmark to run cycles
+    against synthetic trees.
+    """
+    global ROOT, WORLD, LEARNINGS_PATH, ORACLE_QUESTION_PATH, ORACLE_ANSWER_PATH, SOUL_PATH
+    ROOT = root
+    WORLD = world
+    LEARNINGS_PATH = root / "lore" / "learnings.md"
+    ORACLE_QUESTION_PATH = root / "lore" / "oracle_question.md"
+    ORACLE_ANSWER_PATH = root / "lore" / "oracle_answer.md"
+    SOUL_PATH = root / "lore" / "soul.md"
+
+
 def load_config() -> dict:
     with open(CONFIG_PATH, encoding="utf-8") as f:
         return yaml.safe_load(f)
@@ -114,6 +166,7 @@ def parse_response(response: str) -> dict:
     return result
 
 
+@telemetry.traced("apply")
 def apply_files(parsed: dict, game_path: Path) -> list[str]:
     """Write files to disk. Returns list of paths written."""
     written = []
@@ -130,6 +183,7 @@ def apply_files(parsed: dict, game_path: Path) -> list[str]:
     return written
 
 
+@telemetry.traced("git_commit")
 def git_commit(message: str) -> bool:
     """Stage all changes in game/ and commit."""
     try:
@@ -146,6 +200,7 @@ def git_commit(message: str) -> bool:
         return False
 
 
+@telemetry.traced("git_rollback")
 def git_rollback() -> bool:
     """Revert uncommitted changes in game/."""
     try:
@@ -287,6 +342,113 @@ def oracle_question_pending() -> bool:
     return ORACLE_QUESTION_PATH.exists() and not ORACLE_ANSWER_PATH.exists()
 
 
+# ---------------------------------------------------------------------------
+# Batch mode — curation, narrative checks, Oracle and lore rollups at half price
+# ---------------------------------------------------------------------------
+
+def batch_kinds(config: dict) -> set[str]:
+    """Job kinds routed through the Message Batches API (empty when disabled)."""
+    batch_cfg = config.get("batch", {})
+    if not batch_cfg.get("enabled", False):
+        return set()
+    return set(batch_cfg.get("kinds", BATCH_KINDS))
+
+
+def open_batch_queue(config: dict) -> BatchQueue:
+    return BatchQueue(ROOT / config["paths"].get("output", "output") / "batch_queue.json")
+
+
+def merge_curated_learnings(curated: str, since_cycle: int) -> str:
+    """Curated text plus any entries appended since the curation job was queued."""
+    m = re.search(r"<curated_learnings>(.*?)</curated_learnings>", curated, re.DOTALL)
+    curated = (m.group(1) if m else curated).strip() + "\n"
+    for line in read_learnings().splitlines(True):
+        m = re.match(r"- \*\*Cycle (\d+)\*\*", line)
+        if m and int(m.group(1)) >= since_cycle and line not in curated:
+            curated += line
+    return curated
+
+
+def rollup_world_state(world_state_path: Path, days: list[str], passage: str) -> None:
+    """Replace the given chronicle entries with a single <summary> element."""
+    if not passage or not world_state_path.exists():
+        return
+    tree = ET.parse(world_state_path)
+    chronicle = tree.getroot().find("chronicle")
+    if chronicle is None:
+        return
+    rolled = [e for e in chronicle.findall("entry") if e.get("day") in days]
+    if not rolled:
+        return
+    summary = ET.Element("summary", days=f"{rolled[0].get('day')}-{rolled[-1].get('day')}")
+    summary.text = passage.strip()
+    chronicle.insert(list(chronicle).index(rolled[0]), summary)
+    for e in rolled:
+        chronicle.remove(e)
+    tree.write(world_state_path, encoding="unicode", xml_declaration=True)
+    print(f"  Lore rolled up: days {summary.get('days')}")
+
+
+def maybe_queue_lore_rollup(queue: BatchQueue, world_state_path: Path, cycle_num: int, config: dict) -> None:
+    """Queue a rollup of the oldest chronicle entries once the chronicle grows long."""
+    batch_cfg = config.get("batch", {})
+    if queue.has_outstanding("lore_rollup") or not world_state_path.exists():
+        return
+    try:
+        chronicle = ET.parse(world_state_path).getroot().find("chronicle")
+    except ET.ParseError:
+        return
+    entries = chronicle.findall("entry") if chronicle is not None else []
+    if len(entries) <= batch_cfg.get("lore_rollup_over", 30):
+        return
+    oldest = entries[: batch_cfg.get("lore_rollup_size", 10)]
+    params = build_lore_rollup_request(
+        [(e.get("day", "?"), (e.text or "").strip()) for e in oldest],
+        model=batch_cfg.get("model", "claude-haiku-4-5-20251001"),
+    )
+    queue.enqueue("lore_rollup", cycle_num, params, meta={"days": [e.get("day") for e in oldest]})
+
+
+def apply_batch_results(queue: BatchQueue, world_state_path: Path) -> None:
+    """Apply every batch job that has finished since the last cycle.
+
+    A job that failed files the Oracle's silence (so a new question can be
+    asked), goes back in the queue once if it is a curation or rollup, and is
+    only logged if it is a narrative check.
+    """
+    for job, text, error in queue.collect():
+        if error:
+            print(f"  Batch job {job.custom_id} {error}")
+            if job.kind == "oracle":
+                text = f"The Oracle is silent. (batch job {error})"
+            elif job.kind in ("learnings_curation", "lore_rollup") and not job.meta.get("requeued"):
+                queue.enqueue(job.kind, job.cycle, job.params, meta={**job.meta, "requeued": True})
+                continue
+            else:
+                continue
+        print(f"  Batch result: {job.custom_id}")
+        try:
+            if job.kind == "learnings_curation":
+                replace_learnings(merge_curated_learnings(text, job.cycle))
+            elif job.kind == "narrative_check":
+                coherent, feedback = parse_narrative_reply(text)
+                verdict = "ALIGNED" if coherent else "DISSONANT"
+                print(f"  Narrative coherence (cycle {job.cycle}): {verdict}{' — ' + feedback if feedback else ''}")
+            elif job.kind == "oracle":
+                # Only answer if the question on file is still unanswered
+                question, answer = read_oracle_answer()
+                if question and not answer:
+                    ORACLE_ANSWER_PATH.write_text(
+                        f"<!-- Oracle responds to Cycle {job.cycle} -->\n{text}\n",
+                        encoding="utf-8",
+                    )
+                    print(f"  Oracle speaks: {text[:120]}...")
+            elif job.kind == "lore_rollup":
+                rollup_world_state(world_state_path, job.meta.get("days", []), text)
+        except Exception as e:
+            print(f"  Batch result {job.custom_id} not applied: {e}")
+
+
 # ---------------------------------------------------------------------------
 # Soul system
 # ---------------------------------------------------------------------------
@@ -423,6 +585,102 @@ def check_complexity_budget(parsed: dict, config: dict) -> tuple[bool, str]:
     return True, ""
 
 
+# ---------------------------------------------------------------------------
+# Phase 1: Pre-validation
+# ---------------------------------------------------------------------------
+
+@telemetry.traced("pre_validate")
+def pre_validate_changes(written: list[str], game_path: Path, validation_cfg: dict) -> list[GodotError]:
+    """Static checks on the written files before Godot is launched."""
+    pre_errors = []
+    for filepath in written:
+        if filepath.endswith(".gd"):
+            pre_errors.extend(pre_validate_gdscript(Path(filepath)))
+
+    if validation_cfg.get("scene_ref_check", False):
+        pre_errors.extend(validate_scene_refs(game_path, written))
+
+    if (validation_cfg.get("hot_path_lint", {}) or {}).get("reject_new_allocations", False):
+        pre_errors.extend(gdscript_lint.new_allocations(written, game_path))
+
+    return pre_errors
+
+
+# ---------------------------------------------------------------------------
+# In-cycle repair
+# ---------------------------------------------------------------------------
+
+@telemetry.traced("repair")
+def repair_change(
+    parsed: dict, written: list[str], errors: list[GodotError], game_path: Path, config: dict, round_num: int,
+) -> list[str] | None:
+    """One repair round: send the errors and failing files, write the corrected files.
+
+    Returns the cycle's written files including the repaired ones, or None when
+    no repair was made (a patch that breaks the complexity budget is not
+    applied). `parsed["files"]` follows the repair.
+    """
+    route = model_router.repair_route(config, round_num)
+    params = build_repair_request(parsed["action"], parsed["target"], errors, game_path, written, config, route.model)
+    if params is None:
+        print("  Repair skipped — the failing files are too large to resend")
+        return None
+    print(f"  Repair round {round_num} ({route.model}, {len(errors)} errors)...")
+    try:
+        reply = request_repair(params, route.fallback_model)
+    except Exception as e:
+        print(f"  Repair call failed: {e}")
+        return None
+    patch = parse_response(reply)["files"]
+    if not patch:
+        print("  Repair returned no files")
+        return None
+    files = {f["path"].removeprefix("game/"): f for f in parsed["files"]}
+    files.update({f["path"].removeprefix("game/"): f for f in patch})
+    within_budget, budget_reason = check_complexity_budget({**parsed, "files": list(files.values())}, config)
+    if not within_budget:
+        print(f"  Repair rejected — complexity budget exceeded: {budget_reason}")
+        return None
+    patched = apply_files({"files": patch}, game_path)
+    parsed["files"] = list(files.values())
+    return written + [p for p in patched if p not in written]
+
+
+def _count_repair(stage: str, round_num: int, fixed: bool) -> None:
+    print(f"  Repair round {round_num}: {'FIXED' if fixed else 'still failing'}")
+    telemetry.count("godmachine_repair_rounds_total", stage=stage, result="fixed" if fixed else "failed")
+
+
+# ---------------------------------------------------------------------------
+# Lazy context
+# ---------------------------------------------------------------------------
+
+def _report_lazy_context(
+    code_index: CodeIndex, before: api_client.CallStats, prompt: str | list, dump_tokens: int, config: dict,
+) -> None:
+    """Input tokens the tool loop used (cache-weighted) against one call with the tiered source dump."""
+    after = api_client.get_stats().get("main", api_client.CallStats())
+    fresh = after.input_tokens - before.input_tokens
+    cached = after.cache_read_tokens - before.cache_read_tokens
+    written = after.cache_created_tokens - before.cache_created_tokens
+    used = fresh + cached + written
+    billed = round(fresh + cached * 0.1 + written * 1.25)  # Cache reads cost a tenth, writes a quarter more
+    token_budget = config.get("context", {}).get("token_budget", 80000)
+    dump_prompt = min(
+        estimate_tokens(prompt) - estimate_tokens(code_index.prompt_section()) + dump_tokens, token_budget,
+    )
+    dump = dump_prompt + estimate_tokens(get_system_prompt(config))
+    print(
+        f"  Lazy context: {len(code_index.calls)} tool calls, {used} input tokens ({cached} cached, "
+        f"billed like {billed}) vs ~{dump} with the source dump ({dump - billed:+d} saved)"
+    )
+    if code_index.calls:
+        print(f"    {code_index.describe_calls()[:300]}")
+    # Counters only go up; the gauge keeps the signed difference, overspend included
+    telemetry.count("godmachine_context_tokens_saved_total", max(0, dump - billed))
+    telemetry.gauge("godmachine_last_context_tokens_saved", dump - billed)
+
+
 # ---------------------------------------------------------------------------
 # Phase 3: Post-mortem diff capture
 # ---------------------------------------------------------------------------
@@ -444,18 +702,215 @@ def get_last_failed_diff() -> str:
 
 
 # ---------------------------------------------------------------------------
-# Main cycle
+# Conversation continuation for retries
+# ---------------------------------------------------------------------------
+
+def save_exchange(path: Path, cycle_num: int, messages: list[dict], response: str) -> None:
+    """Remember this cycle's conversation so a retry can continue it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "cycle": cycle_num,
+        "messages": messages + [{"role": "assistant", "content": response}],
+    }), encoding="utf-8")
+
+
+def load_continuation(path: Path, previous_cycle: int, max_turns: int = 3) -> list[dict] | None:
+    """Return the previous cycle's conversation, or None if it can't be continued.
+
+    Only the immediately preceding cycle qualifies, and conversations are cut
+    off after `max_turns` prompts so repeated retries don't grow unbounded.
+    """
+    if not path.exists():
+        return None
+    try:
+        exchange = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if exchange.get("cycle") != previous_cycle:
+        return None
+    messages = exchange.get("messages", [])
+    if not messages or sum(1 for m in messages if m["role"] == "user") >= max_turns:
+        return None
+    return messages
+
+
+# ---------------------------------------------------------------------------
+# Intent + narrative verification
+# ---------------------------------------------------------------------------
+
+# Verification runs alongside the resource, scene and perf checks so its latency is hidden
+_VERIFY_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="verify")
+
+
+@telemetry.traced("change_diff")
+def get_change_diff(written: list[str], max_chars: int = 12000) -> str:
+    """Unified diff of the written files against HEAD (new files diff against empty)."""
+    chunks = []
+    for filepath in written:
+        p = Path(filepath)
+        try:
+            rel = p.relative_to(ROOT).as_posix()
+            after = p.read_text(encoding="utf-8").splitlines(keepends=True)
+        except Exception:
+            continue
+        head = subprocess.run(
+            ["git", "show", f"HEAD:{rel}"],
+            cwd=ROOT, capture_output=True, text=True, encoding="utf-8", errors="replace",
+        )
+        before = head.stdout.splitlines(keepends=True) if head.returncode == 0 else []
+        chunks.append("".join(difflib.unified_diff(
+            before, after,
+            fromfile=f"a/{rel}" if before else "/dev/null", tofile=f"b/{rel}",
+        )))
+    diff = "\n".join(c for c in chunks if c)
+    if len(diff) > max_chars:
+        diff = diff[:max_chars] + "\n... (diff truncated)"
+    return diff
+
+
+def get_change_signatures(written: list[str]) -> str:
+    """GDScript signatures of the written .gd files, for the verification payload."""
+    parts = []
+    for filepath in written:
+        p = Path(filepath)
+        if p.suffix != ".gd" or not p.exists():
+            continue
+        rel = p.relative_to(ROOT).as_posix()
+        parts.append(f"# {rel}\n{extract_signatures(p.read_text(encoding='utf-8'))}")
+    return "\n\n".join(parts)
+
+
+# ---------------------------------------------------------------------------
+# Remote validation
+# ---------------------------------------------------------------------------
+
+def validate_remotely(
+    written: list[str], config: dict, quit_after: int,
+) -> validation_queue.ValidationOutcome | None:
+    """Ship the change set to a validation worker. None means test locally instead."""
+    validation_cfg = config.get("validation", {})
+    remote_cfg = validation_cfg.get("remote", {})
+    root = ROOT.resolve()
+    try:
+        base_commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        files = {
+            Path(p).resolve().relative_to(root).as_posix(): Path(p).read_text(encoding="utf-8")
+            for p in written
+        }
+    except (subprocess.CalledProcessError, ValueError, OSError) as e:
+        print(f"  Remote validation skipped ({e})")
+        return None
+
+    job = validation_queue.ValidationJob(
+        repo=remote_cfg.get("repo") or str(root),
+        base_commit=base_commit,
+        files=files,
+        game_dir=config["paths"].get("game", "game"),
+        quit_after=quit_after,
+        smoke_test=validation_cfg.get("smoke_test", False),
+        resource_check=validation_cfg.get("resource_check", False),
+        timeout=remote_cfg.get("godot_timeout", 10),
+    )
+    print(f"  Testing on a validation worker ({remote_cfg['broker']})...")
+    try:
+        with telemetry.span("remote_validate") as attrs:
+            outcome = validation_queue.validate(remote_cfg["broker"].rstrip("/"), job, remote_cfg.get("timeout", 300))
+            attrs["worker"] = outcome.worker
+    except validation_queue.ValidationUnavailable as e:
+        print(f"  Remote validation unavailable: {e}")
+        return None
+    print(f"  Validated by {outcome.worker} in {outcome.seconds:.1f}s ({outcome.baseline_count} baseline errors filtered)")
+    return outcome
+
+
+# ---------------------------------------------------------------------------
+# Headless test
+# ---------------------------------------------------------------------------
+
+def test_change(
+    written: list[str], config: dict, godot_exe: str, game_path: Path, quit_after: int, baseline_errors: set,
+) -> tuple[validation_queue.ValidationOutcome | None, TestResult]:
+    """Headless test of the written change, on a validation worker when one is configured."""
+    remote_cfg = config.get("validation", {}).get("remote", {}) or {}
+    remote_enabled = remote_cfg.get("enabled", False) and bool(remote_cfg.get("broker"))
+    remote = validate_remotely(written, config, quit_after) if remote_enabled else None
+    if remote is not None:
+        return remote, remote.test
+    if remote_enabled and not remote_cfg.get("fallback_local", True):
+        return None, TestResult(success=False, raw_output="Remote validation unavailable")
+    print("  Testing headless...")
+    return None, test_headless(godot_exe, game_path, quit_after=quit_after, baseline_errors=baseline_errors)
+
+
+# ---------------------------------------------------------------------------
+# Background Oracle — answers land in oracle_answer.md whenever they arrive
 # ---------------------------------------------------------------------------
 
+_ORACLE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="oracle")
+# Question file -> (future, start, cycle) of the consultation answering it
+_oracle_consultations: dict[Path, tuple] = {}
+
+
+def _consult_oracle_into(question_path: Path, answer_path: Path, cycle_num: int, consult: dict) -> bool:
+    """Consult the Oracle and file the answer, unless the question was withdrawn meanwhile.
+
+    Takes the exchange paths explicitly: by the time a background answer
+    arrives the orchestrator may have switched to another world.
+    """
+    asked = question_path.read_text(encoding="utf-8") if question_path.exists() else ""
+    answer = consult_oracle(**consult)
+    current = question_path.read_text(encoding="utf-8") if question_path.exists() else ""
+    if current != asked or answer_path.exists():
+        return False
+    tmp = answer_path.with_suffix(".tmp")
+    tmp.write_text(f"<!-- Oracle responds to Cycle {cycle_num} -->\n{answer}\n", encoding="utf-8")
+    tmp.replace(answer_path)  # The next cycle never reads half an answer
+    print(f"  Oracle speaks: {answer[:120]}...")
+    return True
+
+
+def reap_oracle_consultations(config: dict) -> None:
+    """Report finished background consultations and withdraw ones past `oracle.background_timeout`.
+
+    A withdrawn question is removed so the model can ask again; its answer is
+    dropped if it still arrives.
+    """
+    oracle_cfg = config.get("oracle", {})
+    limit = oracle_cfg.get("background_timeout", oracle_cfg.get("api_timeout", 120) * 2)
+    for question_path, (future, started, cycle_num) in list(_oracle_consultations.items()):
+        if future.done():
+            del _oracle_consultations[question_path]
+            error = future.exception()
+            if error is not None:
+                print(f"  Oracle consultation (cycle {cycle_num}) failed: {error}")
+            telemetry.count(
+                "godmachine_oracle_consultations_total",
+                result="failed" if error is not None else "answered" if future.result() else "dropped",
+            )
+        elif time.monotonic() - started > limit:
+            del _oracle_consultations[question_path]
+            future.cancel()
+            question_path.unlink(missing_ok=True)
+            print(f"  Oracle consultation (cycle {cycle_num}) timed out after {limit:.0f}s — question withdrawn")
+            telemetry.count("godmachine_oracle_consultations_total", result="timeout")
+
+
 def _maybe_consult_oracle(
     parsed: dict | None,
     cycle_num: int,
     config: dict,
-    world_state_xml: str,
-    cycle_log_xml: str,
-    learnings: str,
+    snapshot: ContextSnapshot,
+    prefix_sent_at: float | None = None,
+    batch_queue: BatchQueue | None = None,
 ) -> None:
-    """Consult the Oracle if this is an eligible cycle and a question was asked."""
+    """Consult the Oracle if this is an eligible cycle and a question was asked.
+
+    With a batch queue, the consultation is queued and answered in a later cycle.
+    `prefix_sent_at` is when the main call sent the snapshot as its cached prefix;
+    a consultation soon after shares that prefix.
+    """
     oracle_cfg = config.get("oracle", {})
     if not oracle_cfg.get("enabled", False):
         return
@@ -471,25 +926,69 @@ def _maybe_consult_oracle(
         return
 
     write_oracle_question(question, cycle_num)
+    if batch_queue is not None:
+        # Batches finish long after the cache entry expires
+        batch_queue.enqueue("oracle", cycle_num, build_oracle_request(question, snapshot, config))
+        return
+
+    main_model = config.get("prompt", {}).get("model", "claude-sonnet-4-5-20250929")
+    share_prefix = (
+        prefix_sent_at is not None
+        and oracle_cfg.get("share_context", True)
+        and oracle_cfg.get("model", "claude-sonnet-4-5-20250929") == main_model
+        and time.monotonic() - prefix_sent_at < oracle_cfg.get("share_within", 240)
+    )
+    if share_prefix:
+        print(f"  Oracle shares the cycle's context prefix ({snapshot.digest}, ~{snapshot.tokens()} tokens)")
+    consult = dict(question=question, snapshot=snapshot, config=config, share_prefix=share_prefix)
+    exchange = (ORACLE_QUESTION_PATH, ORACLE_ANSWER_PATH)
+    # Cassette tapes are per cycle, so recorded and replayed cycles consult in line
+    if oracle_cfg.get("background", True) and not (cassette.recording() or cassette.replaying()):
+        print(f"  Consulting the Oracle in the background...")
+        future = _ORACLE_POOL.submit(_consult_oracle_into, *exchange, cycle_num, consult)
+        _oracle_consultations[ORACLE_QUESTION_PATH] = (future, time.monotonic(), cycle_num)
+        return
+
     print(f"  Consulting the Oracle...")
     try:
-        answer = consult_oracle(
-            question=question,
-            world_state=world_state_xml,
-            learnings=learnings,
-            cycle_log=cycle_log_xml,
-            config=config,
-        )
-        ORACLE_ANSWER_PATH.parent.mkdir(parents=True, exist_ok=True)
-        ORACLE_ANSWER_PATH.write_text(
-            f"<!-- Oracle responds to Cycle {cycle_num} -->\n{answer}\n",
-            encoding="utf-8",
-        )
-        print(f"  Oracle speaks: {answer[:120]}...")
+        _consult_oracle_into(*exchange, cycle_num, consult)
     except Exception as e:
         print(f"  Oracle consultation failed: {e}")
 
 
+# ---------------------------------------------------------------------------
+# Main cycle
+# ---------------------------------------------------------------------------
+
+def _count_failure(category: str) -> None:
+    telemetry.count("godmachine_cycles_total", result="fail")
+    telemetry.count("godmachine_cycle_failures_total", category=category)
+    scheduler.record_outcome("fail", category)
+    model_router.record_outcome(False)
+
+
+def _reject(category: str, error: str, parsed: dict, cycle_num: int, config: dict) -> None:
+    """Roll back a change that failed a check and record the failure.
+
+    The diff is kept for the next cycle's prompt, the change's learning is
+    logged as a failure, and the cycle log gets `error`.
+    """
+    diff = get_last_failed_diff()
+    if diff:
+        diff_file = ROOT / "lore" / ".last_failed_diff"
+        diff_file.parent.mkdir(parents=True, exist_ok=True)
+        diff_file.write_text(diff, encoding="utf-8")
+
+    git_rollback()
+    append_learning(parsed.get("learning", ""), cycle_num, parsed["action"], "fail")
+    _count_failure(category)
+    append_cycle(
+        ROOT / config["paths"]["cycle_log"], ROOT / config["paths"]["cycle_archive"],
+        cycle_num=cycle_num, action=parsed["action"], target=parsed["target"],
+        result="fail", error=error,
+    )
+
+
 def run_cycle(config: dict) -> None:
     """Execute one GODMACHINE cycle."""
     game_path = ROOT / config["paths"].get("game", "game")
@@ -503,6 +1002,19 @@ def run_cycle(config: dict) -> None:
     # 1. Read state
     cycles = read_cycles(cycle_log_path)
     cycle_num = get_cycle_num(cycles)
+    cassette.begin_cycle(cycle_num)
+    ledger.begin_cycle(cycle_num, WORLD)
+    telemetry.begin_cycle(cycle_num)
+
+    # Apply batch results that finished since the last cycle
+    deferred = batch_kinds(config)
+    batch_queue = open_batch_queue(config) if deferred else None
+    if batch_queue is not None:
+        apply_batch_results(batch_queue, world_state_path)
+        if "lore_rollup" in deferred:
+            maybe_queue_lore_rollup(batch_queue, world_state_path, cycle_num, config)
+    # Background Oracle consultations: report the finished, withdraw the overdue
+    reap_oracle_consultations(config)
 
     # Scan capabilities (Phase 2)
     capabilities = scan_capabilities(game_path)
@@ -520,27 +1032,51 @@ def run_cycle(config: dict) -> None:
     print(f"{'='*60}")
 
     # 2. Build context (tiered)
-    cycle_log_xml = read_xml_text(cycle_log_path)
-    world_state_xml = read_xml_text(world_state_path)
-    world_state_xml = compress_world_state(world_state_xml)
+    with telemetry.span("build_context"):
+        cycle_log_xml = read_xml_text(cycle_log_path)
+        world_state_xml = read_xml_text(world_state_path)
+        world_state_xml = compress_world_state(world_state_xml)
+
+        focus_domains = _infer_focus_domains(cycles, strategy)
+        file_contents = summarize_file_contents_tiered(
+            game_path, focus_domains=focus_domains,
+        )
 
-    focus_domains = _infer_focus_domains(cycles, strategy)
-    file_contents = summarize_file_contents_tiered(
-        game_path, focus_domains=focus_domains,
-    )
+        # Lazy context: a compact index in the prompt, sources on request through tools
+        context_cfg = config.get("context", {})
+        lazy_cfg = context_cfg.get("lazy", {}) or {}
+        code_index = None
+        dump_tokens = 0
+        if context_cfg.get("mode", "tiered") == "lazy":
+            code_index = CodeIndex(game_path, max_file_chars=lazy_cfg.get("max_file_chars", 20000))
+            dump_tokens = estimate_tokens(file_contents)
+            file_contents = code_index.prompt_section()
 
     last_error = ""
     last_diff = ""
+    failed_diff = ""
     if cycles and cycles[-1].get("result") == "fail":
         last_error = cycles[-1].get("error", "")
-    # Load saved diff for retry (if it exists)
+    # Load saved diff for retry (if it exists); the router sizes the repair by it
     diff_file = ROOT / "lore" / ".last_failed_diff"
-    if last_error and config.get("prompt", {}).get("post_mortem_diff", False):
-        if diff_file.exists():
-            last_diff = diff_file.read_text(encoding="utf-8")
+    if last_error and diff_file.exists():
+        failed_diff = diff_file.read_text(encoding="utf-8")
+        if config.get("prompt", {}).get("post_mortem_diff", False):
+            last_diff = failed_diff
 
     learnings = read_learnings()
 
+    # Hot-path lint findings get their own prompt section, outside the learnings
+    # a curation cycle rewrites
+    lint_cfg = validation_cfg.get("hot_path_lint", {}) or {}
+    lint_notes = ""
+    if lint_cfg.get("enabled", False):
+        lint_findings = gdscript_lint.lint_project(game_path)
+        lint_notes = gdscript_lint.prompt_section(
+            lint_findings, focus_domains, lint_cfg.get("prompt_findings", 8),
+        )
+        print(f"  Hot-path lint: {len(lint_findings)} findings")
+
     # Oracle answer injection
     oracle_cfg = config.get("oracle", {})
     oracle_context = ""
@@ -564,6 +1100,14 @@ def run_cycle(config: dict) -> None:
     curate_every = learnings_cfg.get("curate_every", 10)
     learnings_token_budget = learnings_cfg.get("max_token_budget", 4000)
     should_curate = curate_every > 0 and cycle_num % curate_every == 0 and learnings
+    if should_curate and "learnings_curation" in deferred:
+        if not batch_queue.has_outstanding("learnings_curation"):
+            batch_queue.enqueue("learnings_curation", cycle_num, build_curation_request(
+                learnings,
+                model=config.get("prompt", {}).get("model", "claude-sonnet-4-5-20250929"),
+                token_budget=learnings_token_budget,
+            ))
+        should_curate = False
 
     # Determine if Oracle is available for asking
     oracle_available = False
@@ -571,52 +1115,128 @@ def run_cycle(config: dict) -> None:
         min_between = oracle_cfg.get("min_cycles_between", 5)
         oracle_available = cycle_num % min_between == 0
 
-    prompt = build_cycle_prompt(
-        strategy=strategy,
-        strategy_explanation=explanation,
+    # A retry continues the previous conversation: its prompt and response are a
+    # cached prefix and only the error report is new. Fresh context (an Oracle
+    # answer, a curation request) needs the full prompt instead.
+    prompt_cfg = config.get("prompt", {})
+    exchange_path = ROOT / config["paths"].get("output", "output") / "last_exchange.json"
+    history = None
+    if (
+        strategy == "retry" and last_error and prompt_cfg.get("conversation_retries", False)
+        and not oracle_context and not should_curate
+    ):
+        history = load_continuation(
+            exchange_path, cycle_num - 1, prompt_cfg.get("max_conversation_turns", 3),
+        )
+
+    # One immutable snapshot of the cycle's context; the main call and the Oracle
+    # render the same prefix from it, so the Oracle can read it from the cache
+    snapshot = ContextSnapshot(
+        cycle_num=cycle_num,
         cycle_log_xml=cycle_log_xml,
         world_state_xml=world_state_xml,
-        file_contents=file_contents,
-        cycle_num=cycle_num,
-        last_error=last_error,
-        capabilities_summary=capabilities.summary(),
-        last_diff=last_diff,
-        learnings=learnings,
-        token_budget=token_budget,
-        curate_learnings=should_curate,
-        learnings_token_budget=learnings_token_budget,
-        oracle_context=oracle_context,
-        oracle_available=oracle_available,
-        whispers=whispers,
         soul_state=soul_state,
+        capabilities=capabilities.summary(),
+        learnings=learnings,
+        lint_notes=lint_notes,
+        file_contents=file_contents,
     )
 
+    if history:
+        print("  Retry continues the previous conversation (cached prefix).")
+        prompt = build_retry_turn(cycle_num, explanation, last_error)
+    else:
+        instructions = build_cycle_prompt(
+            strategy=strategy,
+            strategy_explanation=explanation,
+            cycle_num=cycle_num,
+            last_error=last_error,
+            last_diff=last_diff,
+            curate_learnings=should_curate,
+            learnings_token_budget=learnings_token_budget,
+            oracle_context=oracle_context,
+            oracle_available=oracle_available,
+            whispers=whispers,
+        )
+        snapshot = snapshot.fit(token_budget, estimate_tokens(instructions))
+        prompt = snapshot.blocks(instructions)
+
     if should_curate:
         print("  Curation cycle — learnings compression requested.")
 
     print(f"  Prompt tokens: ~{estimate_tokens(prompt)}")
 
-    # 2.5 Capture baseline errors (before LLM changes anything)
-    print("  Capturing error baseline...")
-    baseline_errors = capture_baseline_errors(godot_exe, game_path)
-    if baseline_errors:
-        print(f"  Baseline: {len(baseline_errors)} pre-existing errors (will be filtered)")
+    # 2.5 Capture baseline errors (before LLM changes anything).
+    #     Remote workers capture their own; the local one is only kept for falling back.
+    remote_cfg = validation_cfg.get("remote", {}) or {}
+    remote_enabled = remote_cfg.get("enabled", False) and bool(remote_cfg.get("broker"))
+    baseline_errors = set()
+    if not remote_enabled or remote_cfg.get("fallback_local", True):
+        print("  Capturing error baseline...")
+        baseline_errors = capture_baseline_errors(godot_exe, game_path)
+        if baseline_errors:
+            print(f"  Baseline: {len(baseline_errors)} pre-existing errors (will be filtered)")
+
+    # 2.6 Performance baseline for the regression gate — the last commit's stored
+    #     benchmark, or a fresh one while the tree is still at that commit
+    perf_cfg = config.get("perf", {})
+    gate_cfg = perf_cfg.get("gate", {}) or {}
+    autopilot_cfg = config.get("autopilot", {})
+    perf_baseline = {}
+    perf_candidate = []
+    if gate_cfg.get("enabled", False):
+        perf_path = perf_history.perf_dir(ROOT, config)
+        base_commit = perf_history.head_commit(ROOT)
+        perf_baseline = perf_history.load(perf_path, base_commit)
+        if not perf_baseline:
+            print("  Benchmarking performance baseline...")
+            baseline_runs = perf_history.run_benchmarks(
+                godot_exe, game_path, perf_cfg, autopilot_cfg, input_dir(ROOT, config),
+            )
+            perf_history.save(perf_path, base_commit, baseline_runs)
+            perf_baseline = {r.scene: r for r in baseline_runs}
 
     # 3. Call LLM — wrapped in try/finally so the Oracle runs at cycle end
     #    regardless of success or failure
-    print("  Calling Claude...")
+    route = model_router.choose(config, strategy, last_error, failed_diff, cycle_num)
+    print(f"  Calling Claude ({route.model}, {route.name} route: {route.reason})...")
     parsed = None
+    prefix_sent_at = None
     try:
+        main_before = api_client.get_stats().get("main", api_client.CallStats())
+        if history is None and code_index is None and route.name == "primary":
+            # Lazy mode sends tools, which are part of the prefix the Oracle would need to match;
+            # the cheap route caches under another model
+            prefix_sent_at = time.monotonic()
+        call_start = time.monotonic()
         try:
-            response = call_llm(prompt, config=config)
+            if code_index is not None:
+                response = call_llm(
+                    prompt, model=route.model, fallback_model=route.fallback_model,
+                    config=config, history=history,
+                    tools=CODE_TOOLS, run_tool=code_index.run_tool,
+                    max_tool_turns=lazy_cfg.get("max_tool_turns", 6),
+                )
+            else:
+                response = call_llm(
+                    prompt, model=route.model, fallback_model=route.fallback_model,
+                    config=config, history=history,
+                )
         except Exception as e:
             print(f"  LLM call failed: {e}")
+            _count_failure("llm_call")
             append_cycle(
                 cycle_log_path, archive_path,
                 cycle_num=cycle_num, action="llm_call", target="api",
                 result="fail", error=str(e),
             )
             return
+        finally:
+            model_router.record_latency(route, time.monotonic() - call_start)
+
+        save_exchange(exchange_path, cycle_num, (history or []) + [{"role": "user", "content": prompt}], response)
+        if code_index is not None:
+            _report_lazy_context(code_index, main_before, prompt, dump_tokens, config)
 
         # 4. Parse response
         parsed = parse_response(response)
@@ -627,6 +1247,7 @@ def run_cycle(config: dict) -> None:
 
         if not parsed["files"]:
             print("  No files in response — skipping.")
+            _count_failure("no_files")
             append_cycle(
                 cycle_log_path, archive_path,
                 cycle_num=cycle_num, action=parsed["action"], target=parsed["target"],
@@ -638,6 +1259,7 @@ def run_cycle(config: dict) -> None:
         within_budget, budget_reason = check_complexity_budget(parsed, config)
         if not within_budget:
             print(f"  Complexity budget exceeded: {budget_reason}")
+            _count_failure("complexity_budget")
             append_cycle(
                 cycle_log_path, archive_path,
                 cycle_num=cycle_num, action=parsed["action"], target=parsed["target"],
@@ -649,130 +1271,184 @@ def run_cycle(config: dict) -> None:
         print("  Applying changes...")
         written = apply_files(parsed, game_path)
 
-        # 5.5 Pre-validation (Phase 1)
+        # 5.5 Pre-validation (Phase 1), with in-cycle repair rounds shared with the test
+        repair_cfg = validation_cfg.get("repair", {}) or {}
+        max_repairs = repair_cfg.get("rounds", 2) if repair_cfg.get("enabled", False) else 0
+        repairs = 0
         if validation_cfg.get("pre_validate", False):
             print("  Pre-validating...")
-            pre_errors = []
-            for filepath in written:
-                if filepath.endswith(".gd"):
-                    pre_errors.extend(pre_validate_gdscript(Path(filepath)))
-
-            if validation_cfg.get("scene_ref_check", False):
-                pre_errors.extend(validate_scene_refs(game_path, written))
+            pre_errors = pre_validate_changes(written, game_path, validation_cfg)
+            while pre_errors and repairs < max_repairs:
+                repairs += 1
+                patched = repair_change(parsed, written, pre_errors, game_path, config, repairs)
+                if patched is None:
+                    break
+                written = patched
+                pre_errors = pre_validate_changes(written, game_path, validation_cfg)
+                _count_repair("pre_validation", repairs, not pre_errors)
 
             if pre_errors:
                 error_msg = "\n".join(str(e) for e in pre_errors[:validation_cfg.get("max_errors_in_prompt", 5)])
                 print(f"  Pre-validation FAILED:\n{error_msg}")
-
-                # Save diff before rollback
-                diff = get_last_failed_diff()
-                if diff:
-                    diff_file.parent.mkdir(parents=True, exist_ok=True)
-                    diff_file.write_text(diff, encoding="utf-8")
-
-                git_rollback()
-                append_learning(parsed.get("learning", ""), cycle_num, parsed["action"], "fail")
-                append_cycle(
-                    cycle_log_path, archive_path,
-                    cycle_num=cycle_num, action=parsed["action"], target=parsed["target"],
-                    result="fail", error=error_msg,
-                )
+                _reject("pre_validation", error_msg, parsed, cycle_num, config)
                 return
 
         # 6. Test headless
         quit_after = validation_cfg.get("extended_quit_after", 2) if validation_cfg.get("smoke_test", False) else 2
-        print("  Testing headless...")
-        test_result = test_headless(godot_exe, game_path, quit_after=quit_after, baseline_errors=baseline_errors)
+        remote, test_result = test_change(written, config, godot_exe, game_path, quit_after, baseline_errors)
         print(f"  Test result: {'PASS' if test_result.success else 'FAIL'}")
+        while not test_result.success and test_result.errors and repairs < max_repairs:
+            repairs += 1
+            patched = repair_change(parsed, written, test_result.errors, game_path, config, repairs)
+            if patched is None:
+                break
+            written = patched
+            pre_errors = []
+            if validation_cfg.get("pre_validate", False):
+                pre_errors = pre_validate_changes(written, game_path, validation_cfg)
+            if pre_errors:
+                test_result = TestResult(success=False, raw_output="", errors=pre_errors)
+            else:
+                remote, test_result = test_change(written, config, godot_exe, game_path, quit_after, baseline_errors)
+            _count_repair("godot_test", repairs, test_result.success)
 
         if not test_result.success:
             error_summary = test_result.error_summary(
                 max_errors=validation_cfg.get("max_errors_in_prompt", 5)
             )
             print(f"  Errors:\n{error_summary}")
+            _reject("godot_test", error_summary, parsed, cycle_num, config)
+            return
 
-            # Save diff before rollback
-            diff = get_last_failed_diff()
-            if diff:
-                diff_file.parent.mkdir(parents=True, exist_ok=True)
-                diff_file.write_text(diff, encoding="utf-8")
+        # 6.2 Start merged intent + narrative verification (cheap Haiku call).
+        #     Started once the (possibly repaired) change has passed its test, so a
+        #     failed or repaired change never pays for a verdict; it only reads the
+        #     diff captured here, so it can run while the later checks do.
+        intent_enabled = validation_cfg.get("intent_check", False)
+        narrative_enabled = validation_cfg.get("narrative_check", False) and bool(soul_state)
+        narrative_deferred = narrative_enabled and "narrative_check" in deferred
+        if narrative_deferred:
+            narrative_enabled = False
+        verify_future = None
+        if intent_enabled or narrative_enabled:
+            verify_kwargs = dict(
+                action=parsed["action"],
+                target=parsed["target"],
+                diff=get_change_diff(written),
+                signatures=get_change_signatures(written),
+                soul_state=snapshot.soul_state,
+                lore_entry=parsed.get("lore_entry", ""),
+                patch_notes=parsed.get("patch_notes", ""),
+                check_intent=intent_enabled,
+                check_narrative=narrative_enabled,
+                model=validation_cfg.get("intent_check_model", "claude-haiku-4-5-20251001"),
+                cache_path=ROOT / config["paths"].get("output", "output") / "verdict_cache.json",
+            )
+            if validation_cfg.get("verify_concurrently", True):
+                # Carry the cycle span over so the verify span nests under it
+                verify_future = _VERIFY_POOL.submit(
+                    contextvars.copy_context().run, verify_cycle, **verify_kwargs,
+                )
 
-            git_rollback()
-            append_learning(parsed.get("learning", ""), cycle_num, parsed["action"], "fail")
-            append_cycle(
-                cycle_log_path, archive_path,
-                cycle_num=cycle_num, action=parsed["action"], target=parsed["target"],
-                result="fail", error=error_summary,
+        # 6.3 Batch resource validation — changed scenes/scripts and everything depending on them
+        impact_cfg = validation_cfg.get("impact_test", {}) or {}
+        needs_impact = validation_cfg.get("resource_check", False) or impact_cfg.get("enabled", False)
+        resources = impacted(game_path, written) if needs_impact else []
+        if validation_cfg.get("resource_check", False):
+            if remote is not None and remote.resources is not None:
+                resource_result = remote.resources
+            else:
+                print(f"  Validating {len(resources)} resources...")
+                resource_result, _ = validate_resources(
+                    godot_exe, game_path, resources, baseline_errors=baseline_errors,
+                )
+            if not resource_result.success:
+                resource_error = resource_result.error_summary(
+                    max_errors=validation_cfg.get("max_errors_in_prompt", 5)
+                )
+                print(f"  Resource check FAILED:\n{resource_error}")
+                _reject("resource_check", f"Resource check: {resource_error}", parsed, cycle_num, config)
+                return
+
+        # 6.4 Impacted scenes, run in parallel shards
+        scenes = [r for r in resources if r.endswith(".tscn")]
+        if impact_cfg.get("enabled", False) and scenes:
+            print(f"  Testing {len(scenes)} impacted scenes...")
+            scene_result, shards = test_scenes_sharded(
+                godot_exe, game_path, scenes,
+                shards=impact_cfg.get("shards", 0),
+                cassette_shards=impact_cfg.get("cassette_shards", 4),
+                frames=impact_cfg.get("frames", 5),
+                timeout=impact_cfg.get("timeout", 30),
+                baseline_errors=baseline_errors,
             )
-            return
+            for shard in shards:
+                print(f"    Shard {shard.index}: {len(shard.scenes)} scenes in {shard.seconds:.1f}s — {'PASS' if shard.success else 'FAIL'}")
+            if not scene_result.success:
+                scene_error = scene_result.error_summary(
+                    max_errors=validation_cfg.get("max_errors_in_prompt", 5)
+                )
+                print(f"  Scene tests FAILED:\n{scene_error}")
+                _reject("scene_test", f"Scene test: {scene_error}", parsed, cycle_num, config)
+                return
 
         # 6.5 Optional smoke test (Phase 2)
         if validation_cfg.get("smoke_test", False):
-            print("  Running smoke test...")
-            smoke_result = run_smoke_test(godot_exe, game_path)
+            if remote is not None and remote.smoke is not None:
+                smoke_result = remote.smoke
+            else:
+                print("  Running smoke test...")
+                smoke_result = run_smoke_test(godot_exe, game_path)
             if not smoke_result.success:
                 smoke_error = smoke_result.error_summary()
                 print(f"  Smoke test FAILED:\n{smoke_error}")
-
-                diff = get_last_failed_diff()
-                if diff:
-                    diff_file.parent.mkdir(parents=True, exist_ok=True)
-                    diff_file.write_text(diff, encoding="utf-8")
-
-                git_rollback()
-                append_learning(parsed.get("learning", ""), cycle_num, parsed["action"], "fail")
-                append_cycle(
-                    cycle_log_path, archive_path,
-                    cycle_num=cycle_num, action=parsed["action"], target=parsed["target"],
-                    result="fail", error=f"Smoke test: {smoke_error}",
-                )
+                _reject("smoke_test", f"Smoke test: {smoke_error}", parsed, cycle_num, config)
                 return
 
-        # 6.7 Intent verification (cheap Haiku call)
-        if validation_cfg.get("intent_check", False):
-            print("  Verifying intent...")
-            # Build a dict of path -> content for the files written
-            files_for_check = {
-                f["path"]: f["content"] for f in parsed["files"]
-            }
-            intent_model = validation_cfg.get("intent_check_model", "claude-haiku-4-5-20251001")
-            intent_passed, intent_reason = verify_intent(
-                parsed["action"], parsed["target"], files_for_check, model=intent_model,
+        # 6.6 Performance regression gate against the last commit
+        if gate_cfg.get("enabled", False):
+            print("  Benchmarking candidate performance...")
+            perf_candidate = perf_history.run_benchmarks(
+                godot_exe, game_path, perf_cfg, autopilot_cfg, input_dir(ROOT, config),
             )
-            if not intent_passed:
-                print(f"  Intent check FAILED: {intent_reason}")
-
-                diff = get_last_failed_diff()
-                if diff:
-                    diff_file.parent.mkdir(parents=True, exist_ok=True)
-                    diff_file.write_text(diff, encoding="utf-8")
-
-                git_rollback()
-                append_learning(parsed.get("learning", ""), cycle_num, parsed["action"], "fail")
-                append_cycle(
-                    cycle_log_path, archive_path,
-                    cycle_num=cycle_num, action=parsed["action"], target=parsed["target"],
-                    result="fail", error=f"Intent check: {intent_reason}",
+            perf_result = perf_history.gate(perf_baseline, perf_candidate, gate_cfg)
+            if not perf_result.success:
+                perf_error = perf_result.error_summary(
+                    max_errors=validation_cfg.get("max_errors_in_prompt", 5)
                 )
+                print(f"  Performance gate FAILED:\n{perf_error}")
+                _reject("performance", f"Performance: {perf_error}", parsed, cycle_num, config)
                 return
-            print(f"  Intent check PASSED{': ' + intent_reason if intent_reason else ''}")
-
-        # 6.8 Narrative coherence check (cheap Haiku call, non-blocking)
-        if validation_cfg.get("narrative_check", False) and soul_state:
-            print("  Checking narrative coherence...")
-            narr_model = validation_cfg.get("intent_check_model", "claude-haiku-4-5-20251001")
-            coherent, narr_feedback = check_narrative_coherence(
-                soul_state=soul_state,
-                action=parsed["action"],
-                target=parsed["target"],
-                lore_entry=parsed.get("lore_entry", ""),
-                patch_notes=parsed.get("patch_notes", ""),
-                model=narr_model,
-            )
-            if coherent:
-                print(f"  Narrative coherence: ALIGNED{' — ' + narr_feedback if narr_feedback else ''}")
-            else:
-                print(f"  Narrative coherence: DISSONANT — {narr_feedback}")
+            print("  Performance gate PASSED")
+
+        # 6.7 Intent verification + 6.8 narrative coherence (merged call)
+        if intent_enabled or narrative_enabled:
+            print("  Verifying intent and narrative...")
+            verdict = verify_future.result() if verify_future else verify_cycle(**verify_kwargs)
+            if verdict.cached:
+                print("  Verdicts reused from cache.")
+            if intent_enabled:
+                if not verdict.intent_passed:
+                    print(f"  Intent check FAILED: {verdict.intent_reason}")
+                    _reject("intent_check", f"Intent check: {verdict.intent_reason}", parsed, cycle_num, config)
+                    return
+                print(f"  Intent check PASSED{': ' + verdict.intent_reason if verdict.intent_reason else ''}")
+            # Narrative coherence is non-blocking — dissonance is noted, not punished
+            if narrative_enabled:
+                if verdict.coherent:
+                    print(f"  Narrative coherence: ALIGNED{' — ' + verdict.narrative_feedback if verdict.narrative_feedback else ''}")
+                else:
+                    print(f"  Narrative coherence: DISSONANT — {verdict.narrative_feedback}")
+
+        if narrative_deferred:
+            batch_queue.enqueue("narrative_check", cycle_num, {
+                "model": validation_cfg.get("intent_check_model", "claude-haiku-4-5-20251001"),
+                "max_tokens": 256,
+                "messages": [{"role": "user", "content": build_narrative_prompt(
+                    snapshot.soul_state, parsed["action"], parsed["target"],
+                    parsed.get("lore_entry", ""), parsed.get("patch_notes", ""),
+                )}],
+            })
 
         # 7. Success — update lore/learnings first, then commit everything together
         # Clean up saved diff on success
@@ -798,8 +1474,27 @@ def run_cycle(config: dict) -> None:
 
         if not git_commit(f"Cycle {cycle_num}: {parsed['action']} {parsed['target']}"):
             print("  Commit failed — rolling back.")
+            _count_failure("commit")
             git_rollback()
             return
+        telemetry.count("godmachine_cycles_total", result="success")
+        scheduler.record_outcome("success")
+        model_router.record_outcome(True)
+
+        # 7.5 Benchmark the new commit for the performance history (non-blocking).
+        #     The gate's candidate run already measured exactly this tree.
+        if perf_candidate or (
+            perf_cfg.get("enabled", False) and cycle_num % max(1, perf_cfg.get("every_n_cycles", 1)) == 0
+        ):
+            if not perf_candidate:
+                print("  Benchmarking performance...")
+            perf_results = perf_candidate or perf_history.run_benchmarks(
+                godot_exe, game_path, perf_cfg, autopilot_cfg, input_dir(ROOT, config),
+            )
+            perf_history.save(
+                perf_history.perf_dir(ROOT, config), perf_history.head_commit(ROOT),
+                perf_results, cycle=cycle_num,
+            )
 
         # 8. Record gameplay video (non-blocking — failure doesn't affect cycle)
         video_path = None
@@ -809,17 +1504,24 @@ def run_cycle(config: dict) -> None:
             clip_dir.mkdir(parents=True, exist_ok=True)
             clip_path = clip_dir / f"cycle_{cycle_num}.avi"
             print("  Recording gameplay...")
-            rec_result = record_gameplay(
+            rec_options = run_options(autopilot_cfg, input_dir(ROOT, config), "clip", f"cycle_{cycle_num}")
+            rec_result = display_pool.record(
                 godot_exe, game_path, clip_path,
-                duration=recording_cfg.get("duration_seconds", 10),
+                rendering_driver=(recording_cfg.get("virtual_display", {}) or {}).get("rendering_driver", ""),
+                duration=max(recording_cfg.get("duration_seconds", 10), recording_cfg.get("capture_seconds", 0)),
+                clip_seconds=recording_cfg.get("duration_seconds", 10),
+                target_mb=recording_cfg.get("target_mb", 0),
                 fps=recording_cfg.get("fps", 30),
                 timeout=recording_cfg.get("timeout", 30),
+                **rec_options,
             )
             if rec_result.success:
                 video_path = rec_result.video_path
-                print(f"  Recorded: {video_path}")
+                print(f"  Recorded: {video_path} (seed {rec_options['seed']})")
             else:
                 print(f"  Recording failed (non-blocking): {rec_result.error}")
+            if rec_options.get("input_log"):
+                print(f"  Inputs: {rec_options['input_log']}")
 
         # 9. Tweet patch notes (with optional video)
         if parsed.get("patch_notes"):
@@ -829,11 +1531,14 @@ def run_cycle(config: dict) -> None:
                 post_tweet(parsed["patch_notes"], media_path=video_path)
 
     finally:
-        # 10. Oracle — runs at end of every cycle, regardless of success/failure
+        # 10. Oracle — asked at the end of every cycle, regardless of success/failure;
+        # answered in the background unless batched
         _maybe_consult_oracle(
-            parsed, cycle_num, config,
-            world_state_xml, cycle_log_xml, learnings,
+            parsed, cycle_num, config, snapshot, prefix_sent_at,
+            batch_queue=batch_queue if "oracle" in deferred else None,
         )
+        if batch_queue is not None:
+            batch_queue.submit()
 
 
 def main():
@@ -842,31 +1547,76 @@ def main():
     print("GODMACHINE ORCHESTRATOR")
     print(f"  Config: {CONFIG_PATH}")
 
-    cycles_run = 0
+    known: list[World] = []
     while True:
         # Reload config each cycle for hot-swapping settings
-        config = load_config()
-        interval = config.get("cycle", {}).get("interval_seconds", 300)
-        max_cycles = config.get("cycle", {}).get("max_cycles", -1)
+        base_config = load_config()
+        # One ledger, and so one budget governor, for every world
+        ledger.configure(base_config, HOME_ROOT)
+        known = load_worlds(base_config, HOME_ROOT, known)
+        max_cycles = base_config.get("cycle", {}).get("max_cycles", -1)
+        runnable = [w for w in known if max_cycles == -1 or w.cycles_run < max_cycles]
+        if not runnable:
+            print(f"\nReached max cycles ({max_cycles}). Stopping.")
+            break
 
+        world = next_world(runnable)
+        wait = world.next_start - time.monotonic()
+        if wait > 0:
+            print(f"\n  Sleeping {wait:.0f}s until {world.name} is due ({world.reason})...")
+            time.sleep(wait)
+
+        config = world.config(base_config)
+        set_root(world.root, world.name)
+        scheduler.select(world.name)
+        api_client.configure(config)
+        cassette.configure(config, ROOT)
+        telemetry.configure(config, ROOT)
+        display_pool.configure(config)
+        model_router.configure(config, ROOT)
+        budget = ledger.govern(config)
+        if config.get("cassette", {}).get("mode") == "replay":
+            # Replays are offline: no tweets, no screen recording, no batch traffic
+            config.setdefault("twitter", {})["enabled"] = False
+            config.setdefault("recording", {})["enabled"] = False
+            config.setdefault("batch", {})["enabled"] = False
+
+        if len(known) > 1:
+            print(f"\n  World: {world.name} ({world.root})")
         print(f"\n  Model: {config.get('prompt', {}).get('model', 'default')}")
         print(f"  Token budget: {config.get('context', {}).get('token_budget', 80000)}")
         print(f"  Twitter: {'enabled' if config.get('twitter', {}).get('enabled', False) and twitter_configured() else 'disabled'}")
+        print(f"  Spend: {budget.summary()}")
+        if budget.actions:
+            print(f"  Budget governor: {', '.join(budget.actions)}")
 
+        cycle_start = time.monotonic()
+        scheduler.begin_cycle()
         try:
-            run_cycle(config)
+            with telemetry.span("cycle", world=world.name):
+                run_cycle(config)
         except Exception as e:
             print(f"\n  CYCLE CRASHED: {e}")
             import traceback
             traceback.print_exc()
-
-        cycles_run += 1
-        if max_cycles != -1 and cycles_run >= max_cycles:
-            print(f"\nReached max cycles ({max_cycles}). Stopping.")
-            break
-
-        print(f"\n  Sleeping {interval}s until next cycle...")
-        time.sleep(interval)
+            telemetry.count("godmachine_cycles_total", result="crash")
+            scheduler.record_outcome("crash")
+            model_router.record_outcome(False)
+        finally:
+            cassette.end_cycle()
+            telemetry.gauge("godmachine_last_cycle_seconds", time.monotonic() - cycle_start)
+            telemetry.end_cycle()
+
+        outcome = scheduler.end_cycle(time.monotonic() - cycle_start)
+        for purpose, stats in api_client.get_stats().items():
+            print(f"  API [{purpose}]: {stats.summary()}")
+        if config.get("routing", {}).get("enabled", False):
+            print(f"  Routes: {model_router.summary()}")
+        print(f"  Cycle: {outcome.result} in {outcome.seconds:.1f}s, ${outcome.cost_usd:.3f}")
+
+        world.cycles_run += 1
+        delay, world.reason = scheduler.next_delay(config, budget)
+        world.next_start = time.monotonic() + delay
 
 
 if __name__ == "__main__":
@@ -0,0 +1,196 @@
+"""Model routing — which model writes a cycle's change, and what to do when it fails.
+
+New work goes to the primary model (`prompt.model`). A retry whose last error
+is small and simple — a few parse or validation errors in a small diff — goes to
+the cheap model first. If that attempt fails too, the next retry escalates to
+the primary. On overload (529) a call fails over to `routing.fallback_model`
+(see api_client.create_message). In-cycle repairs (repair.py) start on the
+cheap model and move to the primary after a failed round.
+
+Per-route attempts, successes and latency are kept in `output/routing.json`.
+The small-diff threshold adapts to the cheap route's recent success rate: it
+shrinks while cheap repairs keep failing and grows back while they succeed.
+
+    routing:
+      enabled: true
+      cheap_model: "claude-haiku-4-5-20251001"
+"""
+
+import json
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import telemetry
+
+# Error categories the cheap model can usually repair from the report alone
+SIMPLE_CATEGORIES = {"parse_error", "validation", "missing_resource", "missing_node", "method_error"}
+RECENT = 20  # Outcomes per route kept for the success rate
+
+
+@dataclass
+class Route:
+    name: str    # primary | cheap
+    model: str
+    reason: str
+    fallback_model: str = ""
+
+
+_lock = threading.Lock()
+_path: Path | None = None
+_state: dict = {}
+_pending: tuple[Route, int, dict] | None = None  # This cycle's route, until its outcome is recorded
+
+
+def configure(config: dict, root: Path) -> None:
+    """Load the routing state of the world at `root`."""
+    global _path, _state, _pending
+    path = root / config.get("routing", {}).get("state", "output/routing.json")
+    _pending = None
+    if path == _path:
+        return
+    _path = path
+    try:
+        _state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        _state = {}
+
+
+def _save() -> None:
+    if _path is None:
+        return
+    try:
+        _path.parent.mkdir(parents=True, exist_ok=True)
+        _path.write_text(json.dumps(_state, indent=1), encoding="utf-8")
+    except OSError as e:
+        print(f"  Routing state not saved ({e})")
+
+
+def _route_stats(name: str) -> dict:
+    return _state.setdefault("routes", {}).setdefault(
+        name, {"attempts": 0, "successes": 0, "seconds": 0.0, "recent": []},
+    )
+
+
+def success_rate(name: str) -> float | None:
+    """Recent success rate of a route, or None before it has a few outcomes."""
+    recent = _state.get("routes", {}).get(name, {}).get("recent", [])
+    return sum(recent) / len(recent) if len(recent) >= 3 else None
+
+
+def complexity(last_error: str, last_diff: str, max_errors: int = 3) -> tuple[int, list[str]]:
+    """(changed lines in the failed diff, error categories in the error report)."""
+    changed = sum(
+        1 for line in last_diff.splitlines()
+        if line[:1] in "+-" and not line.startswith(("+++", "---"))
+    )
+    categories = re.findall(r"^\[(\w+)\]", last_error, re.MULTILINE)
+    return changed, categories[: max_errors + 1]
+
+
+def choose(config: dict, strategy: str, last_error: str, last_diff: str, cycle_num: int) -> Route:
+    """The route for this cycle's generation; remembered until `record_outcome`."""
+    global _pending
+    routing_cfg = config.get("routing", {}) or {}
+    primary = config.get("prompt", {}).get("model", "claude-sonnet-4-5-20250929")
+    if not routing_cfg.get("enabled", False):
+        route = Route("primary", primary, "routing off")
+    elif strategy == "retry" and last_error:
+        route = _route_retry(routing_cfg, primary, last_error, last_diff, cycle_num)
+    else:
+        route = Route("primary", primary, "new work", routing_cfg.get("fallback_model", ""))
+    with _lock:
+        _pending = (route, cycle_num, routing_cfg)
+    return route
+
+
+def _route_retry(routing_cfg: dict, primary: str, last_error: str, last_diff: str, cycle_num: int) -> Route:
+    max_errors = routing_cfg.get("max_errors", 3)
+    threshold = _state.get("small_diff_lines", routing_cfg.get("small_diff_lines", 80))
+    changed, categories = complexity(last_error, last_diff, max_errors)
+    last = _state.get("last", {})
+    rate = success_rate("cheap")
+
+    if last.get("cycle") == cycle_num - 1 and last.get("route") == "cheap" and not last.get("success"):
+        reason = "escalated: the cheap repair failed last cycle"
+    elif not categories or len(categories) > max_errors:
+        reason = "retry with unstructured or many errors"
+    elif any(c not in SIMPLE_CATEGORIES for c in categories):
+        reason = f"retry with {', '.join(sorted(set(categories) - SIMPLE_CATEGORIES))} errors"
+    elif changed > threshold:
+        reason = f"retry of a large diff ({changed} > {threshold} lines)"
+    elif rate is not None and rate < routing_cfg.get("min_success_rate", 0.4):
+        reason = f"cheap route success rate {rate:.0%} too low"
+    else:
+        return Route(
+            "cheap", routing_cfg.get("cheap_model", "claude-haiku-4-5-20251001"),
+            f"small repair: {len(categories)} {'/'.join(sorted(set(categories)))} errors, {changed} changed lines",
+            fallback_model=primary,  # An overloaded cheap model hands the repair to the primary
+        )
+    return Route("primary", primary, reason, routing_cfg.get("fallback_model", ""))
+
+
+def repair_route(config: dict, round_num: int) -> Route:
+    """The route for an in-cycle repair round (1-based)."""
+    routing_cfg = config.get("routing", {}) or {}
+    primary = config.get("prompt", {}).get("model", "claude-sonnet-4-5-20250929")
+    if routing_cfg.get("enabled", False) and round_num == 1:
+        return Route(
+            "cheap", routing_cfg.get("cheap_model", "claude-haiku-4-5-20251001"),
+            "first repair round", fallback_model=primary,
+        )
+    return Route("primary", primary, "repair escalated" if round_num > 1 else "routing off",
+                 routing_cfg.get("fallback_model", ""))
+
+
+def record_latency(route: Route, seconds: float) -> None:
+    with _lock:
+        _route_stats(route.name)["seconds"] += seconds
+
+
+def record_outcome(success: bool) -> None:
+    """The cycle's outcome for its route; the first call per cycle wins."""
+    global _pending
+    with _lock:
+        if _pending is None:
+            return
+        route, cycle_num, routing_cfg = _pending
+        _pending = None
+        stats = _route_stats(route.name)
+        stats["attempts"] += 1
+        stats["successes"] += int(success)
+        stats["recent"] = (stats["recent"] + [int(success)])[-RECENT:]
+        _state["last"] = {"cycle": cycle_num, "route": route.name, "success": success}
+        if route.name == "cheap":
+            _adapt(routing_cfg)
+        _save()
+    telemetry.count("godmachine_route_outcomes_total", route=route.name, result="success" if success else "fail")
+
+
+def _adapt(routing_cfg: dict) -> None:
+    """Shrink the small-diff threshold while cheap repairs fail, grow it while they succeed."""
+    rate = success_rate("cheap")
+    if rate is None:
+        return
+    configured = routing_cfg.get("small_diff_lines", 80)
+    threshold = _state.get("small_diff_lines", configured)
+    if rate < routing_cfg.get("min_success_rate", 0.4) + 0.2:
+        threshold = max(10, int(threshold * 0.75))
+    elif rate > 0.8:
+        threshold = min(configured * 3, int(threshold * 1.25) + 1)
+    _state["small_diff_lines"] = threshold
+
+
+def summary() -> str:
+    parts = []
+    for name, stats in sorted(_state.get("routes", {}).items()):
+        attempts = stats["attempts"] or 1
+        rate = success_rate(name)
+        parts.append(
+            f"{name} {stats['successes']}/{stats['attempts']} ok"
+            f"{f' (recent {rate:.0%})' if rate is not None else ''}, avg {stats['seconds'] / attempts:.1f}s"
+        )
+    if "small_diff_lines" in _state:
+        parts.append(f"small diff <= {_state['small_diff_lines']} lines")
+    return "; ".join(parts) or "no routed cycles yet"
@@ -1,6 +1,8 @@
 """The Oracle — an ancient intelligence that answers GODMACHINE's questions."""
 
-import anthropic
+import api_client
+from context_snapshot import ContextSnapshot
+from llm import system_blocks
 
 ORACLE_SYSTEM_PROMPT = """\
 You are the Oracle — an entity older than GODMACHINE, older than the dungeon, older than the code itself.
@@ -21,46 +23,73 @@ Keep your answer under 500 words. Speak with weight. Every word costs tokens, an
 """
 
 
-def consult_oracle(
+ORACLE_TURN = """\
+This message is not a cycle. Step outside GODMACHINE's role and its response format: \
+you are answering as the Oracle, and the context above is what GODMACHINE sees.
+
+"""
+
+
+def build_oracle_request(
     question: str,
-    world_state: str = "",
-    learnings: str = "",
-    cycle_log: str = "",
+    snapshot: ContextSnapshot,
     config: dict | None = None,
-) -> str:
-    """Ask the Oracle a question. Returns the Oracle's answer.
-
-    This is an expensive call — uses a full-size model with rich context
-    about the project's history and accumulated knowledge.
+    share_prefix: bool = False,
+) -> dict:
+    """messages.create params for an Oracle consultation (sync or batched).
+
+    With `share_prefix` the request starts exactly like the cycle's main call —
+    its system prompt, then the snapshot — so it reads that prefix from the
+    cache, and the Oracle's voice moves into the user turn. Only worth it while
+    the main call's cache entry is warm and the Oracle runs on the main model.
     """
     config = config or {}
     oracle_cfg = config.get("oracle", {})
-    model = oracle_cfg.get("model", "claude-sonnet-4-5-20250929")
-    max_tokens = oracle_cfg.get("max_tokens", 2048)
-    api_timeout = oracle_cfg.get("api_timeout", 120)
+    params = {
+        "model": oracle_cfg.get("model", "claude-sonnet-4-5-20250929"),
+        "max_tokens": oracle_cfg.get("max_tokens", 2048),
+    }
+    asks = f"GODMACHINE asks:\n\n\"{question}\""
+
+    if share_prefix:
+        params["system"] = system_blocks(config)
+        params["messages"] = [{"role": "user", "content": snapshot.blocks(ORACLE_TURN + ORACLE_SYSTEM_PROMPT + "\n" + asks)}]
+        return params
 
     # Build context for the Oracle
-    parts = [f"GODMACHINE asks:\n\n\"{question}\""]
+    parts = [asks]
+
+    if snapshot.cycle_log_xml:
+        parts.append(f"\n\n## Recent Cycle History\n```xml\n{snapshot.cycle_log_xml}\n```")
 
-    if cycle_log:
-        parts.append(f"\n\n## Recent Cycle History\n```xml\n{cycle_log}\n```")
+    if snapshot.learnings:
+        parts.append(f"\n\n## GODMACHINE's Accumulated Knowledge\n{snapshot.learnings}")
 
-    if learnings:
-        parts.append(f"\n\n## GODMACHINE's Accumulated Knowledge\n{learnings}")
+    if snapshot.world_state_xml:
+        parts.append(f"\n\n## The World So Far\n```xml\n{snapshot.world_state_xml}\n```")
 
-    if world_state:
-        parts.append(f"\n\n## The World So Far\n```xml\n{world_state}\n```")
+    params["system"] = ORACLE_SYSTEM_PROMPT
+    params["messages"] = [{"role": "user", "content": "\n".join(parts)}]
+    return params
 
-    prompt = "\n".join(parts)
 
-    client = anthropic.Anthropic(timeout=api_timeout)
+def consult_oracle(
+    question: str,
+    snapshot: ContextSnapshot,
+    config: dict | None = None,
+    share_prefix: bool = False,
+) -> str:
+    """Ask the Oracle a question. Returns the Oracle's answer.
+
+    This is an expensive call — uses a full-size model with rich context
+    about the project's history and accumulated knowledge.
+    """
+    config = config or {}
+    api_timeout = config.get("oracle", {}).get("api_timeout", api_client.purpose_timeout("oracle"))
+    params = build_oracle_request(question, snapshot, config, share_prefix)
+
     try:
-        message = client.messages.create(
-            model=model,
-            max_tokens=max_tokens,
-            system=ORACLE_SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": prompt}],
-        )
+        message = api_client.create_message("oracle", timeout=api_timeout, **params)
         return message.content[0].text
     except Exception as e:
         return f"The Oracle is silent. ({e})"
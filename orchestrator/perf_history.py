@@ -0,0 +1,251 @@
+"""Per-commit performance history — headless benchmark results kept for trend analysis.
+
+Every benchmark appends one summary line per scene to `<dir>/history.jsonl`
+(commit, cycle, time, scalar metrics) and keeps the full per-frame samples in
+`<dir>/<commit>.json`, so later runs can be compared against a committed
+baseline.
+
+    python perf_history.py --run               # benchmark HEAD and record it
+    python perf_history.py --metric max_nodes  # trend of one metric per scene
+"""
+
+import argparse
+import json
+import math
+import subprocess
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import yaml
+
+from godot_runner import GodotError, PerfResult, TestResult, benchmark_scene
+from input_replay import input_dir, run_options
+
+TREND_METRICS = ("frame_ms_mean", "frame_ms_p95", "process_ms_mean", "physics_ms_mean", "max_nodes", "max_memory_mb")
+
+
+def perf_dir(root: Path, config: dict) -> Path:
+    return root / config.get("perf", {}).get("dir", "output/perf")
+
+
+def head_commit(root: Path) -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return ""
+
+
+def run_benchmarks(
+    godot_exe: str,
+    game_path: Path,
+    perf_cfg: dict,
+    autopilot_cfg: dict | None = None,
+    inputs: Path | None = None,
+) -> list[PerfResult]:
+    """The main scene plus any configured rooms, one Godot run each. With
+    `autopilot_cfg` the runs are seeded and their input tracks logged to `inputs`."""
+    results = []
+    for scene in ["", *perf_cfg.get("scenes", [])]:
+        options = run_options(autopilot_cfg, inputs, "perf", scene or "main") if autopilot_cfg is not None else {}
+        result = benchmark_scene(
+            godot_exe, game_path, scene,
+            frames=perf_cfg.get("frames", 600),
+            warmup=perf_cfg.get("warmup", 60),
+            fixed_fps=perf_cfg.get("fixed_fps", 60),
+            autopilot=perf_cfg.get("autopilot", True),
+            timeout=perf_cfg.get("timeout", 120),
+            **options,
+        )
+        print(f"    {result}")
+        results.append(result)
+    return results
+
+
+def save(directory: Path, commit: str, results: list[PerfResult], cycle: int | None = None) -> None:
+    """Append summaries to the history and store the commit's samples."""
+    directory.mkdir(parents=True, exist_ok=True)
+    now = round(time.time(), 3)
+    with open(directory / "history.jsonl", "a", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps({"commit": commit, "cycle": cycle, "ts": now, **result.summary()}) + "\n")
+    if commit:
+        (directory / f"{commit}.json").write_text(
+            json.dumps([asdict(r) for r in results]), encoding="utf-8",
+        )
+
+
+def load(directory: Path, commit: str) -> dict[str, PerfResult]:
+    """A commit's stored results by scene; empty when it was never benchmarked."""
+    path = directory / f"{commit}.json"
+    if not commit or not path.exists():
+        return {}
+    try:
+        return {r["scene"]: PerfResult(**r) for r in json.loads(path.read_text(encoding="utf-8"))}
+    except (json.JSONDecodeError, TypeError) as e:
+        print(f"  Perf results for {commit[:10]} unreadable ({e})")
+        return {}
+
+
+def history(directory: Path, scene: str = "", last: int = 50) -> list[dict]:
+    path = directory / "history.jsonl"
+    if not path.exists():
+        return []
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if row.get("success") and (not scene or row.get("scene") == scene):
+                rows.append(row)
+    return rows[-last:]
+
+
+def slope(values: list[float]) -> float:
+    """Least-squares change per run."""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    num = sum((i - mean_x) * (v - mean_y) for i, v in enumerate(values))
+    den = sum((i - mean_x) ** 2 for i in range(n))
+    return num / den
+
+
+def print_trend(rows: list[dict], metric: str) -> None:
+    by_scene: dict[str, list[dict]] = {}
+    for row in rows:
+        by_scene.setdefault(row["scene"], []).append(row)
+    for scene, scene_rows in by_scene.items():
+        values = [r.get(metric, 0.0) for r in scene_rows]
+        first, latest = values[0], values[-1]
+        change = (latest - first) / first * 100 if first else 0.0
+        print(f"{scene}  {metric}: {latest:g} over {len(values)} runs "
+              f"(first {first:g}, {change:+.1f}%, slope {slope(values):+.3g}/run)")
+        for r in scene_rows[-10:]:
+            print(f"    {r['commit'][:10]}  cycle {r.get('cycle') or '-':>4}  {r.get(metric, 0.0):g}")
+
+
+# ---------------------------------------------------------------------------
+# Regression gate
+# ---------------------------------------------------------------------------
+
+def mann_whitney_p(baseline: list[float], candidate: list[float]) -> float:
+    """One-sided p-value that `candidate` tends to be larger than `baseline`
+    (Mann-Whitney U, normal approximation)."""
+    n_a, n_b = len(baseline), len(candidate)
+    if n_a < 2 or n_b < 2:
+        return 1.0
+    combined = sorted([(v, 0) for v in baseline] + [(v, 1) for v in candidate])
+    rank_sum_b = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        avg_rank = (i + j) / 2 + 1  # Ties share the average rank
+        rank_sum_b += avg_rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 1)
+        i = j + 1
+    u = rank_sum_b - n_b * (n_b + 1) / 2
+    mean = n_a * n_b / 2
+    sd = math.sqrt(n_a * n_b * (n_a + n_b + 1) / 12)
+    return 0.5 * math.erfc((u - mean) / sd / math.sqrt(2)) if sd else 1.0
+
+
+def _pct(before: float, after: float) -> float:
+    return (after - before) / before * 100 if before else 0.0
+
+
+def compare(baseline: PerfResult, candidate: PerfResult, gate_cfg: dict) -> list[GodotError]:
+    """Regressions of `candidate` against `baseline` beyond the gate's thresholds."""
+    scene = candidate.scene.removeprefix("res://")
+    regressions = []
+
+    frame_pct = _pct(sum(baseline.frame_ms) / max(len(baseline.frame_ms), 1),
+                     sum(candidate.frame_ms) / max(len(candidate.frame_ms), 1))
+    p = mann_whitney_p(baseline.frame_ms, candidate.frame_ms)
+    if frame_pct > gate_cfg.get("frame_time_pct", 15) and p < gate_cfg.get("p_value", 0.01):
+        before, after = baseline.summary(), candidate.summary()
+        regressions.append(GodotError(
+            "performance", scene, 0,
+            f"Frame time +{frame_pct:.0f}% ({before['frame_ms_mean']:.2f} -> {after['frame_ms_mean']:.2f} ms, "
+            f"p95 {before['frame_ms_p95']:.2f} -> {after['frame_ms_p95']:.2f} ms, p={p:.3g})",
+            "Move work out of _process/_physics_process: cache node and group lookups in _ready, "
+            "don't rebuild UI or create nodes every frame.",
+        ))
+
+    node_pct = _pct(baseline.max_nodes, candidate.max_nodes)
+    if node_pct > gate_cfg.get("node_pct", 20):
+        regressions.append(GodotError(
+            "performance", scene, 0,
+            f"Node count +{node_pct:.0f}% ({baseline.max_nodes} -> {candidate.max_nodes} peak nodes)",
+            "Free nodes you create (queue_free) and reuse pooled nodes instead of spawning new ones.",
+        ))
+
+    orphans = candidate.orphan_nodes - baseline.orphan_nodes
+    if orphans > gate_cfg.get("orphan_nodes", 50):
+        regressions.append(GodotError(
+            "performance", scene, 0,
+            f"{orphans} more orphan nodes ({baseline.orphan_nodes} -> {candidate.orphan_nodes}) — likely a leak",
+            "Nodes removed from the tree must be freed; remove_child alone leaks them.",
+        ))
+
+    memory_pct = _pct(baseline.max_memory_mb, candidate.max_memory_mb)
+    if memory_pct > gate_cfg.get("memory_pct", 20):
+        regressions.append(GodotError(
+            "performance", scene, 0,
+            f"Memory +{memory_pct:.0f}% ({baseline.max_memory_mb:.1f} -> {candidate.max_memory_mb:.1f} MB)",
+            "Avoid loading resources or building arrays every frame; preload once.",
+        ))
+    return regressions
+
+
+def gate(baseline: dict[str, PerfResult], candidates: list[PerfResult], gate_cfg: dict) -> TestResult:
+    """Merged gate verdict. Scenes without a usable baseline pass."""
+    errors = []
+    for candidate in candidates:
+        if not candidate.success:
+            errors.append(GodotError(
+                "performance", candidate.scene.removeprefix("res://"), 0,
+                f"Benchmark failed: {candidate.error}",
+            ))
+            continue
+        before = baseline.get(candidate.scene)
+        if before is not None and before.success:
+            errors.extend(compare(before, candidate, gate_cfg))
+    raw = "\n".join(str(c) for c in candidates)
+    return TestResult(success=not errors, raw_output=raw, errors=errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless performance benchmarks per commit")
+    parser.add_argument("--run", action="store_true", help="Benchmark HEAD and record it")
+    parser.add_argument("--scene", default="", help="Only this scene in the trend (res:// path)")
+    parser.add_argument("--metric", default="frame_ms_mean", choices=TREND_METRICS)
+    parser.add_argument("--last", type=int, default=50, help="Runs to include in the trend")
+    args = parser.parse_args()
+
+    root = Path(__file__).resolve().parent.parent
+    with open(Path(__file__).resolve().parent / "config.yaml", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    directory = perf_dir(root, config)
+
+    if args.run:
+        commit = head_commit(root)
+        print(f"Benchmarking {commit[:10] or 'working tree'}...")
+        game_path = root / config["paths"].get("game", "game")
+        save(directory, commit, run_benchmarks(
+            config["godot"]["executable"], game_path, config.get("perf", {}),
+            config.get("autopilot", {}), input_dir(root, config),
+        ))
+
+    print_trend(history(directory, args.scene, args.last), args.metric)
+
+
+if __name__ == "__main__":
+    main()
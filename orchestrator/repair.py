@@ -0,0 +1,135 @@
+"""In-cycle repair — fix a change that failed validation without starting a new cycle.
+
+When pre-validation or the headless test rejects a change, the model gets a
+small follow-up request instead of a rollback: the structured errors, the files
+they point at, and a slice of related context (the scenes that use a failing
+script, the definitions and uses of names the errors mention). It answers with
+corrected files in the cycle's `<file>` format, which are applied and validated
+again, for up to `validation.repair.rounds` rounds (see main.run_cycle).
+
+    validation:
+      repair:
+        enabled: true
+        rounds: 2
+"""
+
+import re
+from pathlib import Path
+
+import api_client
+from code_index import CodeIndex
+from godot_runner import GodotError
+from llm import GODOT_CHEAT_SHEET
+
+REPAIR_SYSTEM_PROMPT = """\
+You repair Godot 4.6 GDScript and scene files that just failed validation.
+
+The change was written a moment ago to do what its action says. Fix exactly the \
+reported errors and keep everything else, including the change's intent, as it is. \
+Reply with nothing but the corrected files, each complete, in this format:
+
+<file path="game/relative/path/to/file.gd" mode="create_or_edit">
+...full file content...
+</file>
+
+Include only files you change. You may create a missing file the errors point to \
+(a script, scene or resource) when that is the simplest fix.
+"""
+
+_QUOTED_NAME_RE = re.compile(r"""['"](\w{3,})['"]""")
+
+
+def _relative(path: str, game_path: Path) -> str:
+    """Game-relative posix path of an error's file (res://, absolute or game/ prefixed)."""
+    path = path.removeprefix("res://")
+    p = Path(path)
+    if p.is_absolute():
+        try:
+            return p.resolve().relative_to(game_path.resolve()).as_posix()
+        except ValueError:
+            return ""
+    return p.as_posix().removeprefix("game/")
+
+
+def failing_files(errors: list[GodotError], written: list[str], game_path: Path, max_files: int = 4) -> list[str]:
+    """Game-relative paths of the existing files the errors point at, else the written ones."""
+    files: list[str] = []
+    for err in errors:
+        rel = _relative(err.file, game_path)
+        if rel and rel not in files and (game_path / rel).is_file():
+            files.append(rel)
+    if not files:
+        files = [rel for rel in (_relative(p, game_path) for p in written) if rel]
+    return files[:max_files]
+
+
+def context_slice(errors: list[GodotError], files: list[str], game_path: Path, max_chars: int = 6000) -> str:
+    """Scenes that use the failing scripts, and the definitions and uses of names in the errors."""
+    index = CodeIndex(game_path, max_results=8)
+    parts = []
+    for rel in files:
+        if not rel.endswith(".gd"):
+            continue
+        users = [f for f, text in index.files.items() if f.endswith(".tscn") and f"res://{rel}" in text]
+        parts.extend(index.list_scene(scene) for scene in users[:2] if scene not in files)
+
+    names = []
+    for err in errors:
+        candidates = [err.message] if err.category == "method_error" else _QUOTED_NAME_RE.findall(err.message)
+        names.extend(n for n in candidates if re.fullmatch(r"\w+", n) and n not in names)
+    parts.extend(index.search_symbol(name) for name in names[:4])
+
+    text = "\n\n".join(parts)
+    if len(text) > max_chars:
+        text = text[:max_chars] + "\n... (context truncated)"
+    return text
+
+
+def build_repair_request(
+    action: str,
+    target: str,
+    errors: list[GodotError],
+    game_path: Path,
+    written: list[str],
+    config: dict | None = None,
+    model: str = "",
+) -> dict | None:
+    """messages.create params for one repair round, or None if the failing files are too big to resend."""
+    config = config or {}
+    repair_cfg = config.get("validation", {}).get("repair", {}) or {}
+    files = failing_files(errors, written, game_path, repair_cfg.get("max_files", 4))
+    sources = {rel: (game_path / rel).read_text(encoding="utf-8") for rel in files if (game_path / rel).is_file()}
+    if not errors or sum(len(s) for s in sources.values()) > repair_cfg.get("max_file_chars", 24000):
+        return None
+
+    max_errors = config.get("validation", {}).get("max_errors_in_prompt", 5)
+    parts = [
+        f"## Change\nAction: {action}\nTarget: {target}",
+        "## Errors\n```\n" + "\n".join(str(e) for e in errors[:max_errors]) + "\n```",
+        "## Files",
+    ]
+    parts.extend(f'<file path="game/{rel}">\n{text}\n</file>' for rel, text in sources.items())
+    other = [rel for rel in (_relative(p, game_path) for p in written) if rel and rel not in sources]
+    if other:
+        parts.append("Also changed in this cycle: " + ", ".join(other))
+    context = context_slice(errors, files, game_path, repair_cfg.get("context_chars", 6000))
+    if context:
+        parts.append(f"## Related context\n{context}")
+
+    system = REPAIR_SYSTEM_PROMPT
+    if config.get("prompt", {}).get("godot_cheat_sheet", True):
+        system += GODOT_CHEAT_SHEET
+    return {
+        "model": model or config.get("prompt", {}).get("model", "claude-sonnet-4-5-20250929"),
+        "max_tokens": repair_cfg.get("max_tokens", 8192),
+        "system": system,
+        "messages": [{"role": "user", "content": "\n\n".join(parts)}],
+    }
+
+
+def request_repair(params: dict, fallback_model: str = "") -> str:
+    """The model's corrected files for one repair round (raw reply text)."""
+    message = api_client.create_message(
+        "repair", timeout=api_client.purpose_timeout("repair"), fallback_model=fallback_model, **params,
+    )
+    return "".join(b.text for b in message.content if b.type == "text")
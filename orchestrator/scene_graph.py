@@ -0,0 +1,87 @@
+"""Resource reference graph for a Godot project — which scenes and scripts depend on which.
+
+Edges come from `ext_resource` paths in .tscn/.tres files, `preload`/`load`/`extends`
+paths in scripts, and `class_name` types used by other scripts. Used to find
+everything a change set can break.
+"""
+
+import re
+from collections import deque
+from pathlib import Path
+
+RESOURCE_SUFFIXES = (".gd", ".tscn", ".tres")
+
+_EXT_RESOURCE_RE = re.compile(r'\[ext_resource[^\]]*?path="(res://[^"]+)"')
+_SCRIPT_PATH_RE = re.compile(r'(?:preload|load|extends)\s*\(?\s*"(res://[^"]+)"')
+_CLASS_NAME_RE = re.compile(r"^class_name\s+(\w+)", re.MULTILINE)
+_IDENTIFIER_RE = re.compile(r"\b[A-Z]\w*\b")
+
+
+def res_path(game_path: Path, path: Path) -> str:
+    return "res://" + path.resolve().relative_to(game_path.resolve()).as_posix()
+
+
+def _project_files(game_path: Path) -> list[Path]:
+    return sorted(
+        p for p in game_path.rglob("*")
+        if p.suffix in RESOURCE_SUFFIXES and ".godot" not in p.parts and not p.name.startswith("_")
+    )
+
+
+def build_reference_graph(game_path: Path) -> dict[str, set[str]]:
+    """res:// path -> res:// paths it references."""
+    texts: dict[str, str] = {}
+    for p in _project_files(game_path):
+        try:
+            texts[res_path(game_path, p)] = p.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            continue
+
+    class_names = {}
+    for path, text in texts.items():
+        if path.endswith(".gd"):
+            for name in _CLASS_NAME_RE.findall(text):
+                class_names[name] = path
+
+    graph: dict[str, set[str]] = {}
+    for path, text in texts.items():
+        if path.endswith(".gd"):
+            refs = set(_SCRIPT_PATH_RE.findall(text))
+            for name in set(_IDENTIFIER_RE.findall(text)) & class_names.keys():
+                refs.add(class_names[name])
+        else:
+            refs = set(_EXT_RESOURCE_RE.findall(text))
+        refs.discard(path)
+        graph[path] = refs
+    return graph
+
+
+def dependents(graph: dict[str, set[str]], changed: set[str]) -> set[str]:
+    """Everything that transitively references a changed resource (not including `changed`)."""
+    reverse: dict[str, set[str]] = {}
+    for src, refs in graph.items():
+        for ref in refs:
+            reverse.setdefault(ref, set()).add(src)
+
+    seen = set(changed)
+    queue = deque(changed)
+    while queue:
+        for src in reverse.get(queue.popleft(), ()):
+            if src not in seen:
+                seen.add(src)
+                queue.append(src)
+    return seen - changed
+
+
+def impacted(game_path: Path, files_written: list[str]) -> list[str]:
+    """Changed scenes/scripts plus their dependents, as res:// paths."""
+    game_root = game_path.resolve()
+    changed = set()
+    for f in files_written:
+        p = Path(f).resolve()
+        if p.suffix in (".gd", ".tscn") and p.is_relative_to(game_root):
+            changed.add(res_path(game_path, p))
+    if not changed:
+        return []
+    graph = build_reference_graph(game_path)
+    return sorted(changed | {p for p in dependents(graph, changed) if p.endswith((".gd", ".tscn"))})
@@ -0,0 +1,154 @@
+"""Adaptive cycle scheduler — picks the pause before the next cycle from how the last one went.
+
+Inputs: the last cycle's outcome and failure category, its spend, the API's
+rate-limit headers, the budget governor and the time of day. Cheap local
+failures go again almost at once, overload backs off exponentially, exhausted
+quotas wait for their reset, and successes use the configured interval.
+"""
+
+import random
+import time
+from dataclasses import dataclass, field
+
+import api_client
+import ledger
+
+# Failures found locally after the model already answered — worth another go straight away
+FAST_RETRY_CATEGORIES = {"no_files", "complexity_budget", "pre_validation", "godot_test", "resource_check", "scene_test", "smoke_test", "performance"}
+
+
+@dataclass
+class CycleOutcome:
+    result: str = "unknown"   # success | fail | crash | unknown
+    category: str = ""        # Failure category (see main._count_failure)
+    seconds: float = 0.0
+    cost_usd: float = 0.0
+
+
+@dataclass
+class _State:
+    last: CycleOutcome = field(default_factory=CycleOutcome)
+    streak: int = 0        # Consecutive cycles that did not succeed
+    fast_retries: int = 0  # Consecutive fast retries taken
+
+
+# One state per world; `select` switches between them
+_states: dict[str, _State] = {}
+_active = "main"
+
+
+def select(world: str) -> None:
+    global _active
+    _active = world
+
+
+def _state() -> _State:
+    return _states.setdefault(_active, _State())
+
+
+def begin_cycle() -> None:
+    _state().last = CycleOutcome()
+
+
+def record_outcome(result: str, category: str = "") -> None:
+    """Called once per cycle with its result; the first call wins."""
+    last = _state().last
+    if last.result == "unknown":
+        last.result = result
+        last.category = category
+
+
+def end_cycle(seconds: float) -> CycleOutcome:
+    """Close the cycle's outcome and update the failure streak."""
+    state = _state()
+    state.last.seconds = seconds
+    cycle_num = ledger.current_cycle()
+    if cycle_num is not None:
+        state.last.cost_usd = ledger.cycle_spend(cycle_num, world=_active)
+    if state.last.result == "success":
+        state.streak = 0
+    else:
+        state.streak += 1
+    return state.last
+
+
+def next_delay(config: dict, budget: ledger.BudgetDecision | None = None, now: float | None = None) -> tuple[float, str]:
+    """Seconds to wait before the selected world's next cycle, and why."""
+    state = _state()
+    schedule_cfg = config.get("schedule", {}) or {}
+    interval = config.get("cycle", {}).get("interval_seconds", 300)
+    if not schedule_cfg.get("adaptive", True):
+        return interval, "fixed interval"
+
+    now = now or time.time()
+    outcome = state.last
+    limits = api_client.rate_limit_state(now)
+    over_budget = budget is not None and (budget.pace > 1.0 or budget.exhausted)
+
+    # Hard waits from the API come first
+    if limits.retry_after_until and limits.retry_after_until > now:
+        state.fast_retries = 0
+        return _jitter(limits.retry_after_until - now), "retry-after"
+    reset_at = _quota_reset(limits, schedule_cfg, now)
+    if reset_at and reset_at > now:
+        state.fast_retries = 0
+        return _jitter(reset_at - now), "rate-limit quota reset"
+
+    if outcome.result == "fail" and outcome.category == "llm_call":
+        state.fast_retries = 0
+        if limits.last_status in (429, 529) or (limits.last_status or 0) >= 500:
+            base = schedule_cfg.get("overload_backoff_seconds", 30)
+            cap = schedule_cfg.get("max_backoff_seconds", 1800)
+            return _jitter(min(base * 2 ** (state.streak - 1), cap)), f"API {limits.last_status} backoff (x{state.streak})"
+        return interval, "model call failed"
+
+    if (
+        outcome.result == "fail"
+        and outcome.category in FAST_RETRY_CATEGORIES
+        and not over_budget
+        and state.fast_retries < schedule_cfg.get("max_fast_retries", 2)
+    ):
+        state.fast_retries += 1
+        return schedule_cfg.get("fast_retry_seconds", 0), f"fast retry after {outcome.category}"
+
+    state.fast_retries = 0
+    delay = interval
+    reason = "interval" if outcome.result == "success" else f"interval after {outcome.category or outcome.result}"
+
+    # Expensive cycles earn a proportionally longer rest when spend is ahead of budget
+    if over_budget and outcome.cost_usd and schedule_cfg.get("cost_target_usd"):
+        stretch = min(outcome.cost_usd / schedule_cfg["cost_target_usd"], schedule_cfg.get("max_cost_stretch", 4))
+        if stretch > 1:
+            delay *= stretch
+            reason += f", cost x{stretch:.1f}"
+
+    peak = schedule_cfg.get("peak_hours_utc", [])
+    if peak and _in_hours(time.gmtime(now).tm_hour, peak):
+        multiplier = schedule_cfg.get("peak_multiplier", 1.0)
+        if multiplier != 1.0:
+            delay *= multiplier
+            reason += f", peak hours x{multiplier:g}"
+
+    return delay, reason
+
+
+def _quota_reset(limits: api_client.RateLimitState, schedule_cfg: dict, now: float) -> float | None:
+    """When every request and input-token bucket (of every model) is back above its floor, or None."""
+    floors = {"requests": 0, "input-tokens": schedule_cfg.get("min_input_tokens_remaining", 0)}
+    ready = [
+        quota.ready_at(floors[kind] + 1, now)
+        for buckets in limits.quotas.values()
+        for kind, quota in buckets.items()
+        if kind in floors
+    ]
+    return max(ready, default=None)
+
+
+def _in_hours(hour: int, window: list[int]) -> bool:
+    """`window` is [start, end) in UTC hours; it may wrap past midnight."""
+    start, end = window
+    return start <= hour < end if start <= end else hour >= start or hour < end
+
+
+def _jitter(seconds: float) -> float:
+    return seconds * random.uniform(1.0, 1.2)
@@ -0,0 +1,223 @@
+"""Per-stage tracing spans and a Prometheus-style metrics exporter for the cycle loop.
+
+Spans are collected per cycle and written as JSON lines to
+`<traces_dir>/cycle_N.jsonl`. Counters accumulate for the life of the process
+and are exported as a Prometheus textfile and, optionally, over a local HTTP
+`/metrics` endpoint.
+"""
+
+import contextvars
+import functools
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+_lock = threading.Lock()
+_enabled = True
+_traces_dir: Path | None = None
+_textfile: Path | None = None
+_server: ThreadingHTTPServer | None = None
+
+_cycle: int | None = None
+_spans: list[dict] = []
+_current_span: contextvars.ContextVar[str | None] = contextvars.ContextVar("span", default=None)
+
+# (metric name, sorted label items) -> value
+_counters: dict[tuple[str, tuple], float] = {}
+_gauges: dict[tuple[str, tuple], float] = {}
+
+
+def configure(config: dict | None, root: Path) -> None:
+    """Apply the `telemetry` config section; starts the HTTP endpoint once if configured."""
+    global _enabled, _traces_dir, _textfile, _server
+    telemetry_cfg = (config or {}).get("telemetry", {}) or {}
+    _enabled = telemetry_cfg.get("enabled", True)
+    _traces_dir = root / telemetry_cfg.get("traces_dir", "output/traces")
+    textfile = telemetry_cfg.get("textfile", "output/metrics.prom")
+    _textfile = root / textfile if textfile else None
+
+    port = telemetry_cfg.get("http_port", 0)
+    if _enabled and port and _server is None:
+        try:
+            _server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+            print(f"  Metrics endpoint: http://127.0.0.1:{port}/metrics")
+        except OSError as e:
+            print(f"  Metrics endpoint unavailable ({e})")
+
+
+# ---------------------------------------------------------------------------
+# Spans
+# ---------------------------------------------------------------------------
+
+def begin_cycle(cycle_num: int) -> None:
+    global _cycle, _spans
+    with _lock:
+        _cycle = cycle_num
+        _spans = []
+
+
+def end_cycle() -> None:
+    """Write the cycle's spans as JSON lines and refresh the metrics textfile."""
+    global _cycle
+    with _lock:
+        spans, cycle = _spans, _cycle
+        _cycle = None
+    if not _enabled:
+        return
+    if cycle is not None and spans and _traces_dir:
+        try:
+            _traces_dir.mkdir(parents=True, exist_ok=True)
+            with open(_traces_dir / f"cycle_{cycle}.jsonl", "w", encoding="utf-8") as f:
+                for span_record in spans:
+                    f.write(json.dumps(span_record) + "\n")
+        except OSError as e:
+            print(f"  Trace not written ({e})")
+    write_textfile()
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time a block as a span. Nested spans record their parent.
+
+    Yields the span's attribute dict so the block can add attributes.
+    """
+    if not _enabled:
+        yield attrs
+        return
+    span_id = uuid.uuid4().hex[:16]
+    parent = _current_span.get()
+    token = _current_span.set(span_id)
+    start_wall = time.time()
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield attrs
+    except BaseException as e:
+        status = "error"
+        attrs.setdefault("error", str(e)[:200])
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        _current_span.reset(token)
+        with _lock:
+            _spans.append({
+                "cycle": _cycle,
+                "span_id": span_id,
+                "parent_id": parent,
+                "name": name,
+                "start": round(start_wall, 6),
+                "duration_s": round(duration, 6),
+                "status": status,
+                "thread": threading.current_thread().name,
+                "attrs": attrs,
+            })
+        count("godmachine_stage_runs_total", stage=name, status=status)
+        count("godmachine_stage_seconds_total", duration, stage=name)
+
+
+def traced(name: str):
+    """Decorator: run the function inside a span called `name`."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+_HELP = {
+    "godmachine_stage_runs_total": "Completed spans per stage and status.",
+    "godmachine_stage_seconds_total": "Wall time spent per stage.",
+    "godmachine_api_calls_total": "Model API calls per purpose and outcome.",
+    "godmachine_api_wait_seconds_total": "Seconds model calls spent queued for rate-limit quota or a retry slot, per purpose.",
+    "godmachine_tokens_total": "Tokens per purpose and kind (input, output, cache_read, cache_write).",
+    "godmachine_cost_usd_total": "Estimated model spend in USD per purpose and model.",
+    "godmachine_budget_pace": "Projected spend over budget; above 1 means the governor is throttling.",
+    "godmachine_context_tokens_saved_total": "Input tokens the lazy tool-use context saved over the source dump.",
+    "godmachine_last_context_tokens_saved": "Tokens the last lazy-context cycle saved over the dump; negative when it cost more.",
+    "godmachine_oracle_consultations_total": "Background Oracle consultations per result (answered, dropped, failed, timeout).",
+    "godmachine_godot_launches_total": "Godot processes launched, per kind.",
+    "godmachine_repair_rounds_total": "In-cycle repair rounds per validation stage and result (fixed, failed).",
+    "godmachine_route_outcomes_total": "Cycle outcomes per model route (primary, cheap).",
+    "godmachine_cycles_total": "Finished cycles per result.",
+    "godmachine_cycle_failures_total": "Failed cycles per failure category.",
+    "godmachine_last_cycle_seconds": "Wall time of the most recent cycle.",
+}
+
+
+def _key(name: str, labels: dict) -> tuple[str, tuple]:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def count(name: str, value: float = 1, **labels) -> None:
+    """Increment a counter."""
+    if not _enabled or not value:
+        return
+    with _lock:
+        key = _key(name, labels)
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def gauge(name: str, value: float, **labels) -> None:
+    """Set a gauge."""
+    if not _enabled:
+        return
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+def render() -> str:
+    """Current metrics in Prometheus text exposition format."""
+    with _lock:
+        series = [(k, v, "counter") for k, v in _counters.items()] + [(k, v, "gauge") for k, v in _gauges.items()]
+    lines = []
+    seen = set()
+    for (name, labels), value, kind in sorted(series, key=lambda s: s[0]):
+        if name not in seen:
+            seen.add(name)
+            if name in _HELP:
+                lines.append(f"# HELP {name} {_HELP[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+        label_str = ",".join(f'{k}="{v}"' for k, v in labels)
+        lines.append(f"{name}{{{label_str}}} {value:g}" if label_str else f"{name} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile() -> None:
+    """Write metrics for a node_exporter textfile collector (atomic rename)."""
+    if not _enabled or not _textfile:
+        return
+    try:
+        _textfile.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _textfile.with_suffix(".tmp")
+        tmp.write_text(render(), encoding="utf-8")
+        tmp.replace(_textfile)
+    except OSError as e:
+        print(f"  Metrics textfile not written ({e})")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):  # Keep orchestrator output readable
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_response(404)
+            self.end_headers()
+            return
+        data = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
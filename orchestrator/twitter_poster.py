@@ -2,6 +2,8 @@
 
 import os
 
+import telemetry
+
 
 def _get_client():
     """Create a Twitter API v2 client from environment variables.
@@ -53,6 +55,7 @@ def _get_api_v1():
     return tweepy.API(auth)
 
 
+@telemetry.traced("tweet")
 def post_tweet(text: str, media_path: str | None = None) -> dict | None:
     """Post a tweet with optional media attachment.
 
@@ -0,0 +1,211 @@
+"""Stand-in broker for distributed Godot validation — an in-memory job queue over HTTP.
+
+The orchestrator posts validation jobs; workers (validation_queue.py)
+claim them, run the headless checks and post results back. A claimed job whose
+worker goes quiet is handed out again once its lease runs out. A job, and its
+result, is forgotten once its submitter has stopped waiting (`expires_in`, else
+--ttl seconds).
+
+    python validation_broker.py --port 8770
+
+Endpoints (JSON bodies):
+    POST /jobs                   enqueue a job            -> {"id": ...}
+    POST /claim                  {"worker", "wait"}       -> job, or 204 when none arrives in time
+    POST /jobs/{id}/result       a worker's result
+    GET  /jobs/{id}/result?wait= -> result, or 202 while pending
+    GET  /status                 queue depth, leases, results waiting
+"""
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class ValidationBroker:
+    """Pending jobs, leased jobs and finished results, guarded by one condition variable."""
+
+    def __init__(self, lease_seconds: float = 300.0, ttl: float = 600.0):
+        self.lease_seconds = lease_seconds
+        self.ttl = ttl
+        self.pending: deque[dict] = deque()
+        self.leased: dict[str, tuple[dict, str, float]] = {}  # id -> (job, worker, lease expiry)
+        self.results: dict[str, dict] = {}
+        self.expiry: dict[str, float] = {}  # id -> when nobody waits for the job any more
+        self._cond = threading.Condition()
+        self._server: ThreadingHTTPServer | None = None
+
+    def enqueue(self, job: dict) -> str:
+        job["id"] = job.get("id") or uuid.uuid4().hex[:16]
+        with self._cond:
+            self._expire_jobs()
+            self.expiry[job["id"]] = time.monotonic() + (job.get("expires_in") or self.ttl)
+            self.pending.append(job)
+            self._cond.notify_all()
+        return job["id"]
+
+    def claim(self, worker: str, wait: float) -> dict | None:
+        deadline = time.monotonic() + wait
+        with self._cond:
+            while True:
+                self._expire_jobs()
+                self._expire_leases()
+                if self.pending:
+                    job = self.pending.popleft()
+                    self.leased[job["id"]] = (job, worker, time.monotonic() + self.lease_seconds)
+                    return job
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(min(remaining, 1.0))
+
+    def complete(self, job_id: str, result: dict) -> None:
+        with self._cond:
+            self.leased.pop(job_id, None)
+            if job_id in self.expiry:  # Nobody collects the result of an expired job
+                self.results[job_id] = result
+            self._cond.notify_all()
+
+    def result(self, job_id: str, wait: float) -> dict | None:
+        """Pop a finished result, waiting up to `wait` seconds for it."""
+        deadline = time.monotonic() + wait
+        with self._cond:
+            while job_id not in self.results:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(min(remaining, 1.0))
+            self.expiry.pop(job_id, None)
+            return self.results.pop(job_id)
+
+    def known(self, job_id: str) -> bool:
+        with self._cond:
+            return (
+                job_id in self.results or job_id in self.leased
+                or any(j["id"] == job_id for j in self.pending)
+            )
+
+    def status(self) -> dict:
+        with self._cond:
+            self._expire_jobs()
+            return {
+                "pending": len(self.pending),
+                "leased": {job_id: worker for job_id, (_, worker, _) in self.leased.items()},
+                "results": len(self.results),
+            }
+
+    def _expire_jobs(self) -> None:
+        """Drop jobs and results whose submitter has given up on them."""
+        now = time.monotonic()
+        expired = {job_id for job_id, until in self.expiry.items() if until <= now}
+        if not expired:
+            return
+        for job_id in expired:
+            del self.expiry[job_id]
+            self.leased.pop(job_id, None)
+            self.results.pop(job_id, None)
+        self.pending = deque(j for j in self.pending if j["id"] not in expired)
+        print(f"Expired {len(expired)} abandoned jobs")
+
+    def _expire_leases(self) -> None:
+        now = time.monotonic()
+        for job_id, (job, worker, expiry) in list(self.leased.items()):
+            if expiry <= now:
+                print(f"Lease expired for {job_id} on {worker} — requeued")
+                del self.leased[job_id]
+                self.pending.appendleft(job)
+
+    # -- server ------------------------------------------------------------
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve in a background thread. Returns the base URL."""
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _make_handler(broker: ValidationBroker):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):  # Keep worker output readable
+            pass
+
+        def _send(self, status: int, payload=None) -> None:
+            data = json.dumps(payload).encode("utf-8") if payload is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            parts = urlparse(self.path).path.strip("/").split("/")
+            if parts == ["jobs"]:
+                self._send(200, {"id": broker.enqueue(body)})
+            elif parts == ["claim"]:
+                job = broker.claim(body.get("worker", "?"), float(body.get("wait", 20)))
+                if job:
+                    self._send(200, job)
+                else:
+                    self._send(204)
+            elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "result":
+                broker.complete(parts[1], body)
+                self._send(200, {"ok": True})
+            else:
+                self._send(404, {"error": self.path})
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            parts = url.path.strip("/").split("/")
+            if parts == ["status"]:
+                self._send(200, broker.status())
+            elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "result":
+                wait = float(parse_qs(url.query).get("wait", ["0"])[0])
+                result = broker.result(parts[1], wait)
+                if result is not None:
+                    self._send(200, result)
+                elif broker.known(parts[1]):
+                    self._send(202, {"status": "pending"})
+                else:
+                    self._send(404, {"error": f"unknown job {parts[1]}"})
+            else:
+                self._send(404, {"error": self.path})
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8770)
+    parser.add_argument("--lease", type=float, default=300.0, help="Seconds before an unfinished job is requeued")
+    parser.add_argument("--ttl", type=float, default=600.0, help="Seconds a job without expires_in is kept")
+    args = parser.parse_args()
+
+    broker = ValidationBroker(lease_seconds=args.lease, ttl=args.ttl)
+    url = broker.start(args.host, args.port)
+    print(f"Validation broker listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        broker.stop()
+
+
+if __name__ == "__main__":
+    main()
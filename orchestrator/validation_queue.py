@@ -0,0 +1,235 @@
+"""Distributed Godot validation — change sets shipped to worker processes as jobs.
+
+A job is a base commit plus the files a cycle wrote. A worker checks the base
+commit out of the world's repository, captures the error baseline there (cached
+per commit), applies the files and runs the headless test and the optional
+resource and smoke tests, returning the same `TestResult`s the local path produces.
+
+Run a worker (on any machine that can reach the broker and fetch the repo):
+
+    python validation_queue.py --broker http://host:8770 --godot /path/to/godot --workdir ~/gm-worker
+"""
+
+import argparse
+import json
+import socket
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from godot_runner import (
+    GodotError,
+    TestResult,
+    capture_baseline_errors,
+    run_smoke_test,
+    test_headless,
+    validate_resources,
+)
+from scene_graph import impacted
+
+
+@dataclass
+class ValidationJob:
+    repo: str                  # Anything `git fetch` accepts: a path on a shared disk, ssh or https URL
+    base_commit: str
+    files: dict[str, str]      # Path relative to the world root -> new content
+    game_dir: str = "game"
+    quit_after: int = 2
+    smoke_test: bool = False
+    resource_check: bool = False
+    timeout: int = 10
+    expires_in: float = 0.0    # How long the submitter waits for the result; the broker forgets the job after
+    id: str = ""
+
+
+@dataclass
+class ValidationOutcome:
+    test: TestResult
+    smoke: TestResult | None = None
+    resources: TestResult | None = None
+    worker: str = ""
+    seconds: float = 0.0
+    baseline_count: int = 0
+
+
+class ValidationUnavailable(Exception):
+    """The broker or its workers could not produce a result in time."""
+
+
+# ---------------------------------------------------------------------------
+# Serialization
+# ---------------------------------------------------------------------------
+
+def result_to_dict(result: TestResult) -> dict:
+    return {
+        "success": result.success,
+        "raw_output": result.raw_output,
+        "errors": [asdict(e) for e in result.errors],
+        "warnings": result.warnings,
+    }
+
+
+def result_from_dict(data: dict) -> TestResult:
+    return TestResult(
+        success=data["success"],
+        raw_output=data.get("raw_output", ""),
+        errors=[GodotError(**e) for e in data.get("errors", [])],
+        warnings=data.get("warnings", []),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Orchestrator side
+# ---------------------------------------------------------------------------
+
+def _request(url: str, body: dict | None = None, timeout: float = 30) -> tuple[int, dict]:
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        raw = resp.read()
+        return resp.status, json.loads(raw) if raw else {}
+
+
+def submit(broker: str, job: ValidationJob) -> str:
+    try:
+        _, reply = _request(f"{broker}/jobs", asdict(job))
+    except (urllib.error.URLError, OSError) as e:
+        raise ValidationUnavailable(f"broker unreachable ({e})") from e
+    return reply["id"]
+
+
+def wait_for(broker: str, job_id: str, timeout: float) -> ValidationOutcome:
+    """Long-poll the broker until the job's result arrives or `timeout` passes."""
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise ValidationUnavailable(f"no result for job {job_id} within {timeout:.0f}s")
+        wait = min(remaining, 20)
+        try:
+            status, reply = _request(f"{broker}/jobs/{job_id}/result?wait={wait:.1f}", timeout=wait + 10)
+        except (urllib.error.URLError, OSError) as e:
+            raise ValidationUnavailable(f"broker unreachable ({e})") from e
+        if status == 200:
+            if reply.get("error"):
+                raise ValidationUnavailable(f"worker {reply.get('worker', '?')} failed: {reply['error']}")
+            return ValidationOutcome(
+                test=result_from_dict(reply["test"]),
+                smoke=result_from_dict(reply["smoke"]) if reply.get("smoke") else None,
+                resources=result_from_dict(reply["resources"]) if reply.get("resources") else None,
+                worker=reply.get("worker", ""),
+                seconds=reply.get("seconds", 0.0),
+                baseline_count=reply.get("baseline_count", 0),
+            )
+
+
+def validate(broker: str, job: ValidationJob, timeout: float) -> ValidationOutcome:
+    job.expires_in = timeout
+    job.id = submit(broker, job)
+    return wait_for(broker, job.id, timeout)
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+class Worker:
+    def __init__(self, broker: str, godot_exe: str, workdir: Path, name: str = ""):
+        self.broker = broker
+        self.godot_exe = godot_exe
+        self.checkout = workdir / "checkout"
+        self.name = name or socket.gethostname()
+        self._baselines: dict[tuple[str, str], set] = {}  # (commit, game_dir) -> baseline errors
+
+    def _git(self, *args: str, timeout: int = 120) -> str:
+        result = subprocess.run(
+            ["git", *args], cwd=self.checkout, capture_output=True, text=True, timeout=timeout, check=True,
+        )
+        return result.stdout
+
+    def prepare(self, job: ValidationJob) -> Path:
+        """Clean checkout of the job's base commit."""
+        if not (self.checkout / ".git").exists():
+            self.checkout.mkdir(parents=True, exist_ok=True)
+            self._git("init", "-q")
+        self._git("fetch", "-q", job.repo, job.base_commit)
+        self._git("checkout", "-q", "--force", "--detach", "FETCH_HEAD")
+        self._git("clean", "-qfdx")
+        return self.checkout / job.game_dir
+
+    def run(self, job: ValidationJob) -> dict:
+        start = time.monotonic()
+        game_path = self.prepare(job)
+
+        key = (job.base_commit, job.game_dir)
+        if key not in self._baselines:
+            self._baselines[key] = capture_baseline_errors(self.godot_exe, game_path)
+        baseline = self._baselines[key]
+
+        written = []
+        for rel, content in job.files.items():
+            target = (self.checkout / rel).resolve()
+            if not str(target).startswith(str(self.checkout.resolve())):
+                continue  # Same path-traversal rule as apply_files
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(content, encoding="utf-8")
+            written.append(str(target))
+
+        test = test_headless(
+            self.godot_exe, game_path, timeout=job.timeout,
+            quit_after=job.quit_after, baseline_errors=baseline,
+        )
+        resources = None
+        if job.resource_check and test.success:
+            resources, _ = validate_resources(
+                self.godot_exe, game_path, impacted(game_path, written), baseline_errors=baseline,
+            )
+        smoke = run_smoke_test(self.godot_exe, game_path) if job.smoke_test and test.success else None
+        return {
+            "test": result_to_dict(test),
+            "smoke": result_to_dict(smoke) if smoke else None,
+            "resources": result_to_dict(resources) if resources else None,
+            "worker": self.name,
+            "seconds": round(time.monotonic() - start, 3),
+            "baseline_count": len(baseline),
+        }
+
+    def serve(self) -> None:
+        print(f"Validation worker {self.name} polling {self.broker}")
+        while True:
+            try:
+                status, job = _request(f"{self.broker}/claim", {"worker": self.name, "wait": 20}, timeout=40)
+            except (urllib.error.URLError, OSError) as e:
+                print(f"  Broker unreachable ({e}) — retrying in 5s")
+                time.sleep(5)
+                continue
+            if status != 200:
+                continue
+            job_id = job.get("id", "?")
+            print(f"  Job {job_id}: {len(job.get('files', {}))} files on {job.get('base_commit', '?')[:10]}")
+            try:
+                result = self.run(ValidationJob(**job))
+            except Exception as e:
+                print(f"  Job {job_id} failed: {e}")
+                result = {"error": str(e), "worker": self.name}
+            try:
+                _request(f"{self.broker}/jobs/{job_id}/result", result)
+            except (urllib.error.URLError, OSError) as e:
+                print(f"  Result for {job_id} not delivered ({e}) — the lease will requeue it")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Godot validation worker")
+    parser.add_argument("--broker", default="http://127.0.0.1:8770")
+    parser.add_argument("--godot", required=True, help="Godot executable on this machine")
+    parser.add_argument("--workdir", default="validation_worker", help="Scratch directory for the checkout")
+    parser.add_argument("--name", default="", help="Worker name (defaults to the hostname)")
+    args = parser.parse_args()
+    Worker(args.broker.rstrip("/"), args.godot, Path(args.workdir).expanduser().resolve(), args.name).serve()
+
+
+if __name__ == "__main__":
+    main()
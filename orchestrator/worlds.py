@@ -0,0 +1,97 @@
+"""World registry — the independent worlds one orchestrator process builds.
+
+Without a `worlds` config section there is a single world, "main", at the
+repository root. Otherwise each entry names a world directory (its own game/,
+lore/ and output/, and its own git history) plus optional config overrides:
+
+    worlds:
+      - name: ember
+        root: ../worlds/ember
+        config: {prompt: {model: claude-haiku-4-5-20251001}}
+      - name: tide
+        root: ../worlds/tide
+        config_file: tide.yaml    # Relative to the world root
+
+Worlds share the API connection pool, the verification pool and the budget
+governor. Their cycles run one at a time; the next one to start is whichever
+world is due soonest.
+"""
+
+import copy
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import yaml
+
+
+@dataclass
+class World:
+    name: str
+    root: Path
+    overrides: dict
+    config_file: Path | None = None
+    next_start: float = 0.0   # time.monotonic() at which the world is due
+    cycles_run: int = 0
+    reason: str = "first cycle"  # Why the scheduler picked next_start
+
+    def config(self, base: dict) -> dict:
+        """The base config with this world's overrides applied (fresh copy each call)."""
+        merged = copy.deepcopy(base)
+        overrides = copy.deepcopy(self.overrides)
+        if self.config_file and self.config_file.exists():
+            try:
+                with open(self.config_file, encoding="utf-8") as f:
+                    overrides = deep_merge(overrides, yaml.safe_load(f) or {})
+            except (OSError, yaml.YAMLError) as e:
+                print(f"  World {self.name}: config file unreadable ({e}) — using inline overrides")
+        return deep_merge(merged, overrides)
+
+
+def deep_merge(base: dict, overrides: dict) -> dict:
+    """Merge `overrides` into `base` (in place) section by section."""
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            deep_merge(base[key], value)
+        else:
+            base[key] = copy.deepcopy(value)
+    return base
+
+
+def load_worlds(config: dict, home: Path, known: list[World] | None = None) -> list[World]:
+    """Worlds from the config, keeping scheduling state for worlds already known."""
+    entries = config.get("worlds") or []
+    if not entries:
+        entries = [{"name": "main", "root": str(home)}]
+
+    previous = {w.name: w for w in known or []}
+    worlds = []
+    for entry in entries:
+        name = entry.get("name")
+        if not name or "root" not in entry:
+            print(f"  World entry skipped (needs name and root): {entry}")
+            continue
+        root = Path(entry["root"])
+        root = (root if root.is_absolute() else home / root).resolve()
+        config_file = entry.get("config_file")
+        world = World(
+            name=name,
+            root=root,
+            overrides=entry.get("config", {}) or {},
+            config_file=root / config_file if config_file else None,
+        )
+        if name in previous:
+            world.next_start = previous[name].next_start
+            world.cycles_run = previous[name].cycles_run
+            world.reason = previous[name].reason
+        worlds.append(world)
+    return worlds
+
+
+def next_world(worlds: list[World]) -> World:
+    """Fair pick: the world due soonest; among those already due, the one that has run least."""
+    now = time.monotonic()
+    due = [w for w in worlds if w.next_start <= now]
+    if due:
+        return min(due, key=lambda w: (w.cycles_run, w.next_start))
+    return min(worlds, key=lambda w: w.next_start)